@@ -0,0 +1,75 @@
+# Benchmark: FEVD con ciclos anidados (implementación original) vs motor vectorizado
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code'))
+from fevd import fevd_cholesky_vectorizado  # noqa: E402
+
+
+def fevd_ciclos(psi, sigma_u, steps):
+    """
+    Copia del núcleo original de calcular_FEVD_cholesky(), usada como referencia.
+    """
+    num_vars = psi.shape[-1]
+    P = np.linalg.cholesky(sigma_u)
+    fevd = np.zeros((steps, num_vars, num_vars))
+
+    for h in range(steps):
+        suma_total = np.zeros(num_vars)
+        if h == 0:
+            for i in range(num_vars):
+                for j in range(num_vars):
+                    fevd[h, j, i] = 1.0 if i == j else 0.0
+        else:
+            for s in range(h + 1):
+                theta = psi[s] @ P
+                for i in range(num_vars):
+                    for j in range(num_vars):
+                        fevd[h, j, i] += theta[i, j] ** 2
+                        suma_total[i] += theta[i, j] ** 2
+
+            for i in range(num_vars):
+                if suma_total[i] == 0:
+                    fevd[h, :, i] = 1.0 / num_vars
+                else:
+                    fevd[h, :, i] /= suma_total[i]
+    return fevd
+
+
+def var_sintetico(num_vars, p, steps, semilla=0):
+    """
+    Genera coeficientes MA (Ψ) y Σ_u de un VAR(p) estable aleatorio.
+    """
+    rng = np.random.default_rng(semilla)
+    coefs = rng.normal(scale=0.3 / (num_vars * p) ** 0.5, size=(p, num_vars, num_vars))
+    A = rng.normal(size=(num_vars, num_vars))
+    sigma_u = A @ A.T / num_vars + np.eye(num_vars)
+
+    psi = np.zeros((steps + 1, num_vars, num_vars))
+    psi[0] = np.eye(num_vars)
+    for h in range(1, steps + 1):
+        for i in range(min(h, p)):
+            psi[h] += coefs[i] @ psi[h - i - 1]
+    return psi, sigma_u
+
+
+def medir(funcion, repeticiones=3):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), resultado
+
+
+if __name__ == '__main__':
+    print(f"{'nvars':>6} {'steps':>6} {'ciclos (s)':>12} {'vectorizado (s)':>16} {'aceleración':>12} {'max |dif|':>10}")
+    for num_vars, steps in [(5, 40), (10, 40), (10, 100), (10, 200), (20, 200)]:
+        psi, sigma_u = var_sintetico(num_vars, p=2, steps=steps)
+        t_ciclos, ref = medir(lambda: fevd_ciclos(psi, sigma_u, steps), repeticiones=1)
+        t_vec, res = medir(lambda: fevd_cholesky_vectorizado(psi, sigma_u, steps=steps))
+        dif = np.abs(ref - res).max()
+        print(f"{num_vars:>6} {steps:>6} {t_ciclos:>12.4f} {t_vec:>16.5f} {t_ciclos / t_vec:>11.0f}x {dif:>10.1e}")
@@ -0,0 +1,152 @@
+# Benchmark: rutas calientes del pipeline sobre paneles VAR sintéticos de tamaño creciente
+"""
+Uso:
+    python benchmarks/bench_hot_paths.py --salida bench_hot_paths.json
+    python benchmarks/bench_hot_paths.py --base bench_hot_paths.json --tolerancia 0.25
+
+Con --base, compara cada (función, k, T, p) contra una ejecución anterior y termina con código 1
+si alguna es más lenta que base × (1 + tolerancia).
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code'))
+from perfilado import FUNCIONES_CLAVE, Perfilador, desinstrumentar, entorno, instrumentar  # noqa: E402
+from pipeline import cargar_script  # noqa: E402
+from transformaciones import PipelineTransformacion  # noqa: E402
+
+# (k variables, T observaciones, p rezagos)
+TAMANOS = [(5, 1000, 2), (10, 2000, 4), (20, 5000, 8), (50, 10000, 12)]
+TAMANOS_RAPIDOS = TAMANOS[:2]
+SCRIPTS = ('utils.py', '01_preprocessing.py', '02_train_var.py', '03_evaluate_residuals.py',
+           '04_metrics_summary.py', '05_irf_fevd_analysis.py')
+
+
+def panel_sintetico(num_vars, T, p, semilla=0):
+    """
+    Panel diario de un VAR(p) estable; la mitad de las variables se acumula (raíz unitaria)
+    para que el preprocesamiento tenga columnas que diferenciar.
+    """
+    rng = np.random.default_rng(semilla)
+    coefs = rng.normal(scale=0.4 / (num_vars * p) ** 0.5, size=(p, num_vars, num_vars))
+    A = rng.normal(size=(num_vars, num_vars))
+    L = np.linalg.cholesky(A @ A.T / num_vars + np.eye(num_vars))
+
+    y = np.zeros((T + 100, num_vars))
+    for t in range(p, len(y)):
+        y[t] = np.einsum('lij,lj->i', coefs, y[t - p:t][::-1]) + L @ rng.standard_normal(num_vars)
+    y = y[100:]
+    y[:, ::2] = np.cumsum(y[:, ::2], axis=0)
+    y += 100.0
+    indice = pd.date_range('2000-01-01', periods=T, freq='D')
+    return pd.DataFrame(y, index=indice, columns=[f'x{i}' for i in range(num_vars)])
+
+
+def serie_anual(T, semilla=0):
+    """
+    Serie anual que, interpolada a diaria, tiene del orden de T observaciones.
+    """
+    rng = np.random.default_rng(semilla)
+    anios = max(3, T // 365 + 1)
+    valores = 100 + np.cumsum(rng.normal(size=anios))
+    return pd.Series(valores, index=pd.date_range('2000-01-01', periods=anios, freq='YS'))
+
+
+def caso(ns, num_vars, T, p, steps=40):
+    """
+    Ejecuta una vez todas las rutas calientes sobre un panel (k, T, p).
+    """
+    panel = panel_sintetico(num_vars, T, p)
+    ns['interpolar_escalonado'](serie_anual(T), frecuencia_final='D')
+
+    pipeline = PipelineTransformacion()
+    series_var, _, _, _ = ns['preprocesar_series_para_VAR'](panel, verbose=False, pipeline=pipeline)
+    n_train = int(len(series_var) * 0.8)
+    train, test, scaler = ns['estandarizar_train_test'](series_var.iloc[:n_train], series_var.iloc[n_train:],
+                                                        pipeline=pipeline)
+
+    modelo, _ = ns['ajustar_VAR'](train, p, verbose=False)
+    ns['evaluar_residuos_varios_modelos']({p: modelo}, mostrar_graficas=False)
+    ns['evaluar_metricas_VAR_train_test']({p: modelo}, train, test, min(steps, len(test) - p), None, scaler,
+                                          panel.loc[series_var.index], pipeline=pipeline)
+    ns['calcular_FEVD_cholesky'](modelo, steps=steps)
+    ns['GIRF'](modelo, [steps], guardar_figuras=False, guardar_datos=False, mostrar=False)
+
+
+def medir_tamanos(tamanos, repeticiones=3, memoria=False):
+    """
+    Tiempo mínimo (y pico de memoria) de cada función clave por tamaño de panel.
+
+    Retorna:
+        pd.DataFrame: Columnas funcion, k, T, p, segundos, cpu_segundos y memoria_pico_mb.
+    """
+    for script in SCRIPTS:
+        ns = cargar_script(script)
+
+    filas = []
+    for num_vars, T, p in tamanos:
+        perfilador = instrumentar(ns, perfilador=Perfilador(memoria=memoria))
+        try:
+            for _ in range(repeticiones):
+                with warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+                    warnings.simplefilter('ignore')
+                    caso(ns, num_vars, T, p)
+        finally:
+            desinstrumentar(ns)
+            perfilador.cerrar()
+
+        df = pd.DataFrame(perfilador.registros)
+        agregados = {'segundos': ('segundos', 'min'), 'cpu_segundos': ('cpu_segundos', 'min')}
+        if memoria:
+            agregados['memoria_pico_mb'] = ('memoria_pico_mb', 'max')
+        resumen = df.groupby('nombre').agg(**agregados).reindex(list(FUNCIONES_CLAVE))
+        for nombre, fila in resumen.iterrows():
+            filas.append({'funcion': nombre, 'k': num_vars, 'T': T, 'p': p, **fila.to_dict()})
+        print(f"✅ k={num_vars:<3} T={T:<6} p={p:<3} total={resumen['segundos'].sum():.3f} s")
+    return pd.DataFrame(filas)
+
+
+def comparar(actual, base, tolerancia=0.25):
+    """
+    Une una ejecución con una base anterior por (funcion, k, T, p) y marca las regresiones.
+    """
+    claves = ['funcion', 'k', 'T', 'p']
+    df = actual.merge(base[claves + ['segundos']], on=claves, how='left', suffixes=('', '_base'))
+    df['razon'] = df['segundos'] / df['segundos_base']
+    df['regresion'] = df['razon'] > 1 + tolerancia
+    return df
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark de las rutas calientes del pipeline VAR.")
+    parser.add_argument('--salida', default='bench_hot_paths.json', help="JSON de resultados.")
+    parser.add_argument('--base', default=None, help="JSON de una ejecución anterior para comparar.")
+    parser.add_argument('--tolerancia', type=float, default=0.25, help="Aumento relativo permitido.")
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--memoria', action='store_true', help="Medir también el pico de memoria (más lento).")
+    parser.add_argument('--rapido', action='store_true', help="Solo los tamaños pequeños.")
+    args = parser.parse_args()
+
+    resultados = medir_tamanos(TAMANOS_RAPIDOS if args.rapido else TAMANOS, args.repeticiones, args.memoria)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump({'entorno': entorno(), 'resultados': resultados.to_dict(orient='records')}, f, indent=1)
+    print(f"✅ Resultados guardados en: {args.salida}")
+
+    if args.base:
+        with open(args.base, 'r', encoding='utf-8') as f:
+            base = pd.DataFrame(json.load(f)['resultados'])
+        tabla = comparar(resultados, base, args.tolerancia)
+        with pd.option_context('display.width', 120, 'display.max_rows', None):
+            print(tabla[['funcion', 'k', 'T', 'p', 'segundos_base', 'segundos', 'razon', 'regresion']]
+                  .to_string(index=False, float_format='{:.4f}'.format))
+        if tabla['regresion'].any():
+            print(f"⚠️ {int(tabla['regresion'].sum())} regresiones por encima de {args.tolerancia:.0%}")
+            sys.exit(1)
@@ -1,5 +1,8 @@
+from scipy.interpolate import UnivariateSpline, interp1d
+
+
 # === 3. Heuristica para definir las series que deben llevar log-transform ===
-def candidatos_para_log(df, umbral_ratio=5, umbral_media=1000):
+def candidatos_para_log(df, umbral_ratio=5, umbral_media=1000, pipeline=None):
     """
     Detecta automáticamente columnas candidatas para log-transform.
 
@@ -8,6 +11,8 @@ def candidatos_para_log(df, umbral_ratio=5, umbral_media=1000):
     - Deben tener una razón entre máximo y mínimo significativa.
     - Deben tener un valor medio razonablemente alto.
 
+    Si se pasa un PipelineTransformacion en `pipeline`, registra en él las columnas candidatas.
+
     Retorna:
     --------
     Lista de nombres de columnas candidatas.
@@ -22,6 +27,8 @@ def candidatos_para_log(df, umbral_ratio=5, umbral_media=1000):
         rango = serie.max() / serie.min()
         if rango > umbral_ratio and serie.mean() > umbral_media:
             candidatos.append(col)
+    if pipeline is not None:
+        pipeline.registrar_log(candidatos)
     return candidatos
 
 # === 4. Función principal de interpolación segura y escalonada para cada serie ===
@@ -95,3 +102,160 @@ def interpolar_escalonado(serie_original, frecuencia_final='D', metodo='linear',
 
     serie.index.name = 'fecha'
     return serie
+
+
+# === 4.2 Motor de interpolación para todo el DataFrame a la vez ===
+def _coordenada_en_malla_inicial(indice_nudos, frecuencia_final, escalonado):
+    """
+    Calcula, para cada fecha de la malla destino, su posición fraccionaria en la primera malla
+    de interpolación (la de 'Q' si es escalonado, o la destino si no), tal como la produce la
+    interpolación 'linear' de pandas (lineal por posición) aplicada paso a paso (A→Q→M→D).
+
+    Solo se construyen los índices de fechas de cada paso; los valores de las series no se
+    materializan en las frecuencias intermedias.
+
+    Retorna:
+        malla (pd.DatetimeIndex): Malla destino.
+        coordenada (np.ndarray): Posición fraccionaria de cada fecha destino en la primera malla.
+        posiciones_nudos (np.ndarray): Posición de cada nudo original en la primera malla.
+    """
+    pasos = ['A', 'Q', 'M', 'D']
+    secuencia = pasos[1:pasos.index(frecuencia_final)+1] if escalonado else [frecuencia_final]
+
+    malla_anterior = None
+    coordenada = posiciones_nudos = None
+    for paso in secuencia:
+        malla = pd.date_range(start=indice_nudos.min(), end=indice_nudos.max(), freq=paso)
+        if malla_anterior is None:
+            posiciones_nudos = malla.get_indexer(indice_nudos)
+            if (posiciones_nudos < 0).any():
+                raise ValueError(f"Las fechas originales no caen en la malla '{paso}'.")
+            coordenada = np.arange(len(malla), dtype=float)
+        else:
+            posiciones = malla.get_indexer(malla_anterior)
+            if (posiciones < 0).any():
+                raise ValueError(f"Las fechas de la frecuencia previa no caen en la malla '{paso}'.")
+            coordenada = np.interp(np.arange(len(malla), dtype=float), posiciones, coordenada)
+        malla_anterior = malla
+
+    return malla_anterior, coordenada, posiciones_nudos.astype(float)
+
+
+def interpolar_panel(df_original, frecuencia_final='D', metodo='linear', escalonado=True,
+                     log_cols=None, revert_log=True):
+    """
+    Interpola todas las columnas de un DataFrame anual a una frecuencia más alta en una sola pasada.
+
+    Equivale a aplicar interpolar_escalonado() a cada columna, pero:
+        - Para 'linear', la composición de pasos A→Q→M→D se reduce a una coordenada fraccionaria
+          sobre la primera malla, calculada una sola vez con los índices de fechas; después se evalúa
+          con índices y pesos compartidos para todas las columnas (np.interp solo en columnas con NaN).
+        - Para 'spline'/'polynomial' directos (escalonado=False) se usan los mismos núcleos de SciPy
+          que pandas sobre los nudos conocidos. Con escalonado=True cada paso re-ajusta el spline
+          sobre puntos ya interpolados, por lo que se delega en interpolar_escalonado() columna a columna.
+        - El log-transform se aplica por máscara de columnas (`log_cols`).
+
+    Parámetros:
+    -----------
+    df_original : pd.DataFrame
+        Series con índice datetime anual (mismo índice para todas las columnas).
+    frecuencia_final : str
+        Frecuencia de destino: 'Q', 'M' o 'D'.
+    metodo : str
+        'linear', 'spline', 'polynomial' o 'ffill'.
+    escalonado : bool
+        Si True, reproduce la interpolación por pasos intermedios.
+    log_cols : list or None
+        Columnas a interpolar en escala logarítmica.
+    revert_log : bool
+        Si True, aplica np.exp() al final a las columnas de `log_cols`.
+
+    Retorna:
+    --------
+    pd.DataFrame con índice en frecuencia_final (nombre 'fecha').
+    """
+    if not isinstance(df_original, pd.DataFrame):
+        raise ValueError("La entrada debe ser un pd.DataFrame")
+
+    df = df_original.copy()
+    df.index = pd.to_datetime(df.index)
+    df = df.sort_index()
+
+    pasos = ['A', 'Q', 'M', 'D']
+    if frecuencia_final not in pasos:
+        raise ValueError(f"Frecuencia destino '{frecuencia_final}' no válida. Usa una de: {pasos}")
+
+    if metodo == 'ffill':
+        nueva_frecuencia = pd.date_range(start=df.index.min(), end=df.index.max(), freq=frecuencia_final)
+        df = df.reindex(nueva_frecuencia).ffill()
+        df.index.name = 'fecha'
+        return df
+
+    log_cols = [c for c in (log_cols or []) if c in df.columns]
+    mascara_log = df.columns.isin(log_cols)
+    valores = df.values.astype(float)
+    if mascara_log.any():
+        if (valores[:, mascara_log] <= 0).any():
+            raise ValueError("Hay columnas con ceros o negativos: no se puede aplicar log-transform.")
+        valores[:, mascara_log] = np.log(valores[:, mascara_log])
+
+    if metodo == 'linear':
+        malla, v, nudos = _coordenada_en_malla_inicial(df.index, frecuencia_final, escalonado)
+        resultado = np.empty((len(malla), valores.shape[1]))
+
+        # Columnas completas: mismos índices y pesos para todas
+        completas = ~np.isnan(valores).any(axis=0)
+        if len(df) > 1:
+            bajo = np.clip(np.searchsorted(nudos, v, side='right') - 1, 0, len(df) - 2)
+            peso = ((v - nudos[bajo]) / (nudos[bajo + 1] - nudos[bajo]))[:, None]
+            resultado[:, completas] = valores[bajo][:, completas] * (1 - peso) + valores[bajo + 1][:, completas] * peso
+        else:
+            resultado[:, completas] = valores[0, completas]
+
+        # Columnas con NaN: interpolación sobre sus nudos válidos (NaN antes del primero, constante tras el último)
+        for j in np.flatnonzero(~completas):
+            validos = ~np.isnan(valores[:, j])
+            if not validos.any():
+                resultado[:, j] = np.nan
+                continue
+            resultado[:, j] = np.interp(v, nudos[validos], valores[validos, j])
+            resultado[v < nudos[validos][0], j] = np.nan
+
+    elif metodo in ['spline', 'polynomial']:
+        if escalonado:
+            columnas = {}
+            for j, col in enumerate(df.columns):
+                columnas[col] = interpolar_escalonado(
+                    df[col], frecuencia_final=frecuencia_final, metodo=metodo, escalonado=True,
+                    log_transform=bool(mascara_log[j]), revert_log=False
+                )
+            resultado = pd.DataFrame(columnas).values
+            malla = pd.date_range(start=df.index.min(), end=df.index.max(), freq=frecuencia_final)
+        else:
+            malla = pd.date_range(start=df.index.min(), end=df.index.max(), freq=frecuencia_final)
+            x_nudos = df.index.values.view('i8').astype(float)
+            x_malla = malla.values.view('i8').astype(float)
+            resultado = np.empty((len(malla), valores.shape[1]))
+            for j in range(valores.shape[1]):
+                validos = ~np.isnan(valores[:, j])
+                if validos.sum() < 4:
+                    raise ValueError(f"Interpolación con '{metodo}' requiere al menos 4 puntos no nulos")
+                if metodo == 'spline':
+                    kernel = UnivariateSpline(x_nudos[validos], valores[validos, j], k=3)
+                else:
+                    kernel = interp1d(x_nudos[validos], valores[validos, j], kind=2,
+                                      fill_value=np.nan, bounds_error=False)
+                resultado[:, j] = kernel(x_malla)
+                resultado[x_malla < x_nudos[validos][0], j] = np.nan
+                # Las fechas que coinciden con nudos conservan su valor original, como en pandas
+                en_nudo = malla.get_indexer(df.index[validos])
+                resultado[en_nudo[en_nudo >= 0], j] = valores[validos, j][en_nudo >= 0]
+    else:
+        raise ValueError(f"Método '{metodo}' no válido. Usa 'linear', 'spline', 'polynomial' o 'ffill'.")
+
+    if mascara_log.any() and revert_log:
+        resultado[:, mascara_log] = np.exp(resultado[:, mascara_log])
+
+    df_interpolado = pd.DataFrame(resultado, index=malla, columns=df.columns)
+    df_interpolado.index.name = 'fecha'
+    return df_interpolado
@@ -1,11 +1,12 @@
 # Ajuste y estabilidad del modelo VAR
-def ajustar_VAR(series_var, p):
+def ajustar_VAR(series_var, p, verbose=True):
     """
     Ajusta un modelo VAR con rezagos `p` y verifica estabilidad.
 
     Parámetros:
-        df (pd.DataFrame): Serie temporal multivariada (preprocesada).
+        series_var (pd.DataFrame): Serie temporal multivariada (preprocesada).
         p (int): Número de rezagos.
+        verbose (bool): Si True, imprime el resultado del ajuste.
 
     Retorna:
         modelo_fitted (VARResults): Modelo ajustado.
@@ -15,7 +16,8 @@ def ajustar_VAR(series_var, p):
     modelo_fitted = modelo.fit(p)
     es_estable = modelo_fitted.is_stable()
 
-    print(f"🔧 Modelo VAR(p={p}) ajustado.")
-    print(f"✅ Estabilidad del modelo: {'Sí' if es_estable else 'No'}")
+    if verbose:
+        print(f"🔧 Modelo VAR(p={p}) ajustado.")
+        print(f"✅ Estabilidad del modelo: {'Sí' if es_estable else 'No'}")
 
     return modelo_fitted, es_estable
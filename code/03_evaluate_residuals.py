@@ -1,10 +1,50 @@
+from diagnosticos import autocovarianzas_cruzadas, ljung_box
+
+
+def graficar_residuos_modelo(residuos, p, lags=20):
+    """
+    Muestra residuos, ACF y PACF por variable en una sola figura (una fila por variable).
+
+    Parámetros:
+        residuos (pd.DataFrame): Residuos del modelo (modelo.resid).
+        p (int): Orden del modelo (para el título).
+        lags (int): Número de rezagos para ACF y PACF.
+
+    Retorna:
+        fig (matplotlib.figure.Figure): Figura generada.
+    """
+    num_vars = residuos.shape[1]
+    fig, axes = plt.subplots(num_vars, 3, figsize=(15, 3 * num_vars), squeeze=False)
+
+    for fila, col in enumerate(residuos.columns):
+        # Gráfico de residuos
+        axes[fila, 0].plot(residuos[col])
+        axes[fila, 0].set_title(f'Residuos - {col}')
+        axes[fila, 0].axhline(0, color='gray', linestyle='--', linewidth=0.5)
+
+        # ACF
+        plot_acf(residuos[col], lags=lags, ax=axes[fila, 1])
+        axes[fila, 1].set_title('ACF')
+
+        # PACF
+        plot_pacf(residuos[col], lags=lags, ax=axes[fila, 2], method='ywm')
+        axes[fila, 2].set_title('PACF')
+
+    fig.suptitle(f'VAR(p={p}) - Residuos', fontsize=12)
+    fig.tight_layout()
+    return fig
+
+
 def evaluar_residuos_varios_modelos(modelos_dict, lags=20, lags_ljung=10, mostrar_graficas=True):
     """
     Evalúa y visualiza los residuos de varios modelos VAR.
 
     Para cada modelo VAR:
-        - Muestra residuos, ACF y PACF horizontalmente por variable (opcional).
-        - Realiza la prueba de Ljung-Box para cada variable.
+        - Calcula una sola vez las autocovarianzas de todos los residuos (FFT) y de ellas
+          la prueba de Ljung-Box para todas las variables.
+        - Muestra residuos, ACF y PACF por variable en una figura por modelo (opcional).
+
+    Para Portmanteau multivariado y normalidad, ver diagnosticos.diagnosticar_modelos().
 
     Parámetros:
         modelos_dict (dict): Diccionario con modelos ajustados {p: modelo_fitted}.
@@ -21,30 +61,15 @@ def evaluar_residuos_varios_modelos(modelos_dict, lags=20, lags_ljung=10, mostra
         residuos = modelo.resid
         print(f"\n📊 Evaluación de residuos para modelo VAR(p={p}):")
 
-        for col in residuos.columns:
-            if mostrar_graficas:
-                fig, axes = plt.subplots(1, 3, figsize=(15, 3))
-
-                # Gráfico de residuos
-                axes[0].plot(residuos[col])
-                axes[0].set_title(f'Residuos - {col}')
-                axes[0].axhline(0, color='gray', linestyle='--', linewidth=0.5)
-
-                # ACF
-                plot_acf(residuos[col], lags=lags, ax=axes[1])
-                axes[1].set_title('ACF')
-
-                # PACF
-                plot_pacf(residuos[col], lags=lags, ax=axes[2], method='ywm')
-                axes[2].set_title('PACF')
-
-                plt.suptitle(f'VAR(p={p}) - {col}', fontsize=12)
-                plt.tight_layout()
-                plt.show()
+        if mostrar_graficas:
+            fig = graficar_residuos_modelo(residuos, p, lags=lags)
+            plt.show()
+            plt.close(fig)
 
-            # Prueba de Ljung-Box
-            ljungbox = acorr_ljungbox(residuos[col], lags=[lags_ljung], return_df=True)
-            pval = ljungbox['lb_pvalue'].iloc[0]
+        # Prueba de Ljung-Box para todas las variables a la vez
+        gamma = autocovarianzas_cruzadas(residuos, lags_ljung)
+        _, p_valores = ljung_box(gamma, len(residuos), [lags_ljung])
+        for col, pval in zip(residuos.columns, p_valores[0]):
             resultados_ljungbox.append({
                 'p': p,
                 'Variable': col,
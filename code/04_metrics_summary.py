@@ -1,12 +1,75 @@
+def _metricas(y_real, y_pred):
+    """
+    MAE, RMSE y R² entre dos vectores (R² = NaN si hay menos de 2 puntos o y_real es constante).
+    """
+    mae = mean_absolute_error(y_real, y_pred)
+    rmse = np.sqrt(mean_squared_error(y_real, y_pred))
+    if len(y_real) >= 2 and not np.allclose(y_real, y_real[0]):
+        r2 = r2_score(y_real, y_pred)
+    else:
+        r2 = np.nan
+    return {'MAE': mae, 'RMSE': rmse, 'R2': r2}
+
+
+def _evaluar_con_pipeline(modelo, p, train_series, test_series, forecast_steps, variables, pipeline, series_original):
+    """
+    Evalúa un modelo revirtiendo las transformaciones de todas las variables a la vez con
+    PipelineTransformacion.invertir() sobre arreglos NumPy.
+    """
+    columnas = list(train_series.columns)
+    niveles = series_original[columnas].values.astype(float)
+    n_train = len(train_series)
+    idx = [columnas.index(v) for v in variables]
+
+    # === TRAIN ===
+    pred_train = modelo.forecast(train_series.values[-p:], steps=p)
+    y_pred_train = pipeline.invertir(pred_train, niveles[n_train - 1 - p])
+    y_real_train = niveles[n_train - p:n_train]
+
+    # === TEST ===
+    pred_test = modelo.forecast(test_series.values[:p], steps=forecast_steps)
+    y_pred_test = pipeline.invertir(pred_test, niveles[n_train - 1])
+    y_real_test = niveles[n_train:n_train + forecast_steps]
+
+    train = {v: _metricas(y_real_train[:, i], y_pred_train[:, i]) for v, i in zip(variables, idx)}
+    test = {v: _metricas(y_real_test[:, i], y_pred_test[:, i]) for v, i in zip(variables, idx)}
+    return train, test
+
+
 def evaluar_metricas_VAR_train_test(modelos_dict, train_series, test_series, forecast_steps,
-                                    variable_objetivo, scaler, series_original):
+                                    variable_objetivo, scaler, series_original, pipeline=None):
     """
     Evalúa modelos VAR entrenados sobre series diferenciadas y estandarizadas,
     revirtiendo ambas transformaciones antes de calcular métricas reales en train y test.
+
+    Si se pasa un PipelineTransformacion en `pipeline`, la reversión (escala, diferencias y log)
+    se hace con arreglos NumPy para todas las variables a la vez; en ese caso `variable_objetivo`
+    puede ser una lista (o None para todas) y las métricas se devuelven como {p: {variable: {...}}}.
     """
     metricas_train = {}
     metricas_test = {}
 
+    if pipeline is not None:
+        una_variable = isinstance(variable_objetivo, str)
+        if variable_objetivo is None:
+            variables = list(train_series.columns)
+        else:
+            variables = [variable_objetivo] if una_variable else list(variable_objetivo)
+
+        for p, modelo in modelos_dict.items():
+            try:
+                train, test = _evaluar_con_pipeline(modelo, p, train_series, test_series, forecast_steps,
+                                                    variables, pipeline, series_original)
+            except Exception as e:
+                print(f"⚠️ Error en evaluación para p={p}")
+                traceback.print_exc()
+                vacio = {'MAE': np.nan, 'RMSE': np.nan, 'R2': np.nan}
+                train = {v: dict(vacio) for v in variables}
+                test = {v: dict(vacio) for v in variables}
+            metricas_train[p] = train[variable_objetivo] if una_variable else train
+            metricas_test[p] = test[variable_objetivo] if una_variable else test
+        return metricas_train, metricas_test
+
     for p, modelo in modelos_dict.items():
         try:
             # === Predicción en TRAIN ===
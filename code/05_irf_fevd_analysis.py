@@ -1,63 +1,100 @@
-def GIRF(modelo, horizontes, ruta="./", guardar_figuras=True, guardar_datos=True):
+from fevd import fevd_cholesky_vectorizado, fevd_a_dataframe
+from girf import coeficientes_ma, girf_pesaran_shin, gfevd_pesaran_shin
+from horizonte import seleccionar_horizonte
+from render import figura_fevd, figura_girf, figura_irf
+
+
+def GIRF(modelo, horizontes, ruta="./", guardar_figuras=True, guardar_datos=True, calcular_gfevd=False,
+         mostrar=True, tol_convergencia=0.01, max_steps=40):
     """
-    Calcula y grafica Generalized IRFs (GIRFs) para un modelo VAR ajustado.
+    Calcula y grafica Generalized IRFs (GIRFs) de Pesaran y Shin (1998) para un modelo VAR ajustado.
+
+    Las matrices Ψ se calculan una sola vez hasta max(horizontes) desde la matriz companion,
+    los choques generalizados (Σ_u e_j / sqrt(σ_jj)) se aplican a todos los impulsos en un solo
+    producto, y cada horizonte es un recorte del mismo arreglo.
 
     Parámetros:
     -----------
     modelo : VARResults
         Modelo VAR ajustado (fit).
-    horizontes : list[int]
-        Lista de horizontes a analizar (ej. [3, 18, 40]).
+    horizontes : list[int] or None
+        Lista de horizontes a analizar (ej. [3, 18, 40]). Si None, se usa el horizonte de
+        convergencia de la FEVD (seleccionar_horizonte), el mismo que en graficar_IRF(steps=None).
     ruta : str
         Carpeta donde guardar las figuras y datos.
     guardar_figuras : bool
-        Si True, guarda las gráficas en PNG.
+        Si True, guarda las gráficas en PDF.
     guardar_datos : bool
         Si True, guarda las respuestas en CSV.
+    calcular_gfevd : bool
+        Si True, calcula también la GFEVD y la guarda como GFEVD_h{h}.csv.
+    mostrar : bool
+        Si False, no dibuja ni muestra figuras (las figuras pueden generarse después desde los
+        CSV con render.renderizar_figuras()); guardar_figuras se ignora.
+    tol_convergencia, max_steps : float, int
+        Criterio de convergencia cuando horizontes es None.
+
+    Retorna:
+    --------
+    dict {h: pd.DataFrame} con las respuestas de cada horizonte.
     """
-
+    nombres = modelo.names
+
+    # 1. Ψ_0..Ψ_H y GIRF para todos los impulsos, una sola vez
+    if horizontes is None:
+        h_auto, psi = seleccionar_horizonte(modelo.coefs, modelo.sigma_u, tol_convergencia, max_steps)
+        horizontes = [h_auto]
+    else:
+        psi = coeficientes_ma(modelo.coefs, max(horizontes))
+    girf_total = girf_pesaran_shin(psi, modelo.sigma_u)  # shape: (H+1, nvars, nvars)
+    gfevd_total = gfevd_pesaran_shin(psi, modelo.sigma_u) if calcular_gfevd else None
+
+    resultados = {}
     for h in horizontes:
-        # 1. Calcular GIRF hasta el horizonte h
-        girf = modelo.irf(h)
-        fig = girf.plot(orth=False)
+        girf_responses = girf_total[:h + 1]
 
-        # 2. Ajustes de visualización
-        fig.set_size_inches(24, 24)
-        plt.suptitle(f"Generalized Impulse Response Functions (GIRFs) - Horizonte {h}",
-                     fontsize=16, y=1.02)
-        plt.tight_layout()
-        plt.show()
+        # 2. Graficar respuesta (fila) a impulso (columna)
+        fig = figura_girf(girf_responses, nombres, h, figura=plt.figure) if mostrar else None
 
         # 3. Extraer respuestas (array → DataFrame)
-        girf_responses = girf.irfs  # shape: (h+1, nvars, nvars)
         df_girf = pd.DataFrame(
             girf_responses.reshape(h+1, -1),
-            columns=[f"{resp}_to_{imp}" for imp in modelo.names for resp in modelo.names]
+            columns=[f"{resp}_to_{imp}" for imp in nombres for resp in nombres]
         )
+        resultados[h] = df_girf
 
         # 4. Guardar resultados
-        if guardar_figuras:
+        if guardar_figuras and fig is not None:
             fig.savefig(f"{ruta}/GIRF_h{h}.pdf", dpi=300, bbox_inches="tight")
         if guardar_datos:
             df_girf.to_csv(f"{ruta}/GIRF_h{h}.csv", index=False)
+            if gfevd_total is not None:
+                fevd_a_dataframe(gfevd_total[:h + 1], nombres).to_csv(f"{ruta}/GFEVD_h{h}.csv")
+        if fig is not None:
+            plt.show()
 
     print("✅ GIRFs generados correctamente.")
+    return resultados
 
 def graficar_IRF(modelo_fitted, nombres_personalizados: dict,
                       steps=40, nombre_modelo='', carpeta_salida=None,
-                      tol_convergencia=0.01, max_steps=40):
+                      tol_convergencia=0.01, max_steps=40, irf=None, mostrar=True):
     """
     Calcula y grafica IRF y FEVD con nombres personalizados, exportando resultados en CSV y PNG.
     Si steps es None, lo calcula automáticamente según convergencia de la varianza (FEVD).
 
     Parámetros:
-        modelo_fitted (VARResults): Modelo VAR entrenado.
+        modelo_fitted (VARResults o VARLigero): Modelo VAR entrenado.
         nombres_personalizados (dict): Diccionario {nombre_original: nombre_personalizado}.
-        steps (int or None): Número de pasos a futuro. Si None, se calcula automáticamente.
+        steps (int or None): Número de pasos a futuro. Si None, se calcula automáticamente con
+                             seleccionar_horizonte() (deteniéndose en cuanto la FEVD converge).
         nombre_modelo (str): Nombre del modelo (para guardar archivos).
         carpeta_salida (str): Carpeta donde guardar los archivos. Si None, no guarda.
         tol_convergencia (float): Tolerancia para definir convergencia en FEVD.
         max_steps (int): Máximo de pasos a evaluar para sugerencia automática.
+        irf (IRAnalysis or None): IRF ya calculada con modelo_fitted.irf(steps) para reutilizarla.
+        mostrar (bool): Si False, no dibuja la figura (puede generarse después desde el CSV con
+                        render.renderizar_figuras()).
     """
     if carpeta_salida:
       os.makedirs(carpeta_salida, exist_ok=True)
@@ -66,7 +103,12 @@ def graficar_IRF(modelo_fitted, nombres_personalizados: dict,
     nombres_cortos = [nombres_personalizados.get(n, n) for n in nombres]
 
     # === IRF ===
-    irf = modelo_fitted.irf(steps)
+    if irf is None:
+        if steps is None:
+            steps, _ = seleccionar_horizonte(modelo_fitted.coefs, modelo_fitted.sigma_u, tol_convergencia, max_steps)
+            print(f"✅ Horizonte seleccionado por convergencia de la FEVD: {steps}")
+        irf = modelo_fitted.irf(steps)
+    steps = irf.irfs.shape[0] - 1
     irf_data = {}
     for i, respuesta in enumerate(nombres):
         for j, impulso in enumerate(nombres):
@@ -78,9 +120,20 @@ def graficar_IRF(modelo_fitted, nombres_personalizados: dict,
     if carpeta_salida:
         irf_df.to_csv(os.path.join(carpeta_salida, f'IRF_{nombre_modelo}.csv'))
 
+    if not mostrar:
+        return irf_df, irf
+
     # === Graficar IRF ===
+    if not hasattr(irf, 'plot'):
+        # VARLigero (y BVAR/VECM) devuelve solo los arreglos: misma cuadrícula desde irf_df
+        fig_irf = figura_irf(irf_df, figura=plt.figure)
+        if carpeta_salida:
+            fig_irf.savefig(os.path.join(carpeta_salida, f'IRF_{nombre_modelo}.png'))
+        plt.show()
+        return irf_df, irf
+
     fig_irf = irf.plot(orth=False, figsize=(24, len(nombres) * 2.5))
-    plt.suptitle(f"Impulse Response Functions (IRFs) - Horizonte {h}",
+    plt.suptitle(f"Impulse Response Functions (IRFs) - Horizonte {steps}",
                      fontsize=16, y=1.02)
     palette_irf = plt.get_cmap("Set2")
     for i, ax in enumerate(fig_irf.axes):
@@ -97,12 +150,13 @@ def graficar_IRF(modelo_fitted, nombres_personalizados: dict,
             collection.set_facecolor(color)
             collection.set_edgecolor(color)
     plt.tight_layout()
-    plt.show()
     if carpeta_salida:
         fig_irf.savefig(os.path.join(carpeta_salida, f'IRF_{nombre_modelo}.png'))
+    plt.show()
 
     return irf_df, irf
-def calcular_FEVD_cholesky(modelo_fitted, steps=40, nombre_modelo='', carpeta_salida=None):
+def calcular_FEVD_cholesky(modelo_fitted, steps=40, nombre_modelo='', carpeta_salida=None, irfs=None,
+                           tol_convergencia=0.01, max_steps=40):
     """
     Calcula la Descomposición de la Varianza del Error de Pronóstico (FEVD) usando descomposición de Cholesky.
 
@@ -111,9 +165,15 @@ def calcular_FEVD_cholesky(modelo_fitted, steps=40, nombre_modelo='', carpeta_sa
 
     Args:
         modelo_fitted (VARResultsWrapper): Modelo VAR ajustado.
-        steps (int): Número de pasos hacia adelante para el análisis.
+        steps (int or None): Número de pasos hacia adelante para el análisis. Si None, se usa el
+                             horizonte de convergencia de seleccionar_horizonte().
         nombre_modelo (str): Nombre base para el archivo CSV.
         carpeta_salida (str or None): Carpeta para guardar el archivo. Si None, no guarda.
+        irfs (np.ndarray or None): Coeficientes MA precalculados (p. ej. `irf.irfs` de graficar_IRF),
+                                   forma (>= steps, nvars, nvars). Si None, se calculan con coeficientes_ma()
+                                   (sin la covarianza de parámetros que arma modelo_fitted.irf()).
+        tol_convergencia (float): Tolerancia de convergencia cuando steps es None.
+        max_steps (int): Horizonte máximo cuando steps es None.
 
     Returns:
         pd.DataFrame: Contribuciones normalizadas acumuladas por paso y variable.
@@ -121,45 +181,17 @@ def calcular_FEVD_cholesky(modelo_fitted, steps=40, nombre_modelo='', carpeta_sa
     if carpeta_salida:
         os.makedirs(carpeta_salida, exist_ok=True)
 
-    irf = modelo_fitted.irf(steps)
-    psi = irf.irfs  # (steps, nvars, nvars)
+    if steps is None:
+        steps, psi = seleccionar_horizonte(modelo_fitted.coefs, modelo_fitted.sigma_u, tol_convergencia, max_steps)
+        if irfs is None:
+            irfs = psi
+    if irfs is None:
+        irfs = coeficientes_ma(modelo_fitted.coefs, steps)  # (steps+1, nvars, nvars)
     nombres = modelo_fitted.names
-    num_vars = len(nombres)
-
-    sigma_u = modelo_fitted.sigma_u
-    P = np.linalg.cholesky(sigma_u)  # (nvars, nvars)
-
-    fevd = np.zeros((steps, num_vars, num_vars))  # (steps, caused_by, affected_var)
-
-    for h in range(steps):
-        suma_total = np.zeros(num_vars)
-        if h == 0:
-            theta = psi[0] @ P
-            for i in range(num_vars):
-                for j in range(num_vars):
-                    fevd[h, j, i] = 1.0 if i == j else 0.0
-        else:
-            for s in range(h + 1):
-                theta = psi[s] @ P
-                for i in range(num_vars):
-                    for j in range(num_vars):
-                        fevd[h, j, i] += theta[i, j] ** 2
-                        suma_total[i] += theta[i, j] ** 2
-
-            for i in range(num_vars):
-                if suma_total[i] == 0:
-                    fevd[h, :, i] = 1.0 / num_vars
-                else:
-                    fevd[h, :, i] /= suma_total[i]
-
-    datos = {}
-    for i, afectada in enumerate(nombres):
-        for j, causa in enumerate(nombres):
-            col = f"{afectada}_caused_by_{causa}"
-            datos[col] = fevd[:, j, i]
-
-    fevd_df = pd.DataFrame(datos)
-    fevd_df.index.name = "Step"
+
+    # Suma acumulada de (Ψ_s P)^2 sobre todos los horizontes a la vez
+    fevd = fevd_cholesky_vectorizado(irfs, modelo_fitted.sigma_u, steps=steps)  # (steps, caused_by, affected_var)
+    fevd_df = fevd_a_dataframe(fevd, nombres)
 
     if carpeta_salida:
         ruta = os.path.join(carpeta_salida, f'FEVD_{nombre_modelo}.csv')
@@ -170,7 +202,7 @@ def calcular_FEVD_cholesky(modelo_fitted, steps=40, nombre_modelo='', carpeta_sa
 
 
 # Gráfica de la FEVD desde la salida (df) de calcular_FEVD_cholesky()
-def graficar_FEVD_desde_df(fevd_df, nombre_modelo='', nombres_personalizados=None, carpeta_salida=None):
+def graficar_FEVD_desde_df(fevd_df, nombre_modelo='', nombres_personalizados=None, carpeta_salida=None, mostrar=True):
     """
     Grafica y guarda la descomposición de la varianza del forecast (FEVD) desde un DataFrame generado manualmente.
 
@@ -179,37 +211,9 @@ def graficar_FEVD_desde_df(fevd_df, nombre_modelo='', nombres_personalizados=Non
         nombre_modelo (str): Nombre del archivo para guardar (sin extensión).
         nombres_personalizados (dict): Diccionario para reemplazar nombres en la gráfica.
         carpeta_salida (str): Carpeta donde se guarda el archivo PNG. Si None, no se guarda.
+        mostrar (bool): Si False, solo guarda la figura (sin plt.show()) y la cierra.
     """
-    if nombres_personalizados is None:
-        nombres_personalizados = {}
-
-    variables = sorted(set(col.split('_caused_by_')[0] for col in fevd_df.columns))
-    causas = sorted(set(col.split('_caused_by_')[1] for col in fevd_df.columns))
-    colores = plt.cm.tab10(np.linspace(0, 1, len(causas)))
-
-    fig, axs = plt.subplots(len(variables), 1, figsize=(14, 3 * len(variables)), sharex=True)
-    if len(variables) == 1:
-        axs = [axs]
-
-    for i, var in enumerate(variables):
-        ax = axs[i]
-        bottom = np.zeros(fevd_df.shape[0])
-        for j, causa in enumerate(causas):
-            col = f"{var}_caused_by_{causa}"
-            label = nombres_personalizados.get(causa, causa)
-            contribucion = fevd_df[col].values
-            ax.bar(fevd_df.index, contribucion, bottom=bottom, label=label, color=colores[j])
-            bottom += contribucion
-
-        ax.set_title(nombres_personalizados.get(var, var))
-        ax.set_ylabel("Contribución acumulada")
-        ax.set_ylim(0, 1.05)
-
-    axs[-1].set_xlabel("Step")
-    handles, labels = axs[0].get_legend_handles_labels()
-    fig.legend(handles, labels, loc='upper center', bbox_to_anchor=(0.5, 1.02), ncol=min(4, len(causas)))
-    fig.suptitle("FEVD: Participación acumulada por variable causante", fontsize=14)
-    plt.tight_layout(rect=[0, 0, 1, 0.95])
+    fig = figura_fevd(fevd_df, nombres_personalizados, figura=plt.figure)
 
     # Guardar como imagen si se especifica la carpeta
     if carpeta_salida:
@@ -218,4 +222,7 @@ def graficar_FEVD_desde_df(fevd_df, nombre_modelo='', nombres_personalizados=Non
         fig.savefig(ruta, dpi=300)
         print(f"✅ Imagen guardada en: {ruta}")
 
-    plt.show()
+    if mostrar:
+        plt.show()
+    else:
+        plt.close(fig)
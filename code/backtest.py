@@ -0,0 +1,204 @@
+# Backtesting con múltiples orígenes (ventana expansiva o móvil) y actualización recursiva por mínimos cuadrados
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from transformaciones import PipelineTransformacion
+from var_ols import matriz_diseno_rezagada
+
+METRICAS = ('MAE', 'RMSE', 'R2')
+
+# Estado compartido por proceso (se envía una sola vez a cada worker)
+_DATOS = {}
+
+
+def _inicializar_worker(datos):
+    global _DATOS
+    _DATOS = datos
+
+
+def _pronosticar(params, historia, steps):
+    """
+    Pronóstico recursivo de un VAR con params en formato [intercepto; A_1'; ...; A_p'].
+    """
+    num_vars = params.shape[1]
+    p = (params.shape[0] - 1) // num_vars
+    ventana = list(historia[len(historia) - p:])
+    pronostico = np.empty((steps, num_vars))
+    for h in range(steps):
+        regresores = np.concatenate([[1.0]] + [ventana[-i - 1] for i in range(p)])
+        pronostico[h] = regresores @ params
+        ventana.append(pronostico[h])
+    return pronostico
+
+
+def _metricas_por_horizonte(y_real, y_pred):
+    """
+    MAE, RMSE y R² de la trayectoria 1..h para cada h; y_real/y_pred con forma (H, nvars).
+
+    Retorna np.ndarray de forma (H, nvars, 3). R² es NaN cuando h < 2 o la serie real es constante.
+    """
+    H = y_real.shape[0]
+    n = np.arange(1, H + 1)[:, None]
+    error = y_pred - y_real
+    mae = np.cumsum(np.abs(error), axis=0) / n
+    rmse = np.sqrt(np.cumsum(error ** 2, axis=0) / n)
+
+    media = np.cumsum(y_real, axis=0) / n
+    ss_tot = np.cumsum(y_real ** 2, axis=0) - n * media ** 2
+    ss_res = np.cumsum(error ** 2, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r2 = 1.0 - ss_res / ss_tot
+    r2[0] = np.nan
+    r2[ss_tot <= 1e-12 * np.cumsum(y_real ** 2, axis=0)] = np.nan
+    return np.stack([mae, rmse, r2], axis=-1)
+
+
+def _evaluar_bloque(p, origenes):
+    """
+    Evalúa un bloque contiguo de orígenes para un orden p.
+
+    El primer origen del bloque se estima directamente; los siguientes se obtienen por
+    actualizaciones de rango uno (Sherman-Morrison) al agregar la nueva observación y,
+    en ventana móvil, al retirar la más antigua.
+    """
+    y = _DATOS['y']
+    Y, X = _DATOS['Y'], _DATOS['X']
+    p_max, horizonte = _DATOS['p_max'], _DATOS['horizonte']
+    tamano_ventana = _DATOS['tamano_ventana']
+    m = 1 + y.shape[1] * p
+    Xp = X[:, :m]
+
+    resultados = np.empty((len(origenes), horizonte, len(_DATOS['columnas']), len(METRICAS)))
+    inicio = fin = None
+    P = B = None
+
+    for n, origen in enumerate(origenes):
+        # Filas de diseño disponibles con datos hasta origen - 1: r + p_max < origen
+        nuevo_fin = origen - p_max
+        nuevo_inicio = 0 if tamano_ventana is None else max(0, nuevo_fin - tamano_ventana)
+
+        if P is None:
+            inicio, fin = nuevo_inicio, nuevo_fin
+            if fin - inicio <= m:
+                raise ValueError(f"Muy pocas observaciones para estimar VAR(p={p}) en el origen {origen}.")
+            XtX = Xp[inicio:fin].T @ Xp[inicio:fin]
+            P = np.linalg.inv(XtX)
+            B = P @ (Xp[inicio:fin].T @ Y[inicio:fin])
+        else:
+            for r in range(fin, nuevo_fin):
+                x, e = Xp[r], Y[r] - Xp[r] @ B
+                Px = P @ x
+                K = Px / (1.0 + x @ Px)
+                B = B + np.outer(K, e)
+                P = P - np.outer(K, Px)
+            for r in range(inicio, nuevo_inicio):
+                x, e = Xp[r], Y[r] - Xp[r] @ B
+                Px = P @ x
+                K = Px / (1.0 - x @ Px)
+                B = B - np.outer(K, e)
+                P = P + np.outer(K, Px)
+            inicio, fin = nuevo_inicio, nuevo_fin
+
+        pred = _pronosticar(B, y[:origen], horizonte)
+        y_pred = _DATOS['pipeline'].invertir(pred, _DATOS['niveles'][origen - 1])
+        y_real = _DATOS['niveles'][origen:origen + horizonte]
+        resultados[n] = _metricas_por_horizonte(y_real, y_pred)
+
+    return resultados
+
+
+def backtest_VAR(series_var, rezagos, series_original, scaler=None, variables_diferenciadas=None,
+                 horizonte=4, origen_inicial=None, paso=1, ventana='expanding', tamano_ventana=None,
+                 n_jobs=None, pipeline=None):
+    """
+    Evalúa modelos VAR(p) en múltiples orígenes de pronóstico (rolling-origin).
+
+    En lugar de reestimar desde cero en cada origen, los coeficientes se actualizan por mínimos
+    cuadrados recursivos (actualizaciones de rango uno de (X'X)⁻¹) cuando la ventana crece y,
+    en ventana móvil, también cuando se retira la observación más antigua. Los orígenes se
+    dividen en bloques contiguos que se evalúan en paralelo; cada bloque parte de una
+    estimación directa, lo que además acota la acumulación de error numérico.
+
+    Todos los órdenes p comparten la misma matriz de diseño (orden max(rezagos)), por lo que se
+    estiman sobre la misma muestra efectiva en cada origen.
+
+    Parámetros:
+        series_var (pd.DataFrame): Series transformadas (diferenciadas y/o estandarizadas) usadas por el VAR.
+        rezagos (iterable of int): Órdenes p a evaluar.
+        series_original (pd.DataFrame): Series en niveles; debe contener el índice de series_var.
+        scaler (StandardScaler or None): Escalador aplicado a series_var. Si None, no se revierte escala.
+        variables_diferenciadas (list or None): Columnas diferenciadas. Si None, se asume que todas lo están
+                                                (mismo supuesto que evaluar_metricas_VAR_train_test).
+        horizonte (int): Pasos a pronosticar desde cada origen.
+        origen_inicial (int or None): Primera posición de pronóstico en series_var (número de observaciones
+                                      de entrenamiento). Si None, usa la mitad de la muestra.
+        paso (int): Separación entre orígenes consecutivos.
+        ventana (str): 'expanding' (ventana creciente) o 'rolling' (tamaño fijo).
+        tamano_ventana (int or None): Filas de diseño en ventana móvil. Si None, las del primer origen.
+        n_jobs (int or None): Número de procesos. Si None usa os.cpu_count(); si 1, en serie.
+        pipeline (PipelineTransformacion or None): Transformaciones a revertir (incluye log). Si se indica,
+                                                   se ignoran `scaler` y `variables_diferenciadas`.
+
+    Retorna:
+        metricas (np.ndarray): Forma (n_p, n_origenes, horizonte, nvars, 3) con MAE/RMSE/R² de la
+                               trayectoria 1..h en niveles.
+        tabla (pd.DataFrame): La misma información en formato largo
+                              (p, origen, horizonte, variable, MAE, RMSE, R2).
+    """
+    rezagos = sorted(rezagos)
+    p_max = rezagos[-1]
+    columnas = list(series_var.columns)
+    y = series_var.values.astype(float)
+    T = len(y)
+
+    if origen_inicial is None:
+        origen_inicial = T // 2
+    origenes = np.arange(max(origen_inicial, p_max + 1), T - horizonte + 1, paso)
+    if len(origenes) == 0:
+        raise ValueError("No hay orígenes con horizonte completo para los parámetros indicados.")
+
+    if ventana == 'expanding':
+        tamano_ventana = None
+    elif ventana == 'rolling':
+        if tamano_ventana is None:
+            tamano_ventana = origenes[0] - p_max
+    else:
+        raise ValueError("ventana debe ser 'expanding' o 'rolling'")
+
+    if pipeline is None:
+        pipeline = PipelineTransformacion(columnas)
+        pipeline.registrar_diferencias(columnas if variables_diferenciadas is None else variables_diferenciadas)
+        if scaler is not None:
+            pipeline.registrar_escala(scaler, columnas)
+    Y, X = matriz_diseno_rezagada(y, p_max)
+    datos = {
+        'y': y, 'Y': Y, 'X': X, 'p_max': p_max, 'horizonte': horizonte,
+        'tamano_ventana': tamano_ventana, 'columnas': columnas,
+        'niveles': series_original.loc[series_var.index, columnas].values.astype(float),
+        'pipeline': pipeline,
+    }
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    bloques = [b for b in np.array_split(origenes, max(1, min(n_jobs, len(origenes)))) if len(b)]
+    tareas = [(p, bloque) for p in rezagos for bloque in bloques]
+
+    if n_jobs == 1:
+        _inicializar_worker(datos)
+        resultados = [_evaluar_bloque(p, bloque) for p, bloque in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_inicializar_worker, initargs=(datos,)) as pool:
+            futuros = [pool.submit(_evaluar_bloque, p, bloque) for p, bloque in tareas]
+            resultados = [f.result() for f in futuros]
+
+    metricas = np.concatenate(resultados, axis=0).reshape(len(rezagos), len(origenes), horizonte, len(columnas), len(METRICAS))
+
+    indice = pd.MultiIndex.from_product(
+        [rezagos, series_var.index[origenes - 1], range(1, horizonte + 1), columnas],
+        names=['p', 'origen', 'horizonte', 'variable']
+    )
+    tabla = pd.DataFrame(metricas.reshape(-1, len(METRICAS)), index=indice, columns=METRICAS).reset_index()
+    return metricas, tabla
@@ -0,0 +1,69 @@
+# Motores en lote compartidos por las bandas bootstrap (bootstrap.py) y bayesianas (bvar.py)
+import numpy as np
+
+from fevd import fevd_cholesky_vectorizado
+from girf import coeficientes_ma, girf_pesaran_shin, matriz_companion
+
+RESULTADOS = ('irf', 'orth_irf', 'girf', 'fevd')
+
+
+def resultados_replicas(coefs, sigma_u, steps, calcular):
+    """
+    Estabilidad e IRF/GIRF/FEVD de un lote de modelos, calculados a la vez para todo el lote.
+
+    Parámetros:
+        coefs (np.ndarray): Forma (B, p, nvars, nvars).
+        sigma_u (np.ndarray): Forma (B, nvars, nvars).
+        steps (int): Horizonte máximo.
+        calcular (tuple): Subconjunto de RESULTADOS.
+
+    Retorna:
+        dict: 'estable' (B,) y, por cada nombre de `calcular`, un arreglo (B, steps + 1, respuesta, impulso);
+              la FEVD con la forma de fevd_cholesky_vectorizado(), (B, steps, caused_by, affected_var).
+    """
+    psi = coeficientes_ma(coefs, steps)
+    salida = {'estable': np.all(np.abs(np.linalg.eigvals(matriz_companion(coefs))) < 1, axis=-1)}
+    for nombre in calcular:
+        if nombre == 'irf':
+            salida[nombre] = psi
+        elif nombre == 'orth_irf':
+            salida[nombre] = psi @ np.linalg.cholesky(sigma_u)[:, None]
+        elif nombre == 'girf':
+            salida[nombre] = girf_pesaran_shin(psi, sigma_u)
+        elif nombre == 'fevd':
+            salida[nombre] = fevd_cholesky_vectorizado(psi, sigma_u, steps=steps)
+    return salida
+
+
+def estimaciones_puntuales(coefs, sigma_u, steps, calcular):
+    """
+    IRF/GIRF/FEVD de un solo modelo, coefs (p, nvars, nvars) y sigma_u (nvars, nvars).
+
+    Retorna:
+        dict: {nombre: arreglo} para cada nombre de `calcular`.
+    """
+    psi = coeficientes_ma(coefs, steps)
+    puntuales = {
+        'irf': psi,
+        'orth_irf': psi @ np.linalg.cholesky(sigma_u),
+        'girf': girf_pesaran_shin(psi, sigma_u),
+        'fevd': fevd_cholesky_vectorizado(psi, sigma_u, steps=steps),
+    }
+    return {nombre: puntuales[nombre] for nombre in calcular}
+
+
+def percentiles_replicas(replicas, cuantiles):
+    """
+    Percentiles sobre el eje de réplicas ignorando NaN. np.nanpercentile pierde el eje de los
+    cuantiles con arreglos vacíos (p. ej. la FEVD con steps=0); ahí basta np.percentile.
+
+    Parámetros:
+        replicas (np.ndarray): Réplicas en el eje 0.
+        cuantiles (list of float): Percentiles en [0, 100].
+
+    Retorna:
+        np.ndarray: Forma (len(cuantiles),) + replicas.shape[1:].
+    """
+    if replicas.size == 0:
+        return np.percentile(replicas, cuantiles, axis=0)
+    return np.nanpercentile(replicas, cuantiles, axis=0)
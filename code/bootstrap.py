@@ -0,0 +1,202 @@
+# Bandas de confianza bootstrap (residual o wild) para IRF, GIRF y FEVD con simulación vectorizada
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from bandas import RESULTADOS, estimaciones_puntuales, percentiles_replicas, resultados_replicas
+from var_ols import matriz_diseno_rezagada
+
+METODOS = ('residual', 'wild')
+
+# Estado compartido por proceso (se envía una sola vez a cada worker)
+_DATOS = {}
+
+
+def _inicializar_worker(datos):
+    global _DATOS
+    _DATOS = datos
+
+
+def _generar_muestras(rng, tamano):
+    """
+    Genera `tamano` muestras bootstrap a la vez, forma (tamano, T, nvars).
+
+    La recursión y*_t = c + Σ_i A_i y*_{t-i} + u*_t avanza en t para todas las réplicas
+    simultáneamente; los valores iniciales son los primeros p datos observados.
+    """
+    y, coefs, intercept = _DATOS['y'], _DATOS['coefs'], _DATOS['intercept']
+    residuos = _DATOS['residuos']
+    p = coefs.shape[0]
+    T, num_vars = y.shape
+    nobs = T - p
+
+    if _DATOS['metodo'] == 'residual':
+        innovaciones = residuos[rng.integers(0, nobs, size=(tamano, nobs))]
+    else:
+        # Wild bootstrap con pesos de Rademacher: conserva la heterocedasticidad de cada fecha
+        signos = rng.choice(np.array([-1.0, 1.0]), size=(tamano, nobs))
+        innovaciones = residuos[None, :, :] * signos[..., None]
+
+    muestras = np.empty((tamano, T, num_vars))
+    muestras[:, :p] = y[:p]
+    for t in range(p, T):
+        rezagos = muestras[:, t - p:t][:, ::-1]  # (B, p, nvars), rezago 1 primero
+        muestras[:, t] = intercept + np.einsum('bik,ijk->bj', rezagos, coefs) + innovaciones[:, t - p]
+    return muestras
+
+
+def _estimar_lote(muestras, p):
+    """
+    Reestima un VAR(p) con constante para cada réplica mediante mínimos cuadrados en lote.
+
+    Retorna:
+        coefs (np.ndarray): Forma (B, p, nvars, nvars), como `modelo.coefs`.
+        sigma_u (np.ndarray): Forma (B, nvars, nvars), con la corrección de grados de libertad de statsmodels.
+    """
+    B, T, num_vars = muestras.shape
+    nobs, m = T - p, 1 + num_vars * p
+
+    X = np.empty((B, nobs, m))
+    X[..., 0] = 1.0
+    for i in range(p):
+        X[..., 1 + i * num_vars:1 + (i + 1) * num_vars] = muestras[:, p - 1 - i:T - 1 - i]
+    Y = muestras[:, p:]
+
+    Xt = np.swapaxes(X, -1, -2)
+    params = np.linalg.solve(Xt @ X, Xt @ Y)  # (B, m, nvars)
+    residuos = Y - X @ params
+    sigma_u = np.swapaxes(residuos, -1, -2) @ residuos / (nobs - m)
+
+    coefs = params[:, 1:].reshape(B, p, num_vars, num_vars).transpose(0, 1, 3, 2)
+    return coefs, sigma_u
+
+
+def _residuos_muestra(y, coefs, intercept):
+    """
+    Residuos u_t = y_t - c - Σ_i A_i y_{t-i} del modelo sobre la muestra y (forma (T - p, nvars)).
+
+    Se recalculan desde los datos para que coincidan siempre con y, aunque el modelo guarde
+    residuos de otra muestra efectiva (p. ej. VARLigero de ajustar_VAR_rango con p < p_max).
+    """
+    p, num_vars = coefs.shape[0], coefs.shape[-1]
+    Y, X = matriz_diseno_rezagada(y, p)
+    params = np.vstack([intercept, coefs.transpose(0, 2, 1).reshape(p * num_vars, num_vars)])
+    return Y - X @ params
+
+
+def _replicas_lote(semilla, tamano):
+    """
+    Simula, reestima y calcula IRF/GIRF/FEVD para un lote de réplicas con su propia semilla.
+    """
+    rng = np.random.default_rng(semilla)
+    coefs, sigma_u = _estimar_lote(_generar_muestras(rng, tamano), _DATOS['coefs'].shape[0])
+    return resultados_replicas(coefs, sigma_u, _DATOS['steps'], _DATOS['calcular'])
+
+
+def bootstrap_VAR(modelo_fitted, series_var=None, B=2000, steps=40, metodo='residual', alpha=0.05,
+                  calcular=RESULTADOS, n_jobs=None, tamano_lote=None, semilla=None, guardar_replicas=False):
+    """
+    Bandas de confianza por percentiles para IRF, IRF ortogonalizada, GIRF y FEVD mediante
+    bootstrap de residuos (remuestreo con reemplazo) o wild bootstrap (pesos de Rademacher).
+
+    Todas las réplicas de un lote se generan como un arreglo (lote × T × nvars) con la recursión
+    del VAR vectorizada sobre las réplicas, se reestiman con mínimos cuadrados en lote y sus
+    Ψ, GIRF y FEVD se obtienen con los motores vectorizados de girf.py y fevd.py. Los lotes se
+    reparten en un pool de procesos; cada lote usa una semilla derivada de
+    np.random.SeedSequence(semilla), por lo que el resultado no depende de n_jobs.
+
+    Parámetros:
+        modelo_fitted (VARResults o VARLigero): Modelo VAR ajustado (p. ej. salida de ajustar_VAR).
+        series_var (pd.DataFrame or None): Datos del ajuste. Si None, usa `modelo_fitted.endog`.
+                                           Los residuos a remuestrear se recalculan sobre esta serie.
+        B (int): Número de réplicas bootstrap.
+        steps (int): Horizonte máximo.
+        metodo (str): 'residual' o 'wild'.
+        alpha (float): Las bandas son los percentiles alpha/2 y 1 - alpha/2.
+        calcular (tuple): Subconjunto de ('irf', 'orth_irf', 'girf', 'fevd').
+        n_jobs (int or None): Número de procesos. Si None usa os.cpu_count(); si 1, en serie.
+        tamano_lote (int or None): Réplicas por lote. Si None, se elige para acotar la matriz de diseño a ~256 MB.
+        semilla (int or None): Semilla para reproducibilidad.
+        guardar_replicas (bool): Si True, incluye las réplicas completas en el resultado.
+
+    Retorna:
+        dict: {nombre: {'puntual', 'inferior', 'mediana', 'superior'[, 'replicas']}} para cada
+              elemento de `calcular` (IRF/GIRF con forma (steps+1, respuesta, impulso); FEVD con
+              forma (steps, caused_by, affected_var)), más 'proporcion_estable' de las réplicas.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"metodo debe ser uno de: {METODOS}")
+    calcular = tuple(calcular)
+    for nombre in calcular:
+        if nombre not in RESULTADOS:
+            raise ValueError(f"'{nombre}' no válido. Usa uno de: {RESULTADOS}")
+
+    y = np.asarray(modelo_fitted.endog if series_var is None else series_var, dtype=float)
+    coefs = np.asarray(modelo_fitted.coefs, dtype=float)
+    intercept = np.asarray(modelo_fitted.intercept, dtype=float)
+    residuos = _residuos_muestra(y, coefs, intercept)
+    if metodo == 'residual':
+        residuos = residuos - residuos.mean(axis=0)
+
+    p, num_vars = coefs.shape[0], coefs.shape[-1]
+    nobs = len(y) - p
+    if tamano_lote is None:
+        tamano_lote = max(1, int(2 ** 28 / (8 * nobs * (1 + num_vars * p))))
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+
+    tamanos = [min(tamano_lote, B - inicio) for inicio in range(0, B, tamano_lote)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+    datos = {
+        'y': y, 'coefs': coefs, 'intercept': intercept, 'residuos': residuos,
+        'metodo': metodo, 'steps': steps, 'calcular': calcular,
+    }
+
+    n_jobs = max(1, min(n_jobs, len(tamanos)))
+    if n_jobs == 1:
+        _inicializar_worker(datos)
+        lotes = [_replicas_lote(s, t) for s, t in zip(semillas, tamanos)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_inicializar_worker, initargs=(datos,)) as pool:
+            futuros = [pool.submit(_replicas_lote, s, t) for s, t in zip(semillas, tamanos)]
+            lotes = [f.result() for f in futuros]
+
+    puntuales = estimaciones_puntuales(coefs, np.asarray(modelo_fitted.sigma_u, dtype=float), steps, calcular)
+    resultado = {'proporcion_estable': float(np.concatenate([l['estable'] for l in lotes]).mean())}
+    cuantiles = [100 * alpha / 2, 50, 100 * (1 - alpha / 2)]
+    for nombre in calcular:
+        replicas = np.concatenate([l[nombre] for l in lotes], axis=0)
+        inferior, mediana, superior = percentiles_replicas(replicas, cuantiles)
+        resultado[nombre] = {'puntual': puntuales[nombre], 'inferior': inferior,
+                             'mediana': mediana, 'superior': superior}
+        if guardar_replicas:
+            resultado[nombre]['replicas'] = replicas
+    return resultado
+
+
+def bandas_a_dataframe(bandas, nombres, nombres_personalizados=None):
+    """
+    Convierte las bandas de una IRF/GIRF (steps+1, respuesta, impulso) al formato de columnas
+    'respuesta_resp_to_impulso' de graficar_IRF(), con un nivel adicional para la banda.
+
+    Parámetros:
+        bandas (dict): Un elemento de bootstrap_VAR(), p. ej. resultado['irf'].
+        nombres (list): Nombres de las variables en el orden del modelo.
+        nombres_personalizados (dict or None): {nombre_original: nombre_personalizado}.
+
+    Retorna:
+        pd.DataFrame: Índice 'Step' y columnas MultiIndex (serie, banda).
+    """
+    nombres_personalizados = nombres_personalizados or {}
+    cortos = [nombres_personalizados.get(n, n) for n in nombres]
+    columnas = [f"{respuesta}_resp_to_{impulso}" for respuesta in cortos for impulso in cortos]
+
+    marcos = {}
+    for banda in ('puntual', 'inferior', 'mediana', 'superior'):
+        valores = bandas[banda]
+        marcos[banda] = pd.DataFrame(valores.reshape(valores.shape[0], -1), columns=columnas)
+    df = pd.concat(marcos, axis=1).swaplevel(axis=1)[columnas]
+    df.index.name = 'Step'
+    return df
@@ -0,0 +1,268 @@
+# VAR bayesiano con prior Minnesota (normal-inversa-Wishart conjugada) y posterior en forma cerrada
+import numpy as np
+import pandas as pd
+from scipy.special import multigammaln
+
+from bandas import RESULTADOS, estimaciones_puntuales, percentiles_replicas, resultados_replicas
+from var_ols import VARLigero, matriz_diseno_rezagada
+
+LAMBDAS = np.logspace(-2, 1, 31)
+
+
+def _varianzas_ar1(Y, X, num_vars):
+    """
+    σ_j² de un AR(1) con constante por variable, que fija la escala relativa del prior.
+    """
+    rezago = X[:, 1:1 + num_vars] - X[:, 1:1 + num_vars].mean(axis=0)
+    y = Y - Y.mean(axis=0)
+    beta = (rezago * y).sum(axis=0) / (rezago ** 2).sum(axis=0)
+    residuos = y - beta * rezago
+    return (residuos ** 2).sum(axis=0) / (len(Y) - 2)
+
+
+class PriorMinnesota:
+    """
+    Prior Minnesota conjugado: B | Σ ~ MN(B0, Σ ⊗ λ²D), Σ ~ IW(S0, ν0), con las cantidades
+    de la muestra que no dependen de la rigidez global λ.
+
+    D es diagonal: 1 / (l^decaimiento · σ_j²) para el rezago l de la variable j y
+    `varianza_constante` para la constante (prácticamente difusa). Con ν0 = nvars + 2 y
+    S0 = (ν0 - nvars - 1) diag(σ²), la varianza a priori del coeficiente (l, j) en la ecuación i
+    es λ² σ_i² / (l^decaimiento σ_j²), como en Minnesota.
+
+    La descomposición espectral D^½ X'X D^½ = V diag(e) V' se calcula una sola vez; para
+    cualquier λ, con d = e + λ⁻²:
+        Ω̄ = D^½ V diag(1/d) V' D^½,  B̄ = D^½ V diag(1/d) (c1/λ² + c2),
+        log|Ω0| - log|Ω̄| = Σ log(1 + λ² e),
+    donde c1 = V' D^-½ B0 y c2 = V' D^½ X'Y. Así, evaluar toda una malla de λ no requiere
+    volver a factorizar.
+    """
+
+    def __init__(self, Y, X, decaimiento=2.0, media_propia=0.0, varianza_constante=1e6):
+        self.nobs, self.num_vars = Y.shape
+        self.m = X.shape[1]
+        p = (self.m - 1) // self.num_vars
+
+        self.sigma2 = _varianzas_ar1(Y, X, self.num_vars) if p else Y.var(axis=0, ddof=1)
+        rezagos = np.repeat(np.arange(1, p + 1), self.num_vars)
+        self.D = np.concatenate([[varianza_constante], 1.0 / (rezagos ** decaimiento * np.tile(self.sigma2, p))])
+        self.B0 = np.zeros((self.m, self.num_vars))
+        if p:
+            self.B0[1:1 + self.num_vars] = media_propia * np.eye(self.num_vars)
+        self.nu0 = self.num_vars + 2
+        self.S0 = (self.nu0 - self.num_vars - 1) * np.diag(self.sigma2)
+
+        self.raiz_D = np.sqrt(self.D)
+        self.e, self.V = np.linalg.eigh(self.raiz_D[:, None] * (X.T @ X) * self.raiz_D[None, :])
+        self.e = np.clip(self.e, 0.0, None)
+        self.c1 = self.V.T @ (self.B0 / self.raiz_D[:, None])
+        self.c2 = self.V.T @ (self.raiz_D[:, None] * (X.T @ Y))
+        self.B0DB0 = self.B0.T @ (self.B0 / self.D[:, None])
+        self.YtY = Y.T @ Y
+
+    def _S_posterior(self, inv_l2, c, d):
+        return self.S0 + self.YtY + self.B0DB0 * inv_l2 - np.einsum('...mi,...m,...mj->...ij', c, 1.0 / d, c)
+
+    def log_verosimilitud_marginal(self, lambdas):
+        """
+        log p(Y | λ) para un arreglo de λ, vectorizado sobre la malla.
+
+        p(Y) = π^(-Tk/2) Γ_k(ν̄/2)/Γ_k(ν0/2) |Ω0|^(-k/2) |Ω̄|^(k/2) |S0|^(ν0/2) |S̄|^(-ν̄/2)
+        """
+        lambdas = np.atleast_1d(np.asarray(lambdas, dtype=float))
+        T, k = self.nobs, self.num_vars
+        inv_l2 = lambdas[:, None, None] ** -2.0
+        d = self.e[None, :] + inv_l2[:, :, 0]
+        c = self.c1[None] * inv_l2 + self.c2[None]
+        S = self._S_posterior(inv_l2, c, d)
+
+        nu = self.nu0 + T
+        return (-0.5 * T * k * np.log(np.pi)
+                + multigammaln(nu / 2, k) - multigammaln(self.nu0 / 2, k)
+                - 0.5 * k * np.log1p(lambdas[:, None] ** 2 * self.e[None, :]).sum(axis=1)
+                + 0.5 * self.nu0 * np.linalg.slogdet(self.S0)[1] - 0.5 * nu * np.linalg.slogdet(S)[1])
+
+    def posterior(self, lam):
+        """
+        Parámetros de la posterior NIW para un λ.
+
+        Retorna:
+            B (np.ndarray): Media posterior de los coeficientes, forma (m, nvars) como `params`.
+            S (np.ndarray): Matriz de escala de la inversa-Wishart posterior.
+            nu (int): Grados de libertad posteriores.
+            raiz_omega (np.ndarray): Factor R con Ω̄ = R R' (para muestrear sin factorizar).
+        """
+        inv_l2 = lam ** -2.0
+        d = self.e + inv_l2
+        c = self.c1 * inv_l2 + self.c2
+        B = self.raiz_D[:, None] * (self.V @ (c / d[:, None]))
+        S = self._S_posterior(inv_l2, c, d)
+        raiz_omega = self.raiz_D[:, None] * self.V / np.sqrt(d)[None, :]
+        return B, S, self.nu0 + self.nobs, raiz_omega
+
+
+class VARBayesiano(VARLigero):
+    """
+    VAR(p) bayesiano con la interfaz de VARLigero (y por lo tanto de VARResults en lo que usa
+    el pipeline): `params` es la media posterior de los coeficientes y `sigma_u` la media
+    posterior de Σ, S̄ / (ν̄ - nvars - 1). Puede usarse en los diccionarios {p: modelo} de
+    evaluar_residuos_varios_modelos(), evaluar_metricas_VAR_train_test(), graficar_IRF(), etc.
+    """
+
+    def __init__(self, prior, lam, names, Y=None, X=None, index=None, tabla_lambda=None, endog=None):
+        params, S, nu, raiz_omega = prior.posterior(lam)
+        super().__init__(params, S / (nu - prior.num_vars - 1), prior.nobs, names, Y=Y, X=X, index=index,
+                         endog=endog)
+        self.lam = float(lam)
+        self.S_posterior = S
+        self.nu_posterior = nu
+        self.log_ml = float(prior.log_verosimilitud_marginal(lam)[0])
+        self.tabla_lambda = tabla_lambda
+        self._raiz_omega = raiz_omega
+
+    def muestrear(self, n, semilla=None):
+        """
+        Extrae n muestras de la posterior (Σ, B) a la vez.
+
+        Σ⁻¹ ~ Wishart(S̄⁻¹, ν̄) se genera con la descomposición de Bartlett en lote (Σ⁻¹ = LA (LA)'),
+        y B | Σ ~ MN(B̄, Σ ⊗ Ω̄) como B̄ + R Z (LA)⁻¹, con R el factor de Ω̄ ya calculado; así
+        (LA)⁻¹ sirve a la vez para Σ y para su raíz, sin otra factorización por muestra.
+
+        Retorna:
+            params (np.ndarray): Forma (n, m, nvars).
+            sigma_u (np.ndarray): Forma (n, nvars, nvars).
+        """
+        rng = np.random.default_rng(semilla)
+        k = self.neqs
+        L = np.linalg.cholesky(np.linalg.inv(self.S_posterior))
+        A = np.tril(rng.standard_normal((n, k, k)), -1)
+        diagonal = np.arange(k)
+        A[:, diagonal, diagonal] = np.sqrt(rng.chisquare(self.nu_posterior - diagonal, size=(n, k)))
+
+        inv_LA = np.linalg.inv(L @ A)
+        sigma_u = np.swapaxes(inv_LA, -1, -2) @ inv_LA
+        Z = rng.standard_normal((n, self.df_model, k))
+        params = self.params + np.einsum('ma,nab->nmb', self._raiz_omega, Z) @ inv_LA
+        return params, sigma_u
+
+
+def ajustar_BVAR(series_var, p, lambdas=LAMBDAS, decaimiento=2.0, media_propia=0.0, varianza_constante=1e6,
+                 verbose=True):
+    """
+    Ajusta un VAR(p) bayesiano con prior Minnesota y verifica estabilidad (análogo a ajustar_VAR).
+
+    La rigidez global λ se elige maximizando la verosimilitud marginal sobre `lambdas`
+    (evaluada para toda la malla con una sola descomposición espectral); valores pequeños de λ
+    encogen los coeficientes hacia `media_propia` en el primer rezago propio y 0 en el resto.
+
+    Parámetros:
+        series_var (pd.DataFrame): Serie temporal multivariada (preprocesada).
+        p (int): Número de rezagos.
+        lambdas (float or array): λ fijo o malla de candidatos.
+        decaimiento (float): Exponente del encogimiento por rezago (varianza ∝ 1 / l^decaimiento).
+        media_propia (float): Media a priori del primer rezago propio (0 para series diferenciadas,
+                              1 para series en niveles tipo caminata aleatoria).
+        varianza_constante (float): Varianza a priori relativa de la constante.
+        verbose (bool): Si True, imprime el resultado del ajuste.
+
+    Retorna:
+        modelo (VARBayesiano): Modelo ajustado (con `tabla_lambda` si se usó una malla).
+        es_estable (bool): True si la media posterior es estable.
+    """
+    if isinstance(series_var, pd.DataFrame):
+        nombres, indice = list(series_var.columns), series_var.index[p:]
+    else:
+        nombres, indice = [f'y{i + 1}' for i in range(np.shape(series_var)[1])], None
+    y = np.asarray(series_var, dtype=float)
+    Y, X = matriz_diseno_rezagada(y, p)
+    prior = PriorMinnesota(Y, X, decaimiento=decaimiento, media_propia=media_propia,
+                           varianza_constante=varianza_constante)
+
+    lambdas = np.atleast_1d(np.asarray(lambdas, dtype=float))
+    tabla = None
+    if len(lambdas) > 1:
+        tabla = pd.DataFrame({'log_ml': prior.log_verosimilitud_marginal(lambdas)},
+                             index=pd.Index(lambdas, name='lambda'))
+    lam = lambdas[0] if tabla is None else tabla['log_ml'].idxmax()
+
+    modelo = VARBayesiano(prior, lam, nombres, Y=Y, X=X, index=indice, tabla_lambda=tabla, endog=y)
+    es_estable = modelo.is_stable()
+
+    if verbose:
+        print(f"🔧 Modelo BVAR(p={p}) ajustado con λ = {lam:.4g} (log ML = {modelo.log_ml:.2f}).")
+        if tabla is not None and lam in (lambdas.min(), lambdas.max()):
+            print("⚠️ λ óptimo en el borde de la malla; conviene ampliarla.")
+        print(f"✅ Estabilidad del modelo: {'Sí' if es_estable else 'No'}")
+
+    return modelo, es_estable
+
+
+def ajustar_BVAR_rezagos(series_var, rezagos, verbose=True, **kwargs):
+    """
+    Ajusta BVAR(p) para varios órdenes y devuelve el diccionario {p: modelo} del pipeline.
+
+    Retorna:
+        modelos (dict): {p: VARBayesiano}.
+        tabla (pd.DataFrame): λ elegido, log ML y estabilidad por p.
+    """
+    modelos, filas = {}, []
+    for p in rezagos:
+        modelo, estable = ajustar_BVAR(series_var, p, verbose=False, **kwargs)
+        modelos[p] = modelo
+        filas.append({'p': p, 'lambda': modelo.lam, 'log_ml': modelo.log_ml, 'estable': estable})
+    tabla = pd.DataFrame(filas).set_index('p')
+    if verbose:
+        print(tabla.to_string(float_format='{:.4g}'.format))
+    return modelos, tabla
+
+
+def bandas_posteriores(modelo_bayesiano, n=2000, steps=40, alpha=0.05, calcular=RESULTADOS, tamano_lote=500,
+                       semilla=None, descartar_inestables=False, guardar_replicas=False):
+    """
+    Bandas creíbles de IRF, IRF ortogonalizada, GIRF y FEVD a partir de muestras de la posterior.
+
+    Las muestras se extraen por lotes con VARBayesiano.muestrear() y sus Ψ, GIRF y FEVD se
+    calculan con los mismos motores en lote que bootstrap_VAR(); el resultado tiene el mismo
+    formato, por lo que sirve con bandas_a_dataframe().
+
+    Parámetros:
+        modelo_bayesiano (VARBayesiano): Salida de ajustar_BVAR().
+        n (int): Número de muestras de la posterior.
+        steps (int): Horizonte máximo.
+        alpha (float): Las bandas son los percentiles alpha/2 y 1 - alpha/2.
+        calcular (tuple): Subconjunto de ('irf', 'orth_irf', 'girf', 'fevd').
+        tamano_lote (int): Muestras por lote.
+        semilla (int or None): Semilla para reproducibilidad.
+        descartar_inestables (bool): Si True, excluye las muestras no estables de las bandas.
+        guardar_replicas (bool): Si True, incluye las muestras completas en el resultado.
+
+    Retorna:
+        dict: {nombre: {'puntual', 'inferior', 'mediana', 'superior'[, 'replicas']}} más 'proporcion_estable'.
+    """
+    calcular = tuple(calcular)
+    for nombre in calcular:
+        if nombre not in RESULTADOS:
+            raise ValueError(f"'{nombre}' no válido. Usa uno de: {RESULTADOS}")
+
+    p, k = modelo_bayesiano.k_ar, modelo_bayesiano.neqs
+    tamanos = [min(tamano_lote, n - inicio) for inicio in range(0, n, tamano_lote)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+    lotes = []
+    for semilla_lote, tamano in zip(semillas, tamanos):
+        params, sigma_u = modelo_bayesiano.muestrear(tamano, semilla_lote)
+        coefs = params[:, 1:].reshape(tamano, p, k, k).transpose(0, 1, 3, 2)
+        lotes.append(resultados_replicas(coefs, sigma_u, steps, calcular))
+
+    estables = np.concatenate([l['estable'] for l in lotes])
+    puntuales = estimaciones_puntuales(modelo_bayesiano.coefs, modelo_bayesiano.sigma_u, steps, calcular)
+    resultado = {'proporcion_estable': float(estables.mean())}
+    cuantiles = [100 * alpha / 2, 50, 100 * (1 - alpha / 2)]
+    for nombre in calcular:
+        replicas = np.concatenate([l[nombre] for l in lotes], axis=0)
+        usadas = replicas[estables] if descartar_inestables else replicas
+        inferior, mediana, superior = percentiles_replicas(usadas, cuantiles)
+        resultado[nombre] = {'puntual': puntuales[nombre], 'inferior': inferior,
+                             'mediana': mediana, 'superior': superior}
+        if guardar_replicas:
+            resultado[nombre]['replicas'] = replicas
+    return resultado
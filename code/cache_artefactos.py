@@ -0,0 +1,407 @@
+# Caché direccionada por contenido para las etapas del pipeline VAR (npz comprimidos con desalojo LRU)
+import functools
+import hashlib
+import json
+import os
+import sys
+import time
+import types
+
+import numpy as np
+import pandas as pd
+
+VERSION_CACHE = 1
+
+
+# === Huella de entradas ===
+def _actualizar_huella(h, obj):
+    """
+    Agrega al hash el contenido de `obj` (arreglos por bytes, tablas por columnas e índice).
+    """
+    if isinstance(obj, pd.DataFrame):
+        h.update(b'df')
+        _actualizar_huella(h, [str(c) for c in obj.columns])
+        _actualizar_huella(h, obj.index)
+        for n in range(obj.shape[1]):
+            _actualizar_huella(h, obj.iloc[:, n].values)
+    elif isinstance(obj, pd.Series):
+        h.update(b'serie')
+        _actualizar_huella(h, [str(obj.name), obj.index, obj.values])
+    elif isinstance(obj, pd.Index):
+        h.update(b'indice')
+        _actualizar_huella(h, np.asarray(obj.values))
+    elif isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            _actualizar_huella(h, obj.tolist())
+        else:
+            h.update(f'nd{obj.dtype.str}{obj.shape}'.encode())
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        h.update(f'{type(obj).__name__}{len(obj)}'.encode())
+        for elemento in obj:
+            _actualizar_huella(h, elemento)
+    elif isinstance(obj, dict):
+        h.update(f'dict{len(obj)}'.encode())
+        for clave in sorted(obj, key=str):
+            _actualizar_huella(h, [str(clave), obj[clave]])
+    elif hasattr(obj, 'coefs') and hasattr(obj, 'sigma_u'):
+        # Modelos VAR (VARResults o VARLigero): parámetros, covarianza, nombres y residuos
+        _actualizar_huella(h, ['modelo', list(obj.names), np.asarray(obj.params, dtype=float),
+                               np.asarray(obj.sigma_u, dtype=float), np.asarray(obj.resid, dtype=float)])
+    elif callable(obj):
+        _actualizar_huella_funcion(h, obj)
+    else:
+        h.update(json.dumps(obj, default=str).encode())
+
+
+def _actualizar_huella_codigo(h, codigo):
+    """
+    Bytecode, nombres y constantes (incluidas funciones anidadas) de un objeto code.
+    """
+    h.update(codigo.co_code)
+    h.update(json.dumps([codigo.co_names, codigo.co_varnames, codigo.co_freevars]).encode())
+    for constante in codigo.co_consts:
+        if isinstance(constante, types.CodeType):
+            _actualizar_huella_codigo(h, constante)
+        elif isinstance(constante, frozenset):
+            h.update(repr(sorted(constante, key=repr)).encode())
+        else:
+            h.update(repr(constante).encode())
+
+
+def _actualizar_huella_funcion(h, funcion):
+    """
+    Nombre y, si es código Python, su contenido: editar una función (también las definidas con
+    exec en pipeline.cargar_script) cambia la huella aunque conserve módulo y nombre.
+    """
+    funcion = getattr(funcion, '__wrapped__', funcion)
+    if isinstance(funcion, functools.partial):
+        h.update(b'parcial')
+        _actualizar_huella(h, [funcion.func, funcion.args, funcion.keywords])
+        return
+    h.update(f'fn{getattr(funcion, "__module__", "")}.{getattr(funcion, "__qualname__", repr(funcion))}'.encode())
+    codigo = getattr(funcion, '__code__', None)
+    if codigo is not None:
+        h.update(f'py{sys.version_info[:2]}'.encode())
+        _actualizar_huella_codigo(h, codigo)
+        _actualizar_huella(h, [funcion.__defaults__ or (), funcion.__kwdefaults__ or {}])
+
+
+def huella(*partes):
+    """
+    SHA-256 de una combinación de arreglos, tablas, modelos y parámetros.
+    """
+    h = hashlib.sha256(f'v{VERSION_CACHE}'.encode())
+    _actualizar_huella(h, list(partes))
+    return h.hexdigest()
+
+
+# === Serialización a npz (sin pickle) ===
+def _empaquetar(obj, arreglos):
+    """
+    Convierte `obj` en una descripción JSON y arreglos NumPy guardables con np.savez.
+    Lanza TypeError si contiene tipos no soportados.
+    """
+    def arreglo(valores):
+        valores = np.asarray(valores)
+        objeto = valores.dtype == object
+        if objeto:
+            if not all(isinstance(v, str) for v in valores.ravel()):
+                raise TypeError("Solo se admiten arreglos de objetos con texto.")
+            valores = valores.astype(str)
+        nombre = f'a{len(arreglos)}'
+        arreglos[nombre] = valores
+        return {'t': 'arreglo', 'k': nombre, 'objeto': bool(objeto)}
+
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return {'t': 'valor', 'v': obj}
+    if isinstance(obj, np.generic):
+        return {'t': 'valor', 'v': obj.item()}
+    if isinstance(obj, np.ndarray):
+        return arreglo(obj)
+    if isinstance(obj, pd.RangeIndex):
+        return {'t': 'rango', 'v': [obj.start, obj.stop, obj.step], 'nombre': obj.name}
+    if isinstance(obj, pd.Index):
+        freq = getattr(obj, 'freqstr', None)
+        return {'t': 'indice', 'v': arreglo(obj.values), 'nombre': obj.name, 'freq': freq}
+    if isinstance(obj, pd.DataFrame):
+        return {
+            't': 'df',
+            'columnas': [_empaquetar(c, arreglos) for c in obj.columns],
+            'datos': [arreglo(obj.iloc[:, n].values) for n in range(obj.shape[1])],
+            'indice': _empaquetar(obj.index, arreglos),
+        }
+    if isinstance(obj, pd.Series):
+        return {'t': 'serie', 'v': arreglo(obj.values), 'indice': _empaquetar(obj.index, arreglos),
+                'nombre': _empaquetar(obj.name, arreglos)}
+    if isinstance(obj, (list, tuple)):
+        return {'t': 'lista' if isinstance(obj, list) else 'tupla', 'v': [_empaquetar(e, arreglos) for e in obj]}
+    if isinstance(obj, dict):
+        return {'t': 'dict', 'v': [[_empaquetar(k, arreglos), _empaquetar(v, arreglos)] for k, v in obj.items()]}
+    raise TypeError(f"Tipo no soportado por la caché de artefactos: {type(obj).__name__}")
+
+
+def _desempaquetar(desc, arreglos):
+    t = desc['t']
+    if t == 'valor':
+        return desc['v']
+    if t == 'arreglo':
+        valores = arreglos[desc['k']]
+        return valores.astype(object) if desc['objeto'] else valores
+    if t == 'rango':
+        return pd.RangeIndex(*desc['v'], name=desc['nombre'])
+    if t == 'indice':
+        indice = pd.Index(_desempaquetar(desc['v'], arreglos), name=desc['nombre'])
+        if desc.get('freq') and isinstance(indice, pd.DatetimeIndex):
+            indice = pd.DatetimeIndex(indice, freq=desc['freq'])
+        return indice
+    if t == 'df':
+        columnas = [_desempaquetar(c, arreglos) for c in desc['columnas']]
+        datos = {n: _desempaquetar(d, arreglos) for n, d in enumerate(desc['datos'])}
+        df = pd.DataFrame(datos, index=_desempaquetar(desc['indice'], arreglos))
+        df.columns = columnas
+        return df
+    if t == 'serie':
+        return pd.Series(_desempaquetar(desc['v'], arreglos), index=_desempaquetar(desc['indice'], arreglos),
+                         name=_desempaquetar(desc['nombre'], arreglos))
+    if t == 'lista':
+        return [_desempaquetar(e, arreglos) for e in desc['v']]
+    if t == 'tupla':
+        return tuple(_desempaquetar(e, arreglos) for e in desc['v'])
+    if t == 'dict':
+        return {_desempaquetar(k, arreglos): _desempaquetar(v, arreglos) for k, v in desc['v']}
+    raise ValueError(f"Descripción de artefacto no válida: {t}")
+
+
+class CacheArtefactos:
+    """
+    Almacén de artefactos direccionado por contenido: cada resultado se guarda como un .npz
+    comprimido cuyo nombre es el hash de la etapa, la función, las entradas y los parámetros.
+    Un índice JSON registra tamaño y último acceso; al superar `tamano_maximo` (bytes) se
+    eliminan primero los artefactos usados hace más tiempo (LRU).
+
+    Los accesos de cargar() solo se anotan en memoria; el índice se escribe al guardar o
+    eliminar artefactos y en cerrar() (también al salir de un bloque `with`).
+    """
+
+    def __init__(self, directorio=os.path.join('.cache', 'artefactos'), tamano_maximo=1 << 30, verbose=True):
+        self.directorio = directorio
+        self.tamano_maximo = tamano_maximo
+        self.verbose = verbose
+        os.makedirs(directorio, exist_ok=True)
+        self._ruta_indice = os.path.join(directorio, 'indice.json')
+        self.indice = {}
+        self._indice_modificado = False
+        if os.path.exists(self._ruta_indice):
+            with open(self._ruta_indice, 'r') as f:
+                self.indice = json.load(f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excinfo):
+        self.cerrar()
+
+    def __repr__(self):
+        return (f"CacheArtefactos(directorio='{self.directorio}', artefactos={len(self.indice)}, "
+                f"tamano={self.tamano_total / 2 ** 20:.1f} MB)")
+
+    @property
+    def tamano_total(self):
+        return sum(e['tamano'] for e in self.indice.values())
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, f'{clave}.npz')
+
+    def _guardar_indice(self):
+        ruta_tmp = f'{self._ruta_indice}.tmp'
+        with open(ruta_tmp, 'w') as f:
+            json.dump(self.indice, f, indent=1)
+        os.replace(ruta_tmp, self._ruta_indice)
+        self._indice_modificado = False
+
+    def cerrar(self):
+        """
+        Escribe el índice si hay accesos pendientes de registrar.
+        """
+        if self._indice_modificado:
+            self._guardar_indice()
+
+    def cargar(self, clave):
+        """
+        Devuelve el artefacto guardado con `clave` o None si no existe.
+        """
+        ruta = self._ruta(clave)
+        if clave not in self.indice or not os.path.exists(ruta):
+            if self.indice.pop(clave, None) is not None:
+                self._indice_modificado = True
+            return None
+        with np.load(ruta, allow_pickle=False) as npz:
+            arreglos = {k: npz[k] for k in npz.files}
+        estructura = json.loads(str(arreglos.pop('__estructura__')))
+        self.indice[clave]['acceso'] = time.time()
+        self._indice_modificado = True
+        return _desempaquetar(estructura, arreglos)
+
+    def guardar(self, clave, etapa, artefacto):
+        """
+        Guarda `artefacto` (arreglos, tablas, listas, dicts y escalares) y aplica el desalojo LRU.
+        """
+        arreglos = {}
+        estructura = _empaquetar(artefacto, arreglos)
+        ruta = self._ruta(clave)
+        ruta_tmp = os.path.join(self.directorio, f'{clave}.tmp.npz')
+        np.savez_compressed(ruta_tmp, __estructura__=np.array(json.dumps(estructura)), **arreglos)
+        os.replace(ruta_tmp, ruta)
+        self.indice[clave] = {'etapa': etapa, 'tamano': os.path.getsize(ruta), 'acceso': time.time()}
+        self._desalojar()
+        self._guardar_indice()
+
+    def _desalojar(self):
+        total = self.tamano_total
+        for clave, entrada in sorted(self.indice.items(), key=lambda e: e[1]['acceso']):
+            if total <= self.tamano_maximo:
+                break
+            if os.path.exists(self._ruta(clave)):
+                os.remove(self._ruta(clave))
+            total -= entrada['tamano']
+            del self.indice[clave]
+
+    def limpiar(self, etapa=None):
+        """
+        Elimina todos los artefactos (o solo los de una etapa).
+        """
+        for clave in [c for c, e in self.indice.items() if etapa is None or e['etapa'] == etapa]:
+            if os.path.exists(self._ruta(clave)):
+                os.remove(self._ruta(clave))
+            del self.indice[clave]
+        self._guardar_indice()
+
+    def ejecutar(self, etapa, funcion, *args, **kwargs):
+        """
+        Ejecuta funcion(*args, **kwargs) solo si no hay un artefacto para las mismas entradas.
+
+        La clave incluye la etapa, el nombre de la función y el contenido de todos los argumentos.
+        Si el resultado contiene tipos no serializables, se devuelve sin guardarlo.
+        """
+        clave = huella(etapa, funcion, args, kwargs)
+        resultado = self.cargar(clave)
+        if resultado is not None:
+            if self.verbose:
+                print(f"⚡ Etapa '{etapa}' recuperada de caché ({clave[:12]}).")
+            return resultado
+
+        resultado = funcion(*args, **kwargs)
+        try:
+            self.guardar(clave, etapa, resultado)
+        except TypeError as e:
+            if self.verbose:
+                print(f"⚠️ Etapa '{etapa}' no se guardó en caché: {e}")
+        return resultado
+
+
+# === Etapas del pipeline ===
+def preprocesar_cacheado(cache, preprocesar, series, pipeline=None, **kwargs):
+    """
+    preprocesar_series_para_VAR() con caché. Si se pasa un PipelineTransformacion, su log se
+    incluye en la clave y las columnas/órdenes de diferencia registrados se restauran al recuperar.
+
+    Parámetros:
+        cache (CacheArtefactos): Almacén de artefactos.
+        preprocesar (callable): preprocesar_series_para_VAR (definida en utils.py).
+        series (pd.DataFrame): Series en niveles.
+        pipeline (PipelineTransformacion or None): Pipeline a poblar.
+        **kwargs: Resto de argumentos de preprocesar_series_para_VAR.
+
+    Retorna:
+        Lo mismo que preprocesar_series_para_VAR().
+    """
+    def etapa(series, log_cols, preprocesar, **kwargs):
+        resultado = preprocesar(series, pipeline=pipeline, **kwargs)
+        estado = None if pipeline is None else {'columnas': pipeline.columnas, 'diff_cols': pipeline.diff_cols,
+                                                'ordenes_diff': pipeline.ordenes_diff}
+        return {'resultado': resultado, 'pipeline': estado}
+
+    log_cols = None if pipeline is None else list(pipeline.log_cols)
+    salida = cache.ejecutar('preprocesamiento', etapa, series, log_cols, preprocesar=preprocesar, **kwargs)
+    if pipeline is not None and salida['pipeline'] is not None:
+        pipeline.registrar_columnas(salida['pipeline']['columnas'])
+        pipeline.registrar_diferencias(salida['pipeline']['diff_cols'], ordenes=salida['pipeline']['ordenes_diff'])
+    return salida['resultado']
+
+
+def ajustar_VAR_cacheado(cache, series_var, p, ajustar=None, verbose=True):
+    """
+    Ajusta (o recupera) un VAR(p) guardando solo params y Σ_u; el modelo se reconstruye como
+    VARLigero con la matriz de diseño de `series_var`, de modo que resid, irf, forecast, etc.
+    siguen disponibles.
+
+    Parámetros:
+        cache (CacheArtefactos): Almacén de artefactos.
+        series_var (pd.DataFrame): Serie temporal multivariada (preprocesada).
+        p (int): Número de rezagos.
+        ajustar (callable or None): Función de ajuste con la firma de ajustar_VAR (p. ej. ajustar_VAR).
+                                    Si None, usa VARIncremental (OLS equivalente).
+        verbose (bool): Si True, imprime el resultado del ajuste.
+
+    Retorna:
+        modelo_fitted (VARLigero): Modelo ajustado.
+        es_estable (bool): True si el modelo es estable.
+    """
+    from var_ols import VARIncremental, VARLigero, matriz_diseno_rezagada
+
+    def etapa(series_var, p, ajustar):
+        if ajustar is None:
+            modelo = VARIncremental(series_var, p).ajustar(p)
+        else:
+            modelo = ajustar(series_var, p, verbose=False)[0]
+        return {'params': np.asarray(modelo.params, dtype=float), 'sigma_u': np.asarray(modelo.sigma_u, dtype=float),
+                'nobs': int(modelo.nobs)}
+
+    artefacto = cache.ejecutar('ajuste', etapa, series_var, p, ajustar=ajustar)
+    Y, X = matriz_diseno_rezagada(series_var.values, p)
+    modelo_fitted = VARLigero(artefacto['params'], artefacto['sigma_u'], artefacto['nobs'], series_var.columns,
+                              Y=Y, X=X, index=series_var.index[p:], endog=series_var.values)
+    es_estable = modelo_fitted.is_stable()
+
+    if verbose:
+        print(f"🔧 Modelo VAR(p={p}) ajustado.")
+        print(f"✅ Estabilidad del modelo: {'Sí' if es_estable else 'No'}")
+    return modelo_fitted, es_estable
+
+
+def diagnosticar_cacheado(cache, modelos_dict, **kwargs):
+    """
+    diagnosticar_modelos() con caché; la clave incluye parámetros y residuos de cada modelo.
+    """
+    from diagnosticos import diagnosticar_modelos
+
+    return cache.ejecutar('diagnosticos', diagnosticar_modelos, modelos_dict, **kwargs)
+
+
+def irf_fevd_cacheado(cache, modelo_fitted, steps=40, calcular_girf=True):
+    """
+    IRF, IRF ortogonalizada, FEVD (Cholesky) y, opcionalmente, GIRF/GFEVD hasta `steps`,
+    con la clave en los coeficientes y Σ_u del modelo.
+
+    Retorna:
+        dict: 'irf', 'orth_irf' (steps+1, respuesta, impulso), 'fevd' (steps, caused_by, affected)
+              y, si calcular_girf, 'girf' y 'gfevd' (steps+1, ...).
+    """
+    from fevd import fevd_cholesky_vectorizado
+    from girf import coeficientes_ma, gfevd_pesaran_shin, girf_pesaran_shin
+
+    def etapa(coefs, sigma_u, steps, calcular_girf):
+        psi = coeficientes_ma(coefs, steps)
+        resultado = {
+            'irf': psi,
+            'orth_irf': psi @ np.linalg.cholesky(sigma_u),
+            'fevd': fevd_cholesky_vectorizado(psi, sigma_u, steps=steps),
+        }
+        if calcular_girf:
+            resultado['girf'] = girf_pesaran_shin(psi, sigma_u)
+            resultado['gfevd'] = gfevd_pesaran_shin(psi, sigma_u)
+        return resultado
+
+    return cache.ejecutar('irf_fevd', etapa, np.asarray(modelo_fitted.coefs, dtype=float),
+                          np.asarray(modelo_fitted.sigma_u, dtype=float), steps, calcular_girf)
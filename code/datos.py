@@ -0,0 +1,238 @@
+# Carga de los libros de Excel con caché columnar (.npy + metadatos JSON) invalidada por mtime y hash
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+VERSION_CACHE = 2
+
+
+def _hash_archivo(ruta, bloque=1 << 20):
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for trozo in iter(lambda: f.read(bloque), b''):
+            h.update(trozo)
+    return h.hexdigest()
+
+
+def _carpeta_cache(ruta, cache_dir, kwargs_read_excel):
+    """
+    Carpeta de caché de un libro: depende del nombre del archivo y de los argumentos de lectura.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(ruta)), '.cache')
+    firma = hashlib.sha256(json.dumps(kwargs_read_excel, sort_keys=True, default=str).encode()).hexdigest()[:12]
+    nombre = os.path.splitext(os.path.basename(ruta))[0].replace(' ', '_')
+    return os.path.join(cache_dir, f"{nombre}-{firma}")
+
+
+def _codificar(valor):
+    """
+    Etiqueta o celda como valor JSON que conserva su tipo (int, float, bool, str, None, Timestamp).
+    Lanza TypeError para cualquier otro tipo: esos libros no se guardan en caché.
+    """
+    if isinstance(valor, np.datetime64):
+        valor = pd.Timestamp(valor)
+    elif isinstance(valor, np.generic):
+        valor = valor.item()
+    if valor is None or isinstance(valor, (bool, int, float, str)):
+        return valor
+    if valor is pd.NaT:
+        return {'NaT': None}
+    if isinstance(valor, pd.Timestamp):
+        return {'Timestamp': valor.isoformat()}
+    if isinstance(valor, datetime):
+        return {'datetime': valor.isoformat()}
+    raise TypeError(f"Tipo no soportado por la caché: {type(valor).__name__}")
+
+
+def _decodificar(valor):
+    if not isinstance(valor, dict):
+        return valor
+    if 'NaT' in valor:
+        return pd.NaT
+    if 'Timestamp' in valor:
+        return pd.Timestamp(valor['Timestamp'])
+    return datetime.fromisoformat(valor['datetime'])
+
+
+def _guardar_arreglo(carpeta, nombre, valores):
+    """
+    Guarda un arreglo tipado como .npy; devuelve None si el tipo no es memory-mappable (object).
+    """
+    valores = np.asarray(valores)
+    if valores.dtype == object:
+        return None
+    archivo = f"{nombre}.npy"
+    np.save(os.path.join(carpeta, archivo), np.ascontiguousarray(valores))
+    return archivo
+
+
+def _cargar_arreglo(carpeta, archivo, modo):
+    # Vista ndarray del memmap (sin copia) para que pandas no propague la subclase
+    return np.load(os.path.join(carpeta, archivo), mmap_mode=modo).view(np.ndarray)
+
+
+def _bloques_por_dtype(df):
+    """
+    Posiciones de las columnas de cada dtype: cada grupo será un único bloque de pandas.
+    """
+    grupos = {}
+    for n, dtype in enumerate(df.dtypes):
+        if not isinstance(dtype, np.dtype):
+            raise TypeError(f"dtype de extensión no soportado por la caché: {dtype}")
+        grupos.setdefault(dtype, []).append(n)
+    return list(grupos.items())
+
+
+def _marco_desde_bloques(bloques, columnas, indice):
+    """
+    DataFrame cuyas columnas son vistas de las filas de los arreglos (columnas × filas) dados,
+    sin copiarlos: con copy=False, pd.DataFrame no consolida un dict de arreglos en bloques.
+    """
+    arreglos = {i: valores[n] for valores, posiciones in bloques for n, i in enumerate(posiciones)}
+    df = pd.DataFrame({i: arreglos[i] for i in range(len(columnas))}, index=indice, copy=False)
+    df.columns = columnas
+    return df
+
+
+def _escribir_cache(df, carpeta, firma_archivo):
+    """
+    Escribe las columnas de cada dtype como un solo .npy 2-D (columnas × filas: cada columna es
+    una fila contigua) y un sidecar meta.json con nombres, posiciones y firma del libro.
+    Las columnas de texto (object) se guardan en el JSON con el tipo de cada celda.
+
+    Lanza TypeError (sin dejar caché) si hay etiquetas, celdas o dtypes que no pueden restaurarse
+    con su tipo original.
+    """
+    grupos = _bloques_por_dtype(df)
+    columnas = [_codificar(c) for c in df.columns]
+    bloques = []
+    for dtype, posiciones in grupos:
+        bloque = {'dtype': str(dtype), 'posiciones': posiciones, 'archivo': None}
+        if dtype == object:
+            bloque['valores'] = [[_codificar(v) for v in df.iloc[:, i]] for i in posiciones]
+        bloques.append(bloque)
+
+    if isinstance(df.index, pd.RangeIndex):
+        indice = {'rango': [df.index.start, df.index.stop, df.index.step]}
+    elif isinstance(df.index, pd.MultiIndex):
+        raise TypeError("MultiIndex no soportado por la caché")
+    else:
+        indice = {'archivo': None}
+        if df.index.dtype == object:
+            indice['valores'] = [_codificar(v) for v in df.index]
+    indice['nombre'] = _codificar(df.index.name)
+
+    if os.path.exists(carpeta):
+        shutil.rmtree(carpeta)
+    os.makedirs(carpeta)
+    for n, ((dtype, posiciones), bloque) in enumerate(zip(grupos, bloques)):
+        if dtype != object:
+            valores = np.stack([df.iloc[:, i].values for i in posiciones])
+            bloque['archivo'] = _guardar_arreglo(carpeta, f"bloque_{n:04d}", valores)
+    if 'archivo' in indice and 'valores' not in indice:
+        indice['archivo'] = _guardar_arreglo(carpeta, '__index__', df.index.values)
+
+    meta = {'version': VERSION_CACHE, **firma_archivo, 'columnas': columnas, 'bloques': bloques,
+            'indice': indice, 'filas': len(df)}
+    ruta_tmp = os.path.join(carpeta, 'meta.json.tmp')
+    with open(ruta_tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(ruta_tmp, os.path.join(carpeta, 'meta.json'))
+
+
+def _leer_cache(carpeta, meta, mmap):
+    """
+    Reconstruye el DataFrame: cada .npy 2-D se abre con mmap_mode='c' (copia al escribir) y sus
+    filas se usan directamente como columnas del DataFrame.
+    """
+    modo = 'c' if mmap else None
+    info = meta['indice']
+    if 'rango' in info:
+        indice = pd.RangeIndex(*info['rango'], name=_decodificar(info['nombre']))
+    elif info['archivo']:
+        indice = pd.Index(_cargar_arreglo(carpeta, info['archivo'], modo), name=_decodificar(info['nombre']))
+    else:
+        indice = pd.Index([_decodificar(v) for v in info['valores']], dtype=object,
+                          name=_decodificar(info['nombre']))
+
+    bloques = []
+    for bloque in meta['bloques']:
+        if bloque['archivo']:
+            valores = _cargar_arreglo(carpeta, bloque['archivo'], modo)
+        else:
+            valores = np.empty((len(bloque['posiciones']), meta['filas']), dtype=object)
+            for n, celdas in enumerate(bloque['valores']):
+                valores[n, :] = [_decodificar(v) for v in celdas]
+        bloques.append((valores, bloque['posiciones']))
+
+    columnas = pd.Index([_decodificar(c) for c in meta['columnas']], tupleize_cols=False)
+    return _marco_desde_bloques(bloques, columnas, indice)
+
+
+def cargar_excel_cacheado(ruta, cache_dir=None, mmap=True, verbose=True, **kwargs_read_excel):
+    """
+    Lee un libro de Excel con pd.read_excel la primera vez y guarda una caché columnar tipada
+    (un .npy 2-D por dtype + meta.json). Las lecturas siguientes abren los .npy con memory-map
+    y las columnas del DataFrame son vistas de ellos, sin copiar los datos.
+
+    Las etiquetas y las celdas de texto conservan su tipo (int, float, bool, str, Timestamp); si
+    el libro tiene otros tipos (o dtypes de extensión o MultiIndex) se devuelve sin crear caché.
+
+    La caché se invalida automáticamente cuando cambia el libro: primero se comparan tamaño y
+    mtime; si solo cambió el mtime (p. ej. el archivo se copió), se compara el SHA-256 del
+    contenido y, si coincide, se reutiliza la caché actualizando la firma.
+
+    Parámetros:
+        ruta (str): Ruta al .xlsx (ej. 'data/Raw multi energetic-economic dataset.xlsx').
+        cache_dir (str or None): Carpeta de caché. Si None, usa '.cache' junto al libro.
+        mmap (bool): Si True, los .npy se abren con mmap_mode='c' (copia al escribir: modificar
+                     el DataFrame no altera la caché). Si False, se leen completos en memoria.
+        verbose (bool): Si True, informa si se usó o reconstruyó la caché.
+        **kwargs_read_excel: Argumentos para pd.read_excel (forman parte de la clave de caché).
+
+    Retorna:
+        pd.DataFrame: Mismo contenido que pd.read_excel(ruta, **kwargs_read_excel).
+    """
+    carpeta = _carpeta_cache(ruta, cache_dir, kwargs_read_excel)
+    ruta_meta = os.path.join(carpeta, 'meta.json')
+    stat = os.stat(ruta)
+    firma = {'mtime_ns': stat.st_mtime_ns, 'tamano': stat.st_size}
+
+    meta = None
+    if os.path.exists(ruta_meta):
+        with open(ruta_meta, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != VERSION_CACHE or meta.get('tamano') != firma['tamano']:
+            meta = None
+        elif meta.get('mtime_ns') != firma['mtime_ns']:
+            if meta.get('sha256') == _hash_archivo(ruta):
+                meta['mtime_ns'] = firma['mtime_ns']
+                ruta_tmp = f"{ruta_meta}.tmp"
+                with open(ruta_tmp, 'w', encoding='utf-8') as f:
+                    json.dump(meta, f, ensure_ascii=False, default=str)
+                os.replace(ruta_tmp, ruta_meta)
+            else:
+                meta = None
+
+    if meta is not None:
+        if verbose:
+            print(f"⚡ Caché utilizada: {os.path.basename(ruta)}")
+        return _leer_cache(carpeta, meta, mmap)
+
+    df = pd.read_excel(ruta, **kwargs_read_excel)
+    firma['sha256'] = _hash_archivo(ruta)
+    try:
+        _escribir_cache(df, carpeta, firma)
+    except TypeError as e:
+        if verbose:
+            print(f"⚠️ {os.path.basename(ruta)} no se guardó en caché: {e}")
+        return df
+    if verbose:
+        print(f"✅ Caché creada en: {carpeta}")
+    return df
@@ -0,0 +1,173 @@
+# Diagnóstico vectorizado de residuos VAR: autocovarianzas por FFT, Ljung-Box, Portmanteau y Jarque-Bera
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2
+
+
+def autocovarianzas_cruzadas(residuos, max_lag):
+    """
+    Calcula las autocovarianzas cruzadas C_0..C_max_lag de la matriz de residuos con FFT.
+
+    C_h[i, j] = (1/T) Σ_t e_{t,i} e_{t-h,j} con residuos centrados (misma convención que
+    statsmodels). El espectro de cada columna se calcula una sola vez; los productos cruzados
+    se invierten por columna de impulso para acotar la memoria a O(T·nvars).
+
+    Parámetros:
+        residuos (np.ndarray or pd.DataFrame): Forma (T, nvars).
+        max_lag (int): Rezago máximo.
+
+    Retorna:
+        np.ndarray: Forma (max_lag+1, nvars, nvars).
+    """
+    e = np.asarray(residuos, dtype=float)
+    e = e - e.mean(axis=0)
+    T, num_vars = e.shape
+    n_fft = 1 << int(np.ceil(np.log2(2 * T - 1)))
+
+    espectro = np.fft.rfft(e, n=n_fft, axis=0)
+    gamma = np.empty((max_lag + 1, num_vars, num_vars))
+    for j in range(num_vars):
+        cruzado = np.fft.irfft(espectro * np.conj(espectro[:, j:j + 1]), n=n_fft, axis=0)
+        gamma[:, :, j] = cruzado[:max_lag + 1]
+    return gamma / T
+
+
+def autocorrelaciones(gamma):
+    """
+    ACF de cada columna a partir de las autocovarianzas cruzadas, forma (max_lag+1, nvars).
+    """
+    diagonal = np.diagonal(gamma, axis1=-2, axis2=-1)
+    return diagonal / diagonal[0]
+
+
+def ljung_box(gamma, nobs, lags):
+    """
+    Ljung-Box para todas las columnas y todos los rezagos pedidos a partir de una sola ACF.
+
+    Retorna:
+        estadistico (np.ndarray), p_valor (np.ndarray): Forma (len(lags), nvars).
+    """
+    lags = np.atleast_1d(lags)
+    acf = autocorrelaciones(gamma)[1:]
+    h = np.arange(1, acf.shape[0] + 1)[:, None]
+    acumulado = nobs * (nobs + 2) * np.cumsum(acf ** 2 / (nobs - h), axis=0)
+    estadistico = acumulado[lags - 1]
+    return estadistico, chi2.sf(estadistico, lags[:, None])
+
+
+def portmanteau_multivariado(gamma, nobs, k_ar, ajustado=False):
+    """
+    Prueba Portmanteau multivariada (Hosking) de blancura conjunta de los residuos.
+
+    Q_h = T Σ_{l=1}^{h} tr(C_l' C_0⁻¹ C_l C_0⁻¹) (o T² Σ (T-l)⁻¹ ... si ajustado), con
+    nvars²·(h - k_ar) grados de libertad, como VARResults.test_whiteness().
+
+    Parámetros:
+        gamma (np.ndarray): Salida de autocovarianzas_cruzadas() con max_lag = h.
+        nobs (int): Número de observaciones de los residuos.
+        k_ar (int): Orden del VAR.
+        ajustado (bool): Versión con corrección de muestra pequeña.
+
+    Retorna:
+        dict: {'estadistico', 'gl', 'p_valor'}.
+    """
+    h = gamma.shape[0] - 1
+    num_vars = gamma.shape[-1]
+    if h <= k_ar:
+        raise ValueError("El rezago de la prueba Portmanteau debe ser mayor que el orden del VAR.")
+
+    C0_inv = np.linalg.inv(gamma[0])
+    terminos = np.einsum('lji,jk,lkm,mi->l', gamma[1:], C0_inv, gamma[1:], C0_inv)
+    if ajustado:
+        estadistico = nobs ** 2 * np.sum(terminos / (nobs - np.arange(1, h + 1)))
+    else:
+        estadistico = nobs * terminos.sum()
+    gl = num_vars ** 2 * (h - k_ar)
+    return {'estadistico': float(estadistico), 'gl': gl, 'p_valor': float(chi2.sf(estadistico, gl))}
+
+
+def jarque_bera(residuos):
+    """
+    Jarque-Bera por columna con momentos muestrales (sesgados), vectorizado.
+
+    Retorna:
+        dict: Arreglos 'JB', 'p-valor', 'asimetria' y 'curtosis' de forma (nvars,).
+    """
+    e = np.asarray(residuos, dtype=float)
+    e = e - e.mean(axis=0)
+    m2 = np.mean(e ** 2, axis=0)
+    asimetria = np.mean(e ** 3, axis=0) / m2 ** 1.5
+    curtosis = np.mean(e ** 4, axis=0) / m2 ** 2
+    estadistico = e.shape[0] / 6.0 * (asimetria ** 2 + (curtosis - 3) ** 2 / 4.0)
+    return {'JB': estadistico, 'p-valor': chi2.sf(estadistico, 2), 'asimetria': asimetria, 'curtosis': curtosis}
+
+
+def normalidad_multivariada(residuos):
+    """
+    Prueba de normalidad conjunta de Lütkepohl (residuos ortogonalizados con el Cholesky de su
+    covarianza muestral), como VARResults.test_normality().
+    """
+    e = np.asarray(residuos, dtype=float)
+    e = e - e.mean(axis=0)
+    nobs, num_vars = e.shape
+    w = np.linalg.solve(np.linalg.cholesky(e.T @ e / nobs), e.T)
+    b1 = (w ** 3).sum(axis=1) / nobs
+    b2 = (w ** 4).sum(axis=1) / nobs - 3
+    estadistico = nobs * (b1 @ b1) / 6 + nobs * (b2 @ b2) / 24
+    gl = 2 * num_vars
+    return {'estadistico': float(estadistico), 'gl': gl, 'p_valor': float(chi2.sf(estadistico, gl))}
+
+
+def diagnosticar_modelos(modelos_dict, lags_ljung=(10,), lag_portmanteau=10, alpha=0.05, ajustado=False):
+    """
+    Diagnostica los residuos de varios modelos VAR sin generar gráficas.
+
+    Por modelo se calcula una sola vez la matriz de autocovarianzas cruzadas (FFT) y de ella se
+    derivan Ljung-Box en todos los rezagos y columnas y el Portmanteau multivariado; la
+    normalidad se evalúa con Jarque-Bera por variable y con la prueba conjunta de Lütkepohl.
+
+    Parámetros:
+        modelos_dict (dict): {p: modelo_fitted}.
+        lags_ljung (iterable of int): Rezagos para Ljung-Box.
+        lag_portmanteau (int): Rezago de la prueba Portmanteau (debe ser > p).
+        alpha (float): Nivel de significancia para las columnas de decisión.
+        ajustado (bool): Portmanteau con corrección de muestra pequeña.
+
+    Retorna:
+        dict de pd.DataFrame: 'ljung_box' (p, Variable, lag), 'portmanteau' (p),
+                              'jarque_bera' (p, Variable) y 'normalidad' (p).
+    """
+    lags_ljung = np.atleast_1d(lags_ljung).astype(int)
+    max_lag = max(int(lags_ljung.max()), lag_portmanteau)
+    filas_lb, filas_pm, filas_jb, filas_norm = [], [], [], []
+
+    for p, modelo in modelos_dict.items():
+        residuos = np.asarray(modelo.resid, dtype=float)
+        nombres = list(modelo.names)
+        nobs = residuos.shape[0]
+        gamma = autocovarianzas_cruzadas(residuos, max_lag)
+
+        estadistico, p_valor = ljung_box(gamma, nobs, lags_ljung)
+        for n, lag in enumerate(lags_ljung):
+            for j, col in enumerate(nombres):
+                filas_lb.append({'p': p, 'Variable': col, 'lag': int(lag), 'Q': estadistico[n, j],
+                                 'p-valor': p_valor[n, j], 'Autocorrelación': 'No' if p_valor[n, j] > alpha else 'Sí'})
+
+        if lag_portmanteau > modelo.k_ar:
+            pm = portmanteau_multivariado(gamma[:lag_portmanteau + 1], nobs, modelo.k_ar, ajustado=ajustado)
+            filas_pm.append({'p': p, 'lag': lag_portmanteau, **pm, 'Blancura': 'Sí' if pm['p_valor'] > alpha else 'No'})
+
+        jb = jarque_bera(residuos)
+        for j, col in enumerate(nombres):
+            filas_jb.append({'p': p, 'Variable': col, **{c: v[j] for c, v in jb.items()},
+                             'Normalidad': 'Sí' if jb['p-valor'][j] > alpha else 'No'})
+
+        norm = normalidad_multivariada(residuos)
+        filas_norm.append({'p': p, **norm, 'Normalidad': 'Sí' if norm['p_valor'] > alpha else 'No'})
+
+    return {
+        'ljung_box': pd.DataFrame(filas_lb),
+        'portmanteau': pd.DataFrame(filas_pm),
+        'jarque_bera': pd.DataFrame(filas_jb),
+        'normalidad': pd.DataFrame(filas_norm),
+    }
@@ -0,0 +1,131 @@
+# Pronósticos condicionales: trayectorias fijadas para algunas variables, resueltas en lote por patrón de restricciones
+import numpy as np
+import pandas as pd
+
+from girf import coeficientes_ma
+
+
+def matriz_respuesta_apilada(psi, P, steps):
+    """
+    Matriz G (steps·nvars × steps·nvars) que lleva los choques estructurales apilados
+    ε = (ε_1, ..., ε_H) a las desviaciones del pronóstico: z_h - f_h = Σ_{s<h} Ψ_s P ε_{h-s}.
+
+    Parámetros:
+        psi (np.ndarray): Coeficientes MA, forma (>= steps, nvars, nvars) (p. ej. irf.irfs).
+        P (np.ndarray): Factor de impacto de los choques (Cholesky de Σ_u).
+        steps (int): Horizonte.
+    """
+    num_vars = P.shape[0]
+    theta = np.asarray(psi, dtype=float)[:steps] @ P  # (steps, nvars, nvars)
+    G = np.zeros((steps, num_vars, steps, num_vars))
+    h, j = np.tril_indices(steps)
+    G[h, :, j, :] = theta[h - j]
+    return G.reshape(steps * num_vars, steps * num_vars)
+
+
+def _escenarios_a_arreglo(escenarios, nombres, steps):
+    """
+    Convierte {nombre: DataFrame} (columnas = variables fijadas, NaN = libre) en (S, steps, nvars).
+    """
+    arreglo = np.full((len(escenarios), steps, len(nombres)), np.nan)
+    for s, df in enumerate(escenarios.values()):
+        valores = df.reindex(columns=nombres).values[:steps]
+        arreglo[s, :len(valores)] = valores
+    return arreglo
+
+
+def pronostico_condicional(modelo_fitted, historia, escenarios, steps=None, psi=None, pipeline=None,
+                           ultimo_nivel=None, devolver_choques=False):
+    """
+    Pronósticos condicionales a trayectorias fijadas de algunas variables (p. ej. producción de
+    crudo o capacidad renovable), para muchos escenarios a la vez.
+
+    Cada restricción es lineal en los choques estructurales futuros ε (choques de Cholesky):
+    A (f + G ε) = r. Se usa la solución de norma mínima ε* = (AG)⁺ (r - A f), que coincide con
+    la media condicional gaussiana (suavizado de Kalman) de las variables libres. Los escenarios
+    con el mismo patrón de entradas fijadas comparten A y la pseudoinversa (AG)⁺, que se calcula
+    una sola vez y se aplica a todos los lados derechos apilados como columnas.
+
+    Con `pipeline`, las trayectorias fijadas se expresan en niveles: el log y la estandarización
+    se aplican a los objetivos y, en columnas diferenciadas, la restricción pasa a ser sobre la
+    suma acumulada de diferencias (sigue siendo lineal). Solo se admiten diferencias de orden 1.
+
+    Parámetros:
+        modelo_fitted (VARResults o VARLigero): Modelo VAR ajustado.
+        historia (pd.DataFrame or np.ndarray): Observaciones transformadas hasta el origen.
+        escenarios (np.ndarray or dict): Arreglo (S, steps, nvars) con NaN en las entradas libres,
+                                         o {nombre: DataFrame} con las variables fijadas como columnas.
+        steps (int or None): Horizonte. Si None, se toma de los escenarios.
+        psi (np.ndarray or None): Coeficientes MA ya calculados (p. ej. `irf.irfs`). Si None, se calculan.
+        pipeline (PipelineTransformacion or None): Si se indica, escenarios y resultados están en niveles.
+        ultimo_nivel (np.ndarray or None): Último nivel observado (requerido con pipeline).
+        devolver_choques (bool): Si True, devuelve también los choques estructurales ε*.
+
+    Retorna:
+        pronosticos: (S, steps, nvars) o {nombre: DataFrame} según el tipo de `escenarios`.
+        choques (opcional): Misma forma, choques estructurales que implementan cada escenario.
+    """
+    nombres = list(modelo_fitted.names)
+    num_vars = len(nombres)
+    como_dict = isinstance(escenarios, dict)
+    if como_dict:
+        if steps is None:
+            steps = max(len(df) for df in escenarios.values())
+        objetivos = _escenarios_a_arreglo(escenarios, nombres, steps)
+    else:
+        objetivos = np.asarray(escenarios, dtype=float)
+        if objetivos.ndim == 2:
+            objetivos = objetivos[None]
+        steps = objetivos.shape[1] if steps is None else steps
+        objetivos = objetivos[:, :steps]
+
+    coefs = np.asarray(modelo_fitted.coefs, dtype=float)
+    p = coefs.shape[0]
+    sigma_u = np.asarray(modelo_fitted.sigma_u, dtype=float)
+    if psi is None or len(psi) < steps:
+        psi = coeficientes_ma(coefs, steps - 1)
+    P = np.linalg.cholesky(sigma_u)
+    G = matriz_respuesta_apilada(psi, P, steps)
+    f = modelo_fitted.forecast(np.asarray(historia, dtype=float)[-p:], steps).ravel()
+
+    # Transformación de la restricción: z → espacio de la restricción (identidad o suma acumulada)
+    L = np.eye(steps * num_vars)
+    rhs = objetivos.copy()
+    if pipeline is not None:
+        if ultimo_nivel is None:
+            raise ValueError("Se requiere `ultimo_nivel` para fijar trayectorias en niveles.")
+        rhs = pipeline.niveles_a_restricciones(objetivos, ultimo_nivel)
+        diff = pipeline.mascara_diff
+        L = (np.kron(np.tril(np.ones((steps, steps))), np.diag(diff.astype(float)))
+             + np.kron(np.eye(steps), np.diag((~diff).astype(float))))
+    LG, Lf = L @ G, L @ f
+
+    S = len(objetivos)
+    z = np.empty((S, steps * num_vars))
+    choques = np.empty((S, steps * num_vars))
+    mascaras = ~np.isnan(objetivos.reshape(S, -1))
+    patrones, grupo = np.unique(mascaras, axis=0, return_inverse=True)
+    grupo = np.ravel(grupo)
+    rhs = rhs.reshape(S, -1)
+
+    for g, patron in enumerate(patrones):
+        miembros = np.flatnonzero(grupo == g)
+        fijas = np.flatnonzero(patron)
+        if len(fijas) == 0:
+            eps = np.zeros((len(miembros), steps * num_vars))
+        else:
+            M_pinv = np.linalg.pinv(LG[fijas])                      # una pseudoinversa por patrón
+            eps = (M_pinv @ (rhs[np.ix_(miembros, fijas)] - Lf[fijas]).T).T
+        choques[miembros] = eps
+        z[miembros] = f + eps @ G.T
+
+    z = z.reshape(S, steps, num_vars)
+    choques = choques.reshape(S, steps, num_vars)
+    if pipeline is not None:
+        z = pipeline.invertir(z, ultimo_nivel)
+
+    if como_dict:
+        indice = pd.RangeIndex(1, steps + 1, name='Step')
+        z = {n: pd.DataFrame(z[s], index=indice, columns=nombres) for s, n in enumerate(escenarios)}
+        choques = {n: pd.DataFrame(choques[s], index=indice, columns=nombres) for s, n in enumerate(escenarios)}
+    return (z, choques) if devolver_choques else z
@@ -0,0 +1,178 @@
+# Pruebas de estacionariedad (ADF/KPSS) en paralelo, con caché por contenido y diferenciación iterada
+import hashlib
+import json
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.stattools import adfuller, kpss
+
+PRUEBAS = ('adf', 'kpss')
+
+# Caché en memoria {clave: resultado}; se complementa con archivos JSON si se indica cache_dir
+_CACHE_MEMORIA = {}
+
+
+def _clave_cache(valores, prueba, parametros):
+    """
+    Clave SHA-256 del contenido de la serie (float64) y de los parámetros de la prueba.
+    """
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(valores, dtype=np.float64).tobytes())
+    h.update(json.dumps({'prueba': prueba, **parametros}, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def _ejecutar_prueba(valores, prueba, parametros):
+    """
+    Ejecuta una prueba sobre un vector sin NaN y devuelve {'estadistico', 'p_valor'}.
+    """
+    if prueba == 'adf':
+        resultado = adfuller(valores, autolag=parametros['autolag'], regression=parametros['regresion_adf'])
+    elif prueba == 'kpss':
+        # KPSS interpola su p-valor en tablas acotadas y avisa en los extremos; el aviso no aporta aquí
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            resultado = kpss(valores, regression=parametros['regresion_kpss'], nlags='auto')
+    else:
+        raise ValueError(f"Prueba '{prueba}' no válida. Usa una de: {PRUEBAS}")
+    return {'estadistico': float(resultado[0]), 'p_valor': float(resultado[1])}
+
+
+def _leer_cache(clave, cache_dir):
+    if clave in _CACHE_MEMORIA:
+        return _CACHE_MEMORIA[clave]
+    if cache_dir:
+        ruta = os.path.join(cache_dir, f"{clave}.json")
+        if os.path.exists(ruta):
+            with open(ruta, 'r') as f:
+                _CACHE_MEMORIA[clave] = json.load(f)
+            return _CACHE_MEMORIA[clave]
+    return None
+
+
+def _escribir_cache(clave, resultado, cache_dir):
+    _CACHE_MEMORIA[clave] = resultado
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        ruta_tmp = os.path.join(cache_dir, f"{clave}.json.tmp")
+        with open(ruta_tmp, 'w') as f:
+            json.dump(resultado, f)
+        os.replace(ruta_tmp, os.path.join(cache_dir, f"{clave}.json"))
+
+
+def pruebas_estacionariedad(series, pruebas=('adf',), alpha=0.05, n_jobs=None, cache_dir=None,
+                            autolag='AIC', regresion_adf='c', regresion_kpss='c'):
+    """
+    Ejecuta ADF y/o KPSS sobre todas las columnas en paralelo, reutilizando resultados en caché.
+
+    Cada resultado se guarda con una clave SHA-256 del contenido de la serie y de los parámetros
+    de la prueba, de modo que repetir el notebook o el pipeline sobre los mismos datos no vuelve
+    a ejecutar las regresiones de ADF con autolag.
+
+    Criterio de estacionariedad:
+        - ADF: se rechaza la raíz unitaria (p-valor < alpha).
+        - KPSS: no se rechaza la estacionariedad (p-valor >= alpha).
+        - Ambas: deben cumplirse las dos condiciones.
+
+    Parámetros:
+        series (pd.DataFrame): Series a evaluar (los NaN se eliminan por columna).
+        pruebas (tuple): Subconjunto de ('adf', 'kpss').
+        alpha (float): Nivel de significancia.
+        n_jobs (int or None): Procesos para las pruebas no cacheadas. Si None usa os.cpu_count(); si 1, en serie.
+        cache_dir (str or None): Carpeta para persistir la caché en disco. Si None, solo en memoria.
+        autolag (str): Criterio de autolag para ADF.
+        regresion_adf (str): Términos deterministas de ADF ('c', 'ct', 'ctt', 'n').
+        regresion_kpss (str): Términos deterministas de KPSS ('c', 'ct').
+
+    Retorna:
+        pd.DataFrame: Por columna, estadístico y p-valor de cada prueba y la columna booleana 'estacionaria'.
+    """
+    pruebas = tuple(pruebas)
+    for prueba in pruebas:
+        if prueba not in PRUEBAS:
+            raise ValueError(f"Prueba '{prueba}' no válida. Usa una de: {PRUEBAS}")
+    parametros = {'autolag': autolag, 'regresion_adf': regresion_adf, 'regresion_kpss': regresion_kpss}
+
+    resultados = {}
+    pendientes = []
+    for col in series.columns:
+        valores = series[col].dropna().values.astype(float)
+        for prueba in pruebas:
+            clave = _clave_cache(valores, prueba, parametros)
+            en_cache = _leer_cache(clave, cache_dir)
+            if en_cache is not None:
+                resultados[(col, prueba)] = en_cache
+            else:
+                pendientes.append((col, prueba, clave, valores))
+
+    if pendientes:
+        if n_jobs is None:
+            n_jobs = os.cpu_count() or 1
+        n_jobs = max(1, min(n_jobs, len(pendientes)))
+        if n_jobs == 1:
+            calculados = [_ejecutar_prueba(valores, prueba, parametros) for _, prueba, _, valores in pendientes]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                futuros = [pool.submit(_ejecutar_prueba, valores, prueba, parametros)
+                           for _, prueba, _, valores in pendientes]
+                calculados = [f.result() for f in futuros]
+        for (col, prueba, clave, _), resultado in zip(pendientes, calculados):
+            _escribir_cache(clave, resultado, cache_dir)
+            resultados[(col, prueba)] = resultado
+
+    filas = {}
+    for col in series.columns:
+        fila = {}
+        estacionaria = True
+        for prueba in pruebas:
+            r = resultados[(col, prueba)]
+            fila[f'{prueba}_estadistico'] = r['estadistico']
+            fila[f'{prueba}_p_valor'] = r['p_valor']
+            if prueba == 'adf':
+                estacionaria &= r['p_valor'] < alpha
+            else:
+                estacionaria &= r['p_valor'] >= alpha
+        fila['estacionaria'] = bool(estacionaria)
+        filas[col] = fila
+
+    return pd.DataFrame.from_dict(filas, orient='index')
+
+
+def diferenciar_hasta_estacionariedad(series, max_orden=1, pruebas=('adf',), alpha=0.05, n_jobs=None,
+                                      cache_dir=None, **kwargs_prueba):
+    """
+    Diferencia iterativamente cada columna no estacionaria hasta que pase las pruebas o se
+    alcance `max_orden`. En cada ronda solo se vuelven a probar las columnas aún no estacionarias;
+    la diferencia de orden `max_orden` ya no se vuelve a probar (con max_orden=1 equivale al
+    comportamiento original de preprocesar_series_para_VAR).
+
+    Parámetros:
+        series (pd.DataFrame): Series en niveles (o log-niveles).
+        max_orden (int): Orden máximo de diferenciación por columna.
+        pruebas, alpha, n_jobs, cache_dir, **kwargs_prueba: Ver pruebas_estacionariedad().
+
+    Retorna:
+        series_var (pd.DataFrame): Series diferenciadas (filas con NaN eliminadas).
+        ordenes (dict): {columna: orden de diferenciación aplicado}.
+        resultados (list of pd.DataFrame): Resultado de cada ronda de pruebas (ronda 0 = series originales).
+    """
+    series_var = series.copy()
+    ordenes = {col: 0 for col in series_var.columns}
+    resultados = []
+
+    pendientes = list(series_var.columns)
+    for _ in range(max_orden):
+        ronda = pruebas_estacionariedad(series_var[pendientes], pruebas=pruebas, alpha=alpha, n_jobs=n_jobs,
+                                        cache_dir=cache_dir, **kwargs_prueba)
+        resultados.append(ronda)
+        pendientes = list(ronda.index[~ronda['estacionaria']])
+        if not pendientes:
+            break
+        for col in pendientes:
+            series_var[col] = series_var[col].diff()
+            ordenes[col] += 1
+
+    return series_var.dropna(), ordenes, resultados
@@ -0,0 +1,61 @@
+# Motor vectorizado de la Descomposición de la Varianza del Error de Pronóstico (FEVD)
+import numpy as np
+import pandas as pd
+
+
+def fevd_cholesky_vectorizado(psi, sigma_u, steps=None):
+    """
+    Calcula la FEVD ortogonalizada (Cholesky) para todos los horizontes en una sola pasada.
+
+    Sustituye los ciclos anidados sobre horizonte, paso y variables por un único producto
+    `einsum` (Θ_s = Ψ_s P) seguido de una suma acumulada sobre s. Acepta dimensiones
+    adicionales al inicio (por ejemplo, réplicas bootstrap) en `psi` y `sigma_u`.
+
+    Parámetros:
+        psi (np.ndarray): Coeficientes MA, forma (..., steps+1, nvars, nvars), p. ej. `irf.irfs`.
+        sigma_u (np.ndarray): Matriz de covarianza de residuos, forma (..., nvars, nvars).
+        steps (int or None): Número de horizontes a devolver. Si None, usa psi.shape[-3].
+
+    Retorna:
+        fevd (np.ndarray): Forma (..., steps, caused_by, affected_var), igual que la
+                           salida interna de calcular_FEVD_cholesky().
+    """
+    psi = np.asarray(psi, dtype=float)
+    if steps is None:
+        steps = psi.shape[-3]
+    num_vars = psi.shape[-1]
+
+    P = np.linalg.cholesky(np.asarray(sigma_u, dtype=float))
+    theta = np.einsum('...sik,...kj->...sij', psi[..., :steps, :, :], P)
+    acumulado = np.cumsum(theta ** 2, axis=-3)          # (..., steps, affected, caused_by)
+    suma_total = acumulado.sum(axis=-1, keepdims=True)  # (..., steps, affected, 1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fevd = np.where(suma_total == 0, 1.0 / num_vars, acumulado / suma_total)
+
+    # En h = 0 se conserva la convención de calcular_FEVD_cholesky (identidad)
+    if steps > 0:
+        fevd[..., 0, :, :] = np.eye(num_vars)
+
+    return np.swapaxes(fevd, -1, -2)
+
+
+def fevd_a_dataframe(fevd, nombres):
+    """
+    Convierte un arreglo FEVD (steps, caused_by, affected_var) al formato de columnas
+    'afectada_caused_by_causa' usado por graficar_FEVD_desde_df().
+
+    Parámetros:
+        fevd (np.ndarray): Salida de fevd_cholesky_vectorizado() sin dimensiones extra.
+        nombres (list): Nombres de las variables en el orden del modelo.
+
+    Retorna:
+        pd.DataFrame: Contribuciones por paso con índice 'Step'.
+    """
+    num_vars = len(nombres)
+    columnas = [f"{afectada}_caused_by_{causa}" for afectada in nombres for causa in nombres]
+    valores = np.swapaxes(fevd, -1, -2).reshape(fevd.shape[0], num_vars * num_vars)
+
+    fevd_df = pd.DataFrame(valores, columns=columnas)
+    fevd_df.index.name = "Step"
+    return fevd_df
@@ -0,0 +1,109 @@
+# IRF generalizadas (Pesaran y Shin, 1998) y GFEVD calculadas directamente de los coeficientes VAR
+import numpy as np
+
+
+def matriz_companion(coefs):
+    """
+    Construye la matriz companion de un VAR(p).
+
+    Parámetros:
+        coefs (np.ndarray): Coeficientes A_1..A_p, forma (..., p, nvars, nvars) (como `modelo.coefs`).
+
+    Retorna:
+        np.ndarray: Matriz companion, forma (..., nvars*p, nvars*p).
+    """
+    coefs = np.asarray(coefs, dtype=float)
+    p, num_vars = coefs.shape[-3], coefs.shape[-1]
+    lote = coefs.shape[:-3]
+
+    companion = np.zeros(lote + (num_vars * p, num_vars * p))
+    companion[..., :num_vars, :] = np.concatenate([coefs[..., i, :, :] for i in range(p)], axis=-1)
+    if p > 1:
+        companion[..., num_vars:, :-num_vars] = np.eye(num_vars * (p - 1))
+    return companion
+
+
+def coeficientes_ma(coefs, steps):
+    """
+    Calcula las matrices MA(∞) Ψ_0..Ψ_steps una sola vez a partir de la matriz companion.
+
+    Ψ_h es el bloque superior izquierdo de A^h; solo se propagan las primeras `nvars`
+    filas de la potencia, de modo que cada paso cuesta un producto (nvars × nvars·p)·(nvars·p × nvars·p).
+
+    Parámetros:
+        coefs (np.ndarray): Coeficientes A_1..A_p, forma (..., p, nvars, nvars).
+        steps (int): Horizonte máximo.
+
+    Retorna:
+        psi (np.ndarray): Forma (..., steps+1, nvars, nvars), equivalente a `modelo.ma_rep(steps)`.
+    """
+    companion = matriz_companion(coefs)
+    num_vars = np.shape(coefs)[-1]
+
+    filas = np.broadcast_to(np.eye(num_vars, companion.shape[-1]), companion.shape[:-2] + (num_vars, companion.shape[-1]))
+    psi = np.empty(companion.shape[:-2] + (steps + 1, num_vars, num_vars))
+    for h in range(steps + 1):
+        psi[..., h, :, :] = filas[..., :num_vars]
+        filas = filas @ companion
+    return psi
+
+
+def girf_pesaran_shin(psi, sigma_u):
+    """
+    Aplica los choques generalizados escalados por Σ_u a todos los impulsos a la vez.
+
+    GIRF_j(h) = Ψ_h Σ_u e_j / sqrt(σ_jj), invariante al orden de las variables.
+
+    Parámetros:
+        psi (np.ndarray): Coeficientes MA, forma (..., steps+1, nvars, nvars).
+        sigma_u (np.ndarray): Covarianza de residuos, forma (..., nvars, nvars).
+
+    Retorna:
+        np.ndarray: Forma (..., steps+1, respuesta, impulso), mismo orden que `irf.irfs`.
+    """
+    sigma_u = np.asarray(sigma_u, dtype=float)
+    choques = sigma_u / np.sqrt(np.diagonal(sigma_u, axis1=-2, axis2=-1))[..., None, :]
+    return np.asarray(psi) @ choques[..., None, :, :]
+
+
+def gfevd_pesaran_shin(psi, sigma_u):
+    """
+    Calcula la GFEVD normalizada (filas que suman 1) para todos los horizontes.
+
+    θ_ij(h) = σ_jj⁻¹ Σ_{s≤h} (e_i' Ψ_s Σ_u e_j)² / Σ_{s≤h} e_i' Ψ_s Σ_u Ψ_s' e_i
+
+    Parámetros:
+        psi (np.ndarray): Coeficientes MA, forma (..., steps+1, nvars, nvars).
+        sigma_u (np.ndarray): Covarianza de residuos, forma (..., nvars, nvars).
+
+    Retorna:
+        np.ndarray: Forma (..., steps+1, caused_by, affected_var), mismo orden que
+                    fevd_cholesky_vectorizado() para poder usar fevd_a_dataframe().
+    """
+    psi = np.asarray(psi, dtype=float)
+    sigma_u = np.asarray(sigma_u, dtype=float)
+
+    numerador = np.cumsum(girf_pesaran_shin(psi, sigma_u) ** 2, axis=-3)  # (..., steps+1, affected, caused_by)
+    varianza = np.einsum('...sik,...kl,...sil->...si', psi, sigma_u, psi)
+    denominador = np.cumsum(varianza, axis=-2)[..., None]
+
+    gfevd = numerador / denominador
+    gfevd = gfevd / gfevd.sum(axis=-1, keepdims=True)
+    return np.swapaxes(gfevd, -1, -2)
+
+
+def girf_por_horizonte(coefs, sigma_u, horizontes):
+    """
+    Calcula la GIRF hasta max(horizontes) una sola vez y la recorta para cada horizonte.
+
+    Parámetros:
+        coefs (np.ndarray): Coeficientes A_1..A_p del VAR (`modelo.coefs`).
+        sigma_u (np.ndarray): Covarianza de residuos (`modelo.sigma_u`).
+        horizontes (list[int]): Horizontes a analizar (ej. [3, 18, 40]).
+
+    Retorna:
+        dict: {h: np.ndarray (h+1, respuesta, impulso)}, vistas sobre un único arreglo.
+    """
+    psi = coeficientes_ma(coefs, max(horizontes))
+    girf = girf_pesaran_shin(psi, sigma_u)
+    return {h: girf[:h + 1] for h in horizontes}
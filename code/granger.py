@@ -0,0 +1,151 @@
+# Causalidad de Granger por pares y en bloque a partir de los modelos VAR ya ajustados
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+TODAS = '(todas)'
+
+
+def _insumos_modelo(modelo):
+    """
+    Extrae params (m, nvars), Σ_u, (X'X)⁻¹ y grados de libertad de un VARResults o VARLigero.
+    """
+    X = np.asarray(modelo.endog_lagged, dtype=float)
+    params = np.asarray(modelo.params, dtype=float)
+    if X.shape[1] != 1 + modelo.neqs * modelo.k_ar:
+        raise ValueError("Solo se admiten modelos VAR con constante como único término determinista.")
+    return {
+        'params': params,
+        'sigma_u': np.asarray(modelo.sigma_u, dtype=float),
+        'XtX_inv': np.linalg.inv(X.T @ X),
+        'df_resid': int(modelo.df_resid),
+        'k_ar': int(modelo.k_ar),
+        'names': list(modelo.names),
+    }
+
+
+def _estadisticos_modelo(insumos, tipo):
+    """
+    Wald/F de todos los pares (causa → efecto) y de exogeneidad en bloque para un modelo.
+
+    Para la causa j, las filas de sus p rezagos son R_j = {1 + j + nvars·l}. Como
+    Cov(vec B) = Σ_u ⊗ (X'X)⁻¹, el estadístico del par (j → i) es
+    W_ij = b_ij' [(X'X)⁻¹_{R_j R_j}]⁻¹ b_ij / σ_ii, de modo que basta invertir un bloque p × p
+    por causa (compartido por todos los efectos) y aplicar un einsum sobre los nvars efectos.
+    """
+    params, sigma_u, XtX_inv = insumos['params'], insumos['sigma_u'], insumos['XtX_inv']
+    p, num_vars = insumos['k_ar'], params.shape[1]
+    filas = 1 + np.arange(num_vars)[:, None] + num_vars * np.arange(p)[None, :]  # (causa, rezago)
+    var_u = np.diag(sigma_u)
+
+    # Pares: un bloque (X'X)⁻¹ de p × p por causa
+    bloques = XtX_inv[filas[:, :, None], filas[:, None, :]]         # (causa, p, p)
+    coefs = params[filas]                                            # (causa, p, efecto)
+    wald = np.einsum('jpi,jpq,jqi->ij', coefs, np.linalg.inv(bloques), coefs) / var_u[:, None]  # (efecto, causa)
+    q_par = p
+
+    # Bloque: todas las demás variables → efecto i
+    wald_bloque = np.empty(num_vars)
+    for i in range(num_vars):
+        filas_i = np.delete(filas, i, axis=0).ravel()
+        b = params[filas_i, i]
+        wald_bloque[i] = b @ np.linalg.solve(XtX_inv[np.ix_(filas_i, filas_i)], b) / var_u[i]
+    q_bloque = p * (num_vars - 1)
+
+    gl_den = num_vars * insumos['df_resid']
+    if tipo == 'f':
+        estad_par, p_par = wald / q_par, stats.f.sf(wald / q_par, q_par, gl_den)
+        estad_bloque, p_bloque = wald_bloque / q_bloque, stats.f.sf(wald_bloque / q_bloque, q_bloque, gl_den)
+    else:
+        estad_par, p_par = wald, stats.chi2.sf(wald, q_par)
+        estad_bloque, p_bloque = wald_bloque, stats.chi2.sf(wald_bloque, q_bloque)
+        gl_den = np.nan
+
+    return {
+        'estadistico': estad_par, 'p_valor': p_par, 'gl': q_par,
+        'estadistico_bloque': estad_bloque, 'p_valor_bloque': p_bloque, 'gl_bloque': q_bloque,
+        'gl_den': gl_den,
+    }
+
+
+def _tabla_modelo(p, insumos, tipo, alpha):
+    r = _estadisticos_modelo(insumos, tipo)
+    nombres = insumos['names']
+    filas = []
+    for i, efecto in enumerate(nombres):
+        for j, causa in enumerate(nombres):
+            if i == j:
+                continue
+            filas.append({'p': p, 'causa': causa, 'efecto': efecto, 'prueba': 'par',
+                          'estadistico': r['estadistico'][i, j], 'gl': r['gl'], 'gl_den': r['gl_den'],
+                          'p_valor': r['p_valor'][i, j], 'causal': bool(r['p_valor'][i, j] < alpha)})
+        filas.append({'p': p, 'causa': TODAS, 'efecto': efecto, 'prueba': 'bloque',
+                      'estadistico': r['estadistico_bloque'][i], 'gl': r['gl_bloque'], 'gl_den': r['gl_den'],
+                      'p_valor': r['p_valor_bloque'][i], 'causal': bool(r['p_valor_bloque'][i] < alpha)})
+    return filas
+
+
+def causalidad_granger(modelos_dict, tipo='f', alpha=0.05, n_jobs=1):
+    """
+    Pruebas de causalidad de Granger en el VAR para todos los pares de variables y de
+    exogeneidad en bloque (todas las demás → efecto), para cada orden de rezago.
+
+    Usa los modelos sin restringir ya ajustados (p. ej. con ajustar_VAR): los estadísticos de
+    Wald salen de los coeficientes y de (X'X)⁻¹ del modelo, sin reestimar modelos restringidos.
+    Equivale a modelo.test_causality(efecto, causa, kind=tipo) para cada par.
+
+    Parámetros:
+        modelos_dict (dict): {p: modelo_fitted} (VARResults o VARLigero).
+        tipo (str): 'f' (F con gl (q, nvars·df_resid), como statsmodels) o 'wald' (χ²).
+        alpha (float): Nivel de significancia para la columna 'causal'.
+        n_jobs (int or None): Procesos para repartir los órdenes de rezago. Si None usa os.cpu_count().
+
+    Retorna:
+        pd.DataFrame: Formato largo con columnas p, causa, efecto, prueba ('par' o 'bloque'),
+                      estadistico, gl, gl_den, p_valor y causal.
+    """
+    if tipo not in ('f', 'wald'):
+        raise ValueError("tipo debe ser 'f' o 'wald'")
+    insumos = {p: _insumos_modelo(m) for p, m in modelos_dict.items() if m.k_ar > 0}
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(n_jobs, len(insumos)))
+    if n_jobs == 1:
+        bloques = [_tabla_modelo(p, ins, tipo, alpha) for p, ins in insumos.items()]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            futuros = [pool.submit(_tabla_modelo, p, ins, tipo, alpha) for p, ins in insumos.items()]
+            bloques = [f.result() for f in futuros]
+
+    return pd.DataFrame([fila for bloque in bloques for fila in bloque])
+
+
+def matriz_granger(tabla, p, decimales=4, ruta=None):
+    """
+    Matriz de p-valores por pares para un orden p, en el formato de figures/Granger_results.csv
+    (filas = efecto, columnas = causa, diagonal 0).
+
+    Parámetros:
+        tabla (pd.DataFrame): Salida de causalidad_granger().
+        p (int): Orden de rezago.
+        decimales (int): Redondeo de los p-valores.
+        ruta (str or None): Si se indica, guarda la matriz en CSV.
+
+    Retorna:
+        pd.DataFrame: Matriz nvars × nvars de p-valores.
+    """
+    pares = tabla[(tabla['p'] == p) & (tabla['prueba'] == 'par')]
+    nombres = list(dict.fromkeys(pares['efecto']))
+    matriz = pares.pivot(index='efecto', columns='causa', values='p_valor').reindex(index=nombres, columns=nombres)
+    matriz = matriz.fillna(0.0).round(decimales)
+    matriz.index.name = None
+    matriz.columns.name = None
+
+    if ruta:
+        matriz.to_csv(ruta)
+        print(f"✅ Matriz de Granger guardada en: {ruta}")
+    return matriz
@@ -0,0 +1,55 @@
+# Selección automática del horizonte IRF/FEVD por convergencia de la FEVD, con terminación temprana
+import numpy as np
+
+from girf import matriz_companion
+
+
+def seleccionar_horizonte(coefs, sigma_u, tol_convergencia=0.01, max_steps=40, paciencia=1):
+    """
+    Elige el horizonte a partir del cual la FEVD (Cholesky) deja de cambiar.
+
+    Los coeficientes MA se generan uno por uno desde la matriz companion (solo las primeras
+    nvars filas de A^h) y la FEVD se actualiza con una suma acumulada de (Ψ_h P)²; el ciclo se
+    detiene en cuanto el cambio máximo de las participaciones entre h-1 y h es menor que
+    `tol_convergencia` durante `paciencia` pasos seguidos, sin calcular horizontes posteriores.
+
+    Parámetros:
+        coefs (np.ndarray): Coeficientes A_1..A_p (`modelo.coefs`).
+        sigma_u (np.ndarray): Covarianza de residuos (`modelo.sigma_u`).
+        tol_convergencia (float): Tolerancia sobre el cambio máximo de las participaciones.
+        max_steps (int): Horizonte máximo si no hay convergencia.
+        paciencia (int): Pasos consecutivos por debajo de la tolerancia requeridos.
+
+    Retorna:
+        steps (int): Horizonte seleccionado (usar en IRF, GIRF y FEVD).
+        psi (np.ndarray): Coeficientes MA Ψ_0..Ψ_steps, forma (steps+1, nvars, nvars).
+    """
+    coefs = np.asarray(coefs, dtype=float)
+    num_vars = coefs.shape[-1]
+    companion = matriz_companion(coefs)
+    P = np.linalg.cholesky(np.asarray(sigma_u, dtype=float))
+
+    filas = np.eye(num_vars, companion.shape[-1])
+    psi = [filas[:, :num_vars].copy()]
+    acumulado = (psi[0] @ P) ** 2
+    anterior = None
+    racha = 0
+
+    h = 0
+    for h in range(1, max_steps + 1):
+        filas = filas @ companion
+        psi.append(filas[:, :num_vars].copy())
+        acumulado += (psi[-1] @ P) ** 2
+        total = acumulado.sum(axis=1, keepdims=True)
+        actual = np.divide(acumulado, total, out=np.full_like(acumulado, 1.0 / num_vars), where=total != 0)
+
+        # h = 1 es el primer horizonte con FEVD no trivial (en h = 0 se usa la identidad)
+        if anterior is not None and np.max(np.abs(actual - anterior)) < tol_convergencia:
+            racha += 1
+            if racha >= paciencia:
+                break
+        else:
+            racha = 0
+        anterior = actual
+
+    return h, np.stack(psi)
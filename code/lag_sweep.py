@@ -0,0 +1,146 @@
+# Barrido paralelo de órdenes de rezago (y variantes de preprocesamiento) para modelos VAR
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from statsmodels.tsa.api import VAR
+
+from var_ols import VARIncremental
+
+# Estado compartido por proceso: las series se envían una sola vez a cada worker (initializer)
+# en lugar de serializarlas con cada tarea. El objeto VAR no se reutiliza entre órdenes p
+# porque VAR.fit() modifica los nombres de regresores del modelo.
+_VARIANTES = {}
+
+
+def _inicializar_worker(variantes):
+    global _VARIANTES
+    _VARIANTES = variantes
+
+
+def _ajustar_tarea(variante, p, p_max, muestra_comun):
+    series_var = _VARIANTES[variante]
+    if muestra_comun:
+        series_var = series_var.iloc[p_max - p:]
+
+    inicio = time.perf_counter()
+    modelo_fitted = VAR(series_var).fit(p)
+    es_estable = modelo_fitted.is_stable()
+    segundos = time.perf_counter() - inicio
+
+    fila = {
+        'variante': variante,
+        'p': p,
+        'nobs': modelo_fitted.nobs,
+        'AIC': modelo_fitted.aic,
+        'BIC': modelo_fitted.bic,
+        'HQC': modelo_fitted.hqic,
+        'estable': es_estable,
+        'segundos': segundos,
+    }
+    return modelo_fitted, fila
+
+
+def _ajustar_variante_incremental(variante, rezagos):
+    inicio = time.perf_counter()
+    estimador = VARIncremental(_VARIANTES[variante], max(rezagos))
+    segundos_factorizacion = time.perf_counter() - inicio
+
+    resultados = []
+    for p in rezagos:
+        inicio = time.perf_counter()
+        modelo_fitted = estimador.ajustar(p)
+        es_estable = modelo_fitted.is_stable()
+        segundos = time.perf_counter() - inicio
+        fila = {
+            'variante': variante,
+            'p': p,
+            'nobs': modelo_fitted.nobs,
+            'AIC': modelo_fitted.aic,
+            'BIC': modelo_fitted.bic,
+            'HQC': modelo_fitted.hqic,
+            'estable': es_estable,
+            'segundos': segundos + segundos_factorizacion / len(rezagos),
+        }
+        resultados.append((modelo_fitted, fila))
+    return resultados
+
+
+def barrido_rezagos(series_var, rezagos, variantes=None, n_jobs=None, muestra_comun=None,
+                    estimador='incremental', verbose=True):
+    """
+    Ajusta un VAR(p) para cada orden de rezago (y cada variante de preprocesamiento) en paralelo.
+
+    Sustituye el ciclo manual `{p: ajustar_VAR(series_var, p)[0] for p in rezagos}`. Por defecto
+    se arma una sola matriz de diseño de orden max(rezagos) por variante (VARIncremental) y todos
+    los p se obtienen de su factorización. Las series se envían una sola vez a cada proceso.
+
+    Parámetros:
+        series_var (pd.DataFrame): Serie multivariada preprocesada (variante 'base').
+        rezagos (iterable of int): Órdenes de rezago a ajustar (ej. range(1, 9)).
+        variantes (dict or None): {nombre: pd.DataFrame} con variantes adicionales de preprocesamiento.
+        n_jobs (int or None): Número de procesos. Si None usa os.cpu_count(); si 1, ajusta en serie.
+        muestra_comun (bool or None): Si True, todos los p se estiman sobre la misma muestra efectiva
+                                      (recortando max(rezagos) - p observaciones) para que AIC/BIC/HQC
+                                      sean comparables. None = True con 'incremental', False con 'statsmodels'.
+        estimador (str): 'incremental' (por defecto) factoriza una sola vez la matriz de diseño de orden
+                         max(rezagos) por variante (VARIncremental) y obtiene todos los p de ella; implica
+                         muestra común y devuelve VARLigero. 'statsmodels' ajusta cada VAR(p) desde cero
+                         con VAR(...).fit(p) (camino de referencia, devuelve VARResultsWrapper).
+        verbose (bool): Si True, imprime la tabla resumen.
+
+    Retorna:
+        modelos (dict): {p: modelo_fitted} si solo hay una variante; {(variante, p): modelo_fitted} en otro caso.
+        tabla (pd.DataFrame): AIC, BIC, HQC, estabilidad, nobs y tiempo de ajuste por (variante, p).
+    """
+    rezagos = sorted(rezagos)
+    todas = {'base': series_var}
+    if variantes:
+        todas.update(variantes)
+    p_max = rezagos[-1]
+    tareas = [(variante, p) for variante in todas for p in rezagos]
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(n_jobs, len(tareas)))
+
+    if estimador == 'incremental':
+        if muestra_comun is False:
+            raise ValueError("estimador='incremental' implica muestra común; usa estimador='statsmodels'")
+        # Una tarea por variante: la factorización se comparte entre todos los p
+        n_jobs = max(1, min(n_jobs, len(todas)))
+        if n_jobs == 1:
+            _inicializar_worker(todas)
+            por_variante = [_ajustar_variante_incremental(variante, rezagos) for variante in todas]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_inicializar_worker, initargs=(todas,)) as pool:
+                futuros = [pool.submit(_ajustar_variante_incremental, variante, rezagos) for variante in todas]
+                por_variante = [f.result() for f in futuros]
+        resultados = [r for lista in por_variante for r in lista]
+    elif estimador == 'statsmodels':
+        if n_jobs == 1:
+            _inicializar_worker(todas)
+            resultados = [_ajustar_tarea(variante, p, p_max, bool(muestra_comun)) for variante, p in tareas]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_inicializar_worker, initargs=(todas,)) as pool:
+                futuros = [pool.submit(_ajustar_tarea, variante, p, p_max, bool(muestra_comun)) for variante, p in tareas]
+                resultados = [f.result() for f in futuros]
+    else:
+        raise ValueError("estimador debe ser 'statsmodels' o 'incremental'")
+
+    una_variante = len(todas) == 1
+    modelos = {}
+    filas = []
+    for (variante, p), (modelo_fitted, fila) in zip(tareas, resultados):
+        modelos[p if una_variante else (variante, p)] = modelo_fitted
+        filas.append(fila)
+
+    tabla = pd.DataFrame(filas).set_index(['variante', 'p'])
+    if verbose:
+        print(f"🔧 {len(tareas)} modelos VAR ajustados con {n_jobs} proceso(s).")
+        for criterio in ['AIC', 'BIC', 'HQC']:
+            variante, p = tabla[criterio].idxmin()
+            print(f"✅ Mínimo {criterio}: p={p} (variante '{variante}')")
+
+    return modelos, tabla
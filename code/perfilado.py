@@ -0,0 +1,263 @@
+# Instrumentación de tiempo y memoria por etapa, con registro JSON por ejecución
+import functools
+import json
+import os
+import platform
+import threading
+import time
+import tracemalloc
+import types
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Rutas calientes del pipeline (nombres globales de los scripts numerados y utils.py)
+FUNCIONES_CLAVE = (
+    'preprocesar_series_para_VAR',
+    'interpolar_escalonado',
+    'ajustar_VAR',
+    'evaluar_residuos_varios_modelos',
+    'evaluar_metricas_VAR_train_test',
+    'calcular_FEVD_cholesky',
+    'GIRF',
+)
+
+
+class Perfilador:
+    """
+    Acumula mediciones (tiempo de pared, tiempo de CPU y, opcionalmente, pico de memoria con
+    tracemalloc) de bloques de código o llamadas a funciones, y las exporta como JSON.
+
+    Las mediciones pueden anidarse: el pico de memoria de un bloque incluye el de los bloques
+    internos. tracemalloc se inicia en la primera medición y sigue activo hasta cerrar() (o
+    guardar()), no en cada bloque. Como su pico es global al proceso, un bloque que se
+    superpone con mediciones de otro hilo no puede atribuirse su memoria: en ese caso su
+    registro lleva memoria_pico_mb = None (los tiempos no se ven afectados).
+
+    Uso:
+        perfilador = Perfilador(memoria=True)
+        with perfilador.medir('ajuste', p=2):
+            ...
+        instrumentar(globals(), perfilador=perfilador)  # en el notebook
+        perfilador.guardar('perfil.json')
+    """
+
+    def __init__(self, memoria=True, metadatos=None):
+        self.memoria = memoria
+        self.metadatos = dict(metadatos or {})
+        self.registros = []
+        self.inicio = datetime.now().isoformat(timespec='seconds')
+        self._candado = threading.Lock()
+        self._local = threading.local()
+        self._activos = []  # marcos abiertos en todos los hilos
+        self._detener_tracemalloc = False
+
+    def __repr__(self):
+        return f"Perfilador(registros={len(self.registros)}, memoria={self.memoria})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excinfo):
+        self.cerrar()
+
+    def _pila(self):
+        if not hasattr(self._local, 'pila'):
+            self._local.pila = []
+        return self._local.pila
+
+    def cerrar(self):
+        """
+        Detiene tracemalloc si lo inició este perfilador.
+        """
+        with self._candado:
+            if self._detener_tracemalloc and tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self._detener_tracemalloc = False
+
+    def _abrir(self, marco, pila):
+        # Todo acceso a tracemalloc ocurre con el candado: reset_peak() es global al proceso
+        with self._candado:
+            if any(otro['hilo'] != marco['hilo'] for otro in self._activos):
+                marco['concurrente'] = True
+                for otro in self._activos:
+                    otro['concurrente'] = True
+            self._activos.append(marco)
+            if self.memoria:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    self._detener_tracemalloc = True
+                actual, pico = tracemalloc.get_traced_memory()
+                if pila:
+                    pila[-1]['pico'] = max(pila[-1]['pico'], pico)
+                tracemalloc.reset_peak()
+                marco['base'] = actual
+        pila.append(marco)
+
+    def _cerrar_marco(self, marco, pila):
+        """
+        Retorna el pico de memoria del bloque en MB, o None si se superpuso con otro hilo.
+        """
+        pila.pop()
+        with self._candado:
+            self._activos.remove(marco)
+            if not self.memoria:
+                return None
+            pico = max(marco['pico'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            if pila:
+                pila[-1]['pico'] = max(pila[-1]['pico'], pico)
+                pila[-1]['concurrente'] = pila[-1]['concurrente'] or marco['concurrente']
+            return None if marco['concurrente'] else (pico - marco['base']) / 2 ** 20
+
+    @contextmanager
+    def medir(self, nombre, **etiquetas):
+        """
+        Mide el bloque `with` y agrega un registro con `nombre` y las `etiquetas` dadas.
+        """
+        pila = self._pila()
+        marco = {'pico': 0, 'hilo': threading.get_ident(), 'concurrente': False}
+        self._abrir(marco, pila)
+
+        error = None
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield marco
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            registro = {
+                'nombre': nombre,
+                'segundos': time.perf_counter() - inicio,
+                'cpu_segundos': time.process_time() - inicio_cpu,
+                'nivel': len(pila) - 1,
+                'hilo': threading.current_thread().name,
+            }
+            memoria_pico_mb = self._cerrar_marco(marco, pila)
+            if self.memoria:
+                registro['memoria_pico_mb'] = memoria_pico_mb
+            if error:
+                registro['error'] = error
+            registro.update({k: _a_json(v) for k, v in etiquetas.items()})
+            with self._candado:
+                self.registros.append(registro)
+
+    def envolver(self, funcion, nombre=None, **etiquetas):
+        """
+        Devuelve `funcion` envuelta para medir cada llamada (uso como decorador: @perfilador.envolver).
+        """
+        nombre = nombre or funcion.__name__
+
+        @functools.wraps(funcion)
+        def envuelta(*args, **kwargs):
+            with self.medir(nombre, **etiquetas):
+                return funcion(*args, **kwargs)
+
+        envuelta.__perfilador__ = self
+        return envuelta
+
+    def resumen(self):
+        """
+        Agrega los registros por nombre: llamadas, tiempo total/medio/máximo y pico de memoria.
+
+        Retorna:
+            pd.DataFrame: Una fila por nombre, ordenada por tiempo total.
+        """
+        if not self.registros:
+            return pd.DataFrame()
+        df = pd.DataFrame(self.registros)
+        agregados = {'llamadas': ('segundos', 'size'), 'total_s': ('segundos', 'sum'),
+                     'medio_s': ('segundos', 'mean'), 'max_s': ('segundos', 'max'),
+                     'cpu_s': ('cpu_segundos', 'sum')}
+        if 'memoria_pico_mb' in df:
+            agregados['memoria_pico_mb'] = ('memoria_pico_mb', 'max')
+        return df.groupby('nombre').agg(**agregados).sort_values('total_s', ascending=False)
+
+    def a_dict(self):
+        return {
+            'inicio': self.inicio,
+            'fin': datetime.now().isoformat(timespec='seconds'),
+            'entorno': entorno(),
+            'metadatos': self.metadatos,
+            'registros': list(self.registros),
+        }
+
+    def guardar(self, ruta):
+        """
+        Escribe la ejecución completa (entorno, metadatos y registros) como JSON y cierra el perfilador.
+        """
+        self.cerrar()
+        carpeta = os.path.dirname(ruta)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(self.a_dict(), f, indent=1, ensure_ascii=False)
+        print(f"✅ Perfil guardado en: {ruta}")
+        return ruta
+
+
+def _a_json(valor):
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, (str, int, float, bool)) or valor is None:
+        return valor
+    return str(valor)
+
+
+def entorno():
+    """
+    Versiones y hardware relevantes para comparar ejecuciones entre sí.
+    """
+    versiones = {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__}
+    for modulo in ('scipy', 'statsmodels'):
+        try:
+            versiones[modulo] = __import__(modulo).__version__
+        except ImportError:
+            pass
+    return {'plataforma': platform.platform(), 'procesador': platform.machine(),
+            'nucleos': os.cpu_count(), 'versiones': versiones}
+
+
+def instrumentar(espacio, nombres=FUNCIONES_CLAVE, perfilador=None, memoria=True):
+    """
+    Reemplaza las funciones `nombres` de un espacio de nombres (globals() del notebook, el
+    espacio de pipeline.cargar_script() o un módulo) por versiones medidas.
+
+    Como los scripts numerados buscan sus funciones como globales en tiempo de llamada, las
+    llamadas entre ellas (p. ej. evaluar_residuos_varios_modelos → graficar_residuos_modelo, si
+    está en `nombres`) también quedan medidas. Los nombres ausentes se ignoran y una función
+    ya instrumentada con el mismo perfilador no se envuelve dos veces.
+
+    Parámetros:
+        espacio (dict or module): Donde están definidas las funciones.
+        nombres (iterable of str): Funciones a instrumentar (por defecto FUNCIONES_CLAVE).
+        perfilador (Perfilador or None): Si None, se crea uno nuevo.
+        memoria (bool): Medir pico de memoria con tracemalloc (solo si se crea el perfilador).
+
+    Retorna:
+        Perfilador: El perfilador que recibe las mediciones.
+    """
+    perfilador = perfilador or Perfilador(memoria=memoria)
+    destino = vars(espacio) if isinstance(espacio, types.ModuleType) else espacio
+    for nombre in nombres:
+        funcion = destino.get(nombre)
+        if funcion is None or getattr(funcion, '__perfilador__', None) is perfilador:
+            continue
+        destino[nombre] = perfilador.envolver(funcion, nombre)
+    return perfilador
+
+
+def desinstrumentar(espacio, nombres=FUNCIONES_CLAVE):
+    """
+    Restaura las funciones originales reemplazadas por instrumentar().
+    """
+    destino = vars(espacio) if isinstance(espacio, types.ModuleType) else espacio
+    for nombre in nombres:
+        funcion = destino.get(nombre)
+        while funcion is not None and hasattr(funcion, '__perfilador__'):
+            funcion = funcion.__wrapped__
+        if funcion is not None:
+            destino[nombre] = funcion
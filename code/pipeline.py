@@ -0,0 +1,502 @@
+# Ejecutor del pipeline VAR por línea de comandos: DAG de etapas, ramas en paralelo y omisión de etapas al día
+"""
+Uso:
+    python code/pipeline.py --rezagos 1 2 3 --steps 40 --horizontes-girf 3 18 40 --salida figures/pipeline
+
+Las funciones de los scripts numerados (01_…05_ y utils.py) se cargan con exec en un espacio de
+nombres que imita al notebook; statsmodels, scikit-learn y matplotlib se importan solo cuando una
+etapa usa por primera vez un nombre que los requiere.
+"""
+import argparse
+import ast
+import hashlib
+import importlib
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+DIRECTORIO_CODIGO = os.path.dirname(os.path.abspath(__file__))
+if DIRECTORIO_CODIGO not in sys.path:
+    sys.path.insert(0, DIRECTORIO_CODIGO)
+
+from cache_artefactos import CacheArtefactos, huella  # noqa: E402
+from perfilado import Perfilador, instrumentar  # noqa: E402
+
+# Nombres globales que los scripts numerados esperan del notebook: {nombre: (módulo, atributo)}
+GLOBALES_NOTEBOOK = {
+    'np': ('numpy', None),
+    'pd': ('pandas', None),
+    'os': ('os', None),
+    'traceback': ('traceback', None),
+    'plt': ('matplotlib.pyplot', None),
+    'VAR': ('statsmodels.tsa.api', 'VAR'),
+    'adfuller': ('statsmodels.tsa.stattools', 'adfuller'),
+    'acorr_ljungbox': ('statsmodels.stats.diagnostic', 'acorr_ljungbox'),
+    'plot_acf': ('statsmodels.graphics.tsaplots', 'plot_acf'),
+    'plot_pacf': ('statsmodels.graphics.tsaplots', 'plot_pacf'),
+    'StandardScaler': ('sklearn.preprocessing', 'StandardScaler'),
+    'mean_squared_error': ('sklearn.metrics', 'mean_squared_error'),
+    'mean_absolute_error': ('sklearn.metrics', 'mean_absolute_error'),
+    'r2_score': ('sklearn.metrics', 'r2_score'),
+}
+
+
+class EspacioNotebook(dict):
+    """
+    Espacio de nombres para los scripts numerados: los globales del notebook se importan
+    la primera vez que una función los consulta (LOAD_GLOBAL recurre a __missing__).
+    """
+
+    def __missing__(self, nombre):
+        if nombre not in GLOBALES_NOTEBOOK:
+            raise KeyError(nombre)
+        modulo, atributo = GLOBALES_NOTEBOOK[nombre]
+        if modulo == 'matplotlib.pyplot':
+            import matplotlib
+            matplotlib.use('Agg')
+        valor = importlib.import_module(modulo)
+        if atributo:
+            valor = getattr(valor, atributo)
+        self[nombre] = valor
+        return valor
+
+
+_ESPACIO = EspacioNotebook()
+_CARGADOS = set()
+_CANDADO = threading.Lock()
+_PERFILADOR = None
+
+
+def cargar_script(nombre):
+    """
+    Ejecuta un script numerado (una sola vez) en el espacio compartido y lo devuelve.
+    Si hay un perfilador activo, instrumenta las funciones clave recién definidas.
+    """
+    with _CANDADO:
+        if nombre not in _CARGADOS:
+            ruta = os.path.join(DIRECTORIO_CODIGO, nombre)
+            with open(ruta, 'r', encoding='utf-8') as f:
+                exec(compile(f.read(), ruta, 'exec'), _ESPACIO)
+            _CARGADOS.add(nombre)
+        if _PERFILADOR is not None:
+            instrumentar(_ESPACIO, perfilador=_PERFILADOR)
+    return _ESPACIO
+
+
+def _modulos_importados(ruta):
+    """
+    Nombres de primer nivel de los módulos que importa un archivo (incluidas las importaciones
+    dentro de funciones).
+    """
+    with open(ruta, 'r', encoding='utf-8') as f:
+        arbol = ast.parse(f.read(), ruta)
+    nombres = set()
+    for nodo in ast.walk(arbol):
+        if isinstance(nodo, ast.Import):
+            nombres.update(alias.name.split('.')[0] for alias in nodo.names)
+        elif isinstance(nodo, ast.ImportFrom) and nodo.level == 0 and nodo.module:
+            nombres.add(nodo.module.split('.')[0])
+    return nombres
+
+
+def cierre_codigo(archivos):
+    """
+    Archivos de code/ que ejecuta una etapa: los indicados y, transitivamente, todos los módulos
+    locales que importan. Así la huella de la etapa cambia al editar cualquiera de ellos.
+    """
+    cierre, pendientes = set(), list(archivos)
+    while pendientes:
+        archivo = pendientes.pop()
+        ruta = os.path.join(DIRECTORIO_CODIGO, archivo)
+        if archivo in cierre or not os.path.exists(ruta):
+            continue
+        cierre.add(archivo)
+        pendientes += [f'{m}.py' for m in _modulos_importados(ruta)]
+    return sorted(cierre)
+
+
+def _hash_archivos(rutas):
+    h = hashlib.sha256()
+    for ruta in rutas:
+        with open(ruta, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class Etapa:
+    """
+    Nodo del DAG: función, dependencias, parámetros, archivos de código que usa y salidas en disco.
+
+    `codigo` son los puntos de entrada de la etapa (scripts que carga y módulos que importa
+    pipeline.py para ella); la huella cubre además todo lo que estos importan (cierre_codigo()).
+
+    La función recibe (contexto, **resultados_de_dependencias) y devuelve un artefacto
+    serializable por CacheArtefactos. Con usa_resultados=False solo espera a que sus
+    dependencias terminen (sin leer sus resultados de la caché).
+    """
+
+    def __init__(self, nombre, funcion, dependencias=(), parametros=None, codigo=(), salidas=(), usa_resultados=True):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.dependencias = list(dependencias)
+        self.parametros = parametros or {}
+        self.codigo = list(codigo)
+        self.salidas = list(salidas)
+        self.usa_resultados = usa_resultados
+
+    def __repr__(self):
+        return f"Etapa('{self.nombre}', dependencias={self.dependencias})"
+
+
+# === Etapas ===
+def _modelo(ajuste, preprocesamiento):
+    from var_ols import VARLigero, matriz_diseno_rezagada
+
+    train = preprocesamiento['train']
+    p = ajuste['p']
+    Y, X = matriz_diseno_rezagada(train.values, p)
+    return VARLigero(ajuste['params'], ajuste['sigma_u'], ajuste['nobs'], train.columns, Y=Y, X=X, index=train.index[p:],
+                     endog=train.values)
+
+
+def etapa_datos(ctx):
+    from datos import cargar_excel_cacheado
+
+    df = cargar_excel_cacheado(ctx['datos'], verbose=False)
+    df = df.set_index(ctx['columna_fecha']) if ctx['columna_fecha'] in df.columns else df
+    return df.apply(pd.to_numeric, errors='coerce').dropna(axis=1, how='all')
+
+
+def etapa_preprocesamiento(ctx, datos):
+    ns = cargar_script('utils.py')
+    series_var, estacionariedad, correlaciones_altas, variables_diferenciadas = ns['preprocesar_series_para_VAR'](
+        datos, alpha=ctx['alpha'], umbral_corr=ctx['umbral_corr'], verbose=False, n_jobs=ctx['n_jobs'])
+    n_train = int(len(series_var) * ctx['proporcion_train'])
+    train, test, scaler = ns['estandarizar_train_test'](series_var.iloc[:n_train], series_var.iloc[n_train:])
+
+    pd.Series(estacionariedad, name='estacionaria').to_csv(os.path.join(ctx['salida'], 'estacionariedad.csv'))
+    return {'train': train, 'test': test, 'diferenciadas': variables_diferenciadas,
+            'media': scaler.mean_, 'escala': scaler.scale_}
+
+
+def etapa_ajuste(ctx, preprocesamiento, p):
+    ns = cargar_script('02_train_var.py')
+    modelo_fitted, es_estable = ns['ajustar_VAR'](preprocesamiento['train'], p, verbose=False)
+    params = np.asarray(modelo_fitted.params, dtype=float)
+    pd.DataFrame(params, index=modelo_fitted.params.index, columns=modelo_fitted.names).to_csv(
+        os.path.join(ctx['salida'], f'p{p}', 'params.csv'))
+    return {'p': p, 'params': params, 'sigma_u': np.asarray(modelo_fitted.sigma_u, dtype=float),
+            'nobs': int(modelo_fitted.nobs), 'estable': bool(es_estable),
+            'AIC': float(modelo_fitted.aic), 'BIC': float(modelo_fitted.bic), 'HQC': float(modelo_fitted.hqic)}
+
+
+def etapa_diagnosticos(ctx, preprocesamiento, ajuste):
+    from diagnosticos import diagnosticar_modelos
+
+    p = ajuste['p']
+    resultado = diagnosticar_modelos({p: _modelo(ajuste, preprocesamiento)}, lags_ljung=ctx['lags_ljung'],
+                                     lag_portmanteau=max(ctx['lags_ljung']) + p)
+    for nombre, tabla in resultado.items():
+        tabla.to_csv(os.path.join(ctx['salida'], f'p{p}', f'diagnostico_{nombre}.csv'), index=False)
+    return resultado
+
+
+def etapa_irf(ctx, preprocesamiento, ajuste):
+    ns = cargar_script('05_irf_fevd_analysis.py')
+    p = ajuste['p']
+    irf_df, _ = ns['graficar_IRF'](_modelo(ajuste, preprocesamiento), {}, steps=ctx['steps'], nombre_modelo=f'p{p}',
+                                   carpeta_salida=os.path.join(ctx['salida'], f'p{p}'), mostrar=False)
+    return irf_df
+
+
+def etapa_fevd(ctx, preprocesamiento, ajuste):
+    ns = cargar_script('05_irf_fevd_analysis.py')
+    p = ajuste['p']
+    return ns['calcular_FEVD_cholesky'](_modelo(ajuste, preprocesamiento), steps=ctx['steps'], nombre_modelo=f'p{p}',
+                                        carpeta_salida=os.path.join(ctx['salida'], f'p{p}'))
+
+
+def etapa_girf(ctx, preprocesamiento, ajuste):
+    ns = cargar_script('05_irf_fevd_analysis.py')
+    p = ajuste['p']
+    # Con steps automático, la GIRF usa el mismo horizonte de convergencia que irf_p y fevd_p
+    horizontes = ctx['horizontes_girf'] if ctx['steps'] is not None else None
+    resultados = ns['GIRF'](_modelo(ajuste, preprocesamiento), horizontes,
+                            ruta=os.path.join(ctx['salida'], f'p{p}'), guardar_figuras=False, mostrar=False)
+    return {str(h): df for h, df in resultados.items()}
+
+
+def etapa_granger(ctx, preprocesamiento, ajuste):
+    from granger import causalidad_granger, matriz_granger
+
+    p = ajuste['p']
+    tabla = causalidad_granger({p: _modelo(ajuste, preprocesamiento)}, alpha=ctx['alpha'])
+    matriz_granger(tabla, p, ruta=os.path.join(ctx['salida'], f'p{p}', 'Granger_results.csv'))
+    return tabla
+
+
+def etapa_criterios(ctx, **ajustes):
+    tabla = pd.DataFrame([{k: a[k] for k in ('p', 'nobs', 'AIC', 'BIC', 'HQC', 'estable')} for a in ajustes.values()])
+    tabla = tabla.set_index('p').sort_index()
+    tabla.to_csv(os.path.join(ctx['salida'], 'criterios.csv'))
+    return tabla
+
+
+def etapa_figuras(ctx, **_):
+    from render import renderizar_figuras, trabajos_desde_carpeta
+
+    trabajos = [t for p in ctx['rezagos']
+                for t in trabajos_desde_carpeta(os.path.join(ctx['salida'], f'p{p}'), dpi=ctx['dpi'],
+                                                escala=ctx['escala_figuras'])]
+    resumen = renderizar_figuras(trabajos, n_jobs=ctx['n_jobs'], verbose=False)
+    return resumen
+
+
+def construir_etapas(ctx):
+    """
+    Arma el DAG: datos → preprocesamiento → ajuste_p → {diagnosticos_p, irf_p, fevd_p, girf_p,
+    granger_p} → figuras, más la tabla de criterios de información sobre todos los ajustes.
+    """
+    etapas = {}
+
+    def agregar(etapa):
+        etapas[etapa.nombre] = etapa
+
+    agregar(Etapa('datos', etapa_datos, parametros={'datos': ctx['datos'], 'columna_fecha': ctx['columna_fecha']},
+                  codigo=['datos.py']))
+    agregar(Etapa('preprocesamiento', etapa_preprocesamiento, ['datos'],
+                  {k: ctx[k] for k in ('alpha', 'umbral_corr', 'proporcion_train')},
+                  ['utils.py'], ['estacionariedad.csv']))
+
+    # Con steps automático el horizonte de la GIRF se conoce solo al ejecutar (sin salidas fijas)
+    horizontes_girf = ctx['horizontes_girf'] if ctx['steps'] is not None else None
+    analisis = {
+        'diagnosticos': (etapa_diagnosticos, {'lags_ljung': ctx['lags_ljung']}, ['diagnosticos.py'],
+                         ['diagnostico_ljung_box.csv']),
+        'irf': (etapa_irf, {'steps': ctx['steps']}, ['05_irf_fevd_analysis.py'], None),
+        'fevd': (etapa_fevd, {'steps': ctx['steps']}, ['05_irf_fevd_analysis.py'], None),
+        'girf': (etapa_girf, {'horizontes_girf': horizontes_girf, 'steps': ctx['steps']}, ['05_irf_fevd_analysis.py'],
+                 [f'GIRF_h{h}.csv' for h in horizontes_girf or []]),
+        'granger': (etapa_granger, {'alpha': ctx['alpha']}, ['granger.py'], ['Granger_results.csv']),
+    }
+    figuras = []
+    for p in ctx['rezagos']:
+        agregar(Etapa(f'ajuste_p{p}', lambda ctx, preprocesamiento, p=p: etapa_ajuste(ctx, preprocesamiento, p),
+                      ['preprocesamiento'], {'p': p}, ['02_train_var.py'], [f'p{p}/params.csv']))
+        for nombre, (funcion, parametros, codigo, salidas) in analisis.items():
+            if salidas is None:
+                salidas = [f"{nombre.upper()}_p{p}.csv"]
+            agregar(Etapa(f'{nombre}_p{p}',
+                          lambda ctx, preprocesamiento, funcion=funcion, p=p, **deps:
+                              funcion(ctx, preprocesamiento, deps[f'ajuste_p{p}']),
+                          ['preprocesamiento', f'ajuste_p{p}'], parametros, codigo + ['var_ols.py'],
+                          [f'p{p}/{s}' for s in salidas]))
+        figuras += [f'irf_p{p}', f'fevd_p{p}', f'girf_p{p}']
+
+    agregar(Etapa('criterios', etapa_criterios, [f'ajuste_p{p}' for p in ctx['rezagos']], codigo=[],
+                  salidas=['criterios.csv']))
+    agregar(Etapa('figuras', etapa_figuras, figuras,
+                  {k: ctx[k] for k in ('rezagos', 'dpi', 'escala_figuras')}, ['render.py'], usa_resultados=False))
+    return etapas
+
+
+def _huellas(etapas, ctx):
+    """
+    Huella de cada etapa: parámetros, código, huellas de sus dependencias y, para 'datos', el libro.
+    """
+    huellas = {}
+
+    def calcular(nombre):
+        if nombre not in huellas:
+            etapa = etapas[nombre]
+            extra = _hash_archivos([ctx['datos']]) if nombre == 'datos' else None
+            archivos = cierre_codigo(etapa.codigo) + ['pipeline.py']
+            codigo = _hash_archivos([os.path.join(DIRECTORIO_CODIGO, c) for c in archivos])
+            huellas[nombre] = huella(nombre, etapa.parametros, codigo, extra,
+                                     [calcular(d) for d in etapa.dependencias])
+        return huellas[nombre]
+
+    for nombre in etapas:
+        calcular(nombre)
+    return huellas
+
+
+def _cierre(etapas, objetivos):
+    necesarias, pendientes = set(), list(objetivos)
+    while pendientes:
+        nombre = pendientes.pop()
+        if nombre not in necesarias:
+            necesarias.add(nombre)
+            pendientes += etapas[nombre].dependencias
+    return necesarias
+
+
+def ejecutar_pipeline(ctx, objetivos=None, forzar=False, verbose=True, perfilador=None):
+    """
+    Ejecuta el DAG con hasta ctx['n_jobs'] etapas simultáneas.
+
+    Una etapa está al día si su huella existe en la caché de artefactos y sus salidas en disco
+    existen; en ese caso no se ejecuta, y su resultado solo se lee de la caché si alguna etapa
+    posterior lo necesita.
+
+    Con `perfilador` (perfilado.Perfilador) se mide cada etapa ejecutada y cada llamada a las
+    funciones de perfilado.FUNCIONES_CLAVE de los scripts numerados. Si mide memoria, conviene
+    ctx['n_jobs'] = 1: las etapas simultáneas quedan con memoria_pico_mb = None.
+
+    Retorna:
+        pd.DataFrame: Estado ('ejecutada', 'al día' o 'error') y segundos por etapa.
+    """
+    global _PERFILADOR
+    _PERFILADOR = perfilador
+    if perfilador is not None:
+        instrumentar(_ESPACIO, perfilador=perfilador)
+
+    etapas = construir_etapas(ctx)
+    if objetivos:
+        desconocidas = set(objetivos) - set(etapas)
+        if desconocidas:
+            raise ValueError(f"Etapas desconocidas: {sorted(desconocidas)}")
+        etapas = {n: e for n, e in etapas.items() if n in _cierre(etapas, objetivos)}
+
+    os.makedirs(ctx['salida'], exist_ok=True)
+    for p in ctx['rezagos']:
+        os.makedirs(os.path.join(ctx['salida'], f'p{p}'), exist_ok=True)
+
+    cache = CacheArtefactos(ctx['cache_dir'], verbose=False)
+    huellas = _huellas(etapas, ctx)
+    al_dia = {
+        n for n, e in etapas.items()
+        if not forzar and huellas[n] in cache.indice
+        and all(os.path.exists(os.path.join(ctx['salida'], s)) for s in e.salidas)
+    }
+    # Una etapa desactualizada obliga a ejecutar todas las que dependen de ella
+    for nombre in etapas:
+        if any(d not in al_dia for d in _cierre(etapas, [nombre]) - {nombre}):
+            al_dia.discard(nombre)
+
+    resultados, estados = {}, {}
+    candado = threading.Lock()
+
+    def resultado(nombre):
+        with candado:
+            if nombre not in resultados:
+                resultados[nombre] = cache.cargar(huellas[nombre])
+            return resultados[nombre]
+
+    def correr(nombre):
+        etapa = etapas[nombre]
+        inicio = time.perf_counter()
+        entradas = {d: resultado(d) for d in etapa.dependencias} if etapa.usa_resultados else {}
+        if perfilador is None:
+            valor = etapa.funcion(ctx, **entradas)
+        else:
+            with perfilador.medir('etapa', etapa=nombre):
+                valor = etapa.funcion(ctx, **entradas)
+        with candado:
+            resultados[nombre] = valor
+            cache.guardar(huellas[nombre], nombre, valor)
+        return time.perf_counter() - inicio
+
+    for nombre in al_dia:
+        estados[nombre] = {'estado': 'al día', 'segundos': 0.0}
+    pendientes = {n for n in etapas if n not in al_dia}
+    en_curso = {}
+    with ThreadPoolExecutor(max_workers=max(1, ctx['n_jobs'])) as pool:
+        while pendientes or en_curso:
+            listas = [n for n in pendientes if all(d in estados and estados[d]['estado'] != 'error'
+                                                  for d in etapas[n].dependencias)]
+            bloqueadas = [n for n in pendientes if any(estados.get(d, {}).get('estado') == 'error'
+                                                       for d in etapas[n].dependencias)]
+            for n in bloqueadas:
+                pendientes.discard(n)
+                estados[n] = {'estado': 'error', 'segundos': 0.0}
+            for n in listas:
+                pendientes.discard(n)
+                en_curso[pool.submit(correr, n)] = n
+            if not en_curso:
+                continue
+            hechos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in hechos:
+                n = en_curso.pop(futuro)
+                try:
+                    estados[n] = {'estado': 'ejecutada', 'segundos': futuro.result()}
+                    if verbose:
+                        print(f"✅ {n} ({estados[n]['segundos']:.2f} s)")
+                except Exception as e:
+                    estados[n] = {'estado': 'error', 'segundos': 0.0}
+                    print(f"⚠️ Error en la etapa '{n}': {e}")
+    cache.cerrar()
+
+    resumen = pd.DataFrame.from_dict(estados, orient='index').reindex(list(etapas))
+    resumen.index.name = 'etapa'
+    if verbose:
+        conteo = resumen['estado'].value_counts().to_dict()
+        print(f"🔧 Pipeline terminado: {conteo}")
+    return resumen
+
+
+def _argumentos(argv=None):
+    raiz = os.path.dirname(DIRECTORIO_CODIGO)
+    parser = argparse.ArgumentParser(description="Pipeline VAR: preprocesamiento, ajuste, diagnóstico, IRF/FEVD/GIRF y figuras.")
+    parser.add_argument('--datos', default=os.path.join(raiz, 'data', 'Preprocessed multi energetic-economic dataset.xlsx'),
+                        help="Libro de Excel con las series (una columna de fechas y columnas numéricas).")
+    parser.add_argument('--columna-fecha', default='fecha', help="Columna con el índice temporal.")
+    parser.add_argument('--salida', default=os.path.join(raiz, 'figures', 'pipeline'), help="Carpeta de resultados.")
+    parser.add_argument('--cache-dir', default=os.path.join(raiz, '.cache', 'pipeline'), help="Caché de artefactos.")
+    parser.add_argument('--rezagos', type=int, nargs='+', default=[2], help="Órdenes p a ajustar.")
+    parser.add_argument('--steps', default='40', help="Horizonte IRF/FEVD (entero o 'auto').")
+    parser.add_argument('--horizontes-girf', type=int, nargs='+', default=[40],
+                        help="Horizontes de la GIRF (con --steps auto se usa el horizonte seleccionado).")
+    parser.add_argument('--lags-ljung', type=int, nargs='+', default=[10], help="Rezagos de Ljung-Box.")
+    parser.add_argument('--alpha', type=float, default=0.05, help="Nivel de significancia.")
+    parser.add_argument('--umbral-corr', type=float, default=0.90, help="Umbral de multicolinealidad.")
+    parser.add_argument('--proporcion-train', type=float, default=0.8, help="Fracción de entrenamiento.")
+    parser.add_argument('--n-jobs', type=int, default=os.cpu_count() or 1, help="Etapas (y procesos) simultáneos.")
+    parser.add_argument('--dpi', type=int, default=100, help="Resolución de las figuras (300 para publicación).")
+    parser.add_argument('--escala-figuras', type=float, default=1.0,
+                        help="Factor sobre el tamaño de las figuras (p. ej. 0.5 para revisión rápida).")
+    parser.add_argument('--etapas', nargs='+', default=None, help="Ejecutar solo estas etapas (y sus dependencias).")
+    parser.add_argument('--forzar', action='store_true', help="Ignorar la caché y ejecutar todo.")
+    parser.add_argument('--listar', action='store_true', help="Mostrar el DAG y salir.")
+    parser.add_argument('--perfil', default=None, help="Guardar tiempos por etapa en este JSON.")
+    parser.add_argument('--perfil-memoria', action='store_true',
+                        help="Con --perfil, medir también el pico de memoria (tracemalloc); ejecuta en serie.")
+    args = parser.parse_args(argv)
+    if args.perfil_memoria and not args.perfil:
+        parser.error("--perfil-memoria requiere --perfil")
+    return args
+
+
+def main(argv=None):
+    args = _argumentos(argv)
+    ctx = {
+        'datos': args.datos, 'columna_fecha': args.columna_fecha, 'salida': args.salida, 'cache_dir': args.cache_dir,
+        'rezagos': args.rezagos, 'steps': None if args.steps == 'auto' else int(args.steps),
+        'horizontes_girf': args.horizontes_girf, 'lags_ljung': args.lags_ljung, 'alpha': args.alpha,
+        'umbral_corr': args.umbral_corr, 'proporcion_train': args.proporcion_train, 'n_jobs': args.n_jobs,
+        'dpi': args.dpi, 'escala_figuras': args.escala_figuras,
+    }
+    if args.listar:
+        for etapa in construir_etapas(ctx).values():
+            print(f"{etapa.nombre}: {', '.join(etapa.dependencias) or '-'}")
+        return 0
+    if args.perfil_memoria and ctx['n_jobs'] != 1:
+        # El pico de tracemalloc es global al proceso: solo es atribuible con una etapa a la vez
+        print("ℹ️ --perfil-memoria: se ejecuta con --n-jobs 1.")
+        ctx['n_jobs'] = 1
+    perfilador = None
+    if args.perfil:
+        perfilador = Perfilador(memoria=args.perfil_memoria, metadatos={'argumentos': vars(args)})
+    resumen = ejecutar_pipeline(ctx, objetivos=args.etapas, forzar=args.forzar, perfilador=perfilador)
+    if perfilador is not None:
+        perfilador.guardar(args.perfil)
+    return int((resumen['estado'] == 'error').any())
+
+
+if __name__ == '__main__':
+    sys.exit(main())
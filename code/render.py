@@ -0,0 +1,274 @@
+# Renderizado de figuras IRF/GIRF/FEVD sin pantalla (Agg), en paralelo y solo cuando cambian los datos
+import glob
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+VERSION_RENDER = 1
+REGISTRO = '.render_cache.json'
+
+
+def nueva_figura(figsize, figura=None):
+    """
+    Crea la figura con `figura` (p. ej. plt.figure en el notebook) o, por defecto, con
+    matplotlib.figure.Figure, que no pasa por pyplot ni requiere backend interactivo.
+    """
+    if figura is None:
+        from matplotlib.figure import Figure
+        return Figure(figsize=figsize)
+    return figura(figsize=figsize)
+
+
+def nombres_desde_columnas_girf(columnas):
+    """
+    Recupera los nombres de las variables de las columnas 'X_to_Y' que escribe GIRF().
+
+    La primera columna es '{n0}_to_{n0}' y las primeras nvars columnas son '{n_j}_to_{n0}'.
+    """
+    num_vars = int(round(np.sqrt(len(columnas))))
+    primera = columnas[0]
+    n0 = primera[:(len(primera) - len('_to_')) // 2]
+    return [c[:-len(f'_to_{n0}')] for c in columnas[:num_vars]]
+
+
+def _cuadricula(fig, num_vars, x):
+    """
+    Cuadrícula num_vars × num_vars con el mismo eje x en todos los paneles.
+
+    En lugar de sharex=True se fijan los límites y se ocultan las etiquetas x de las filas
+    internas (mismo aspecto): con n² ejes compartidos, matplotlib recalcula los límites del
+    grupo completo al consultar cada panel, lo que vuelve cuadrático el dibujo de la figura.
+    """
+    axes = fig.subplots(num_vars, num_vars, squeeze=False)
+    if len(x) > 1:
+        for ax in axes.ravel():
+            ax.set_xlim(x[0], x[-1])
+    for ax in axes[:-1].ravel():
+        ax.tick_params(labelbottom=False)
+    return axes
+
+
+def figura_girf(girf, nombres, h, figsize=(24, 24), figura=None):
+    """
+    Cuadrícula nvars × nvars de respuestas (fila) a impulsos (columna), como en GIRF().
+
+    Parámetros:
+        girf (np.ndarray): Forma (h+1, respuesta, impulso).
+        nombres (list): Nombres de las variables.
+        h (int): Horizonte (para el título).
+        figsize (tuple): Tamaño de la figura.
+        figura (callable or None): Constructor de figura (plt.figure para mostrar en el notebook).
+    """
+    num_vars = len(nombres)
+    fig = nueva_figura(figsize, figura)
+    axes = _cuadricula(fig, num_vars, np.arange(len(girf)))
+    for i, resp in enumerate(nombres):
+        for j, imp in enumerate(nombres):
+            ax = axes[i, j]
+            ax.plot(girf[:, i, j])
+            ax.axhline(0, color='gray', linestyle='--', linewidth=0.5)
+            ax.set_title(f'{imp} → {resp}', fontsize=8)
+    fig.suptitle(f"Generalized Impulse Response Functions (GIRFs) - Horizonte {h}", fontsize=16, y=1.02)
+    fig.tight_layout()
+    return fig
+
+
+def figura_irf(irf_df, figsize=None, figura=None):
+    """
+    Cuadrícula de IRF desde el CSV de graficar_IRF() (columnas 'respuesta_resp_to_impulso').
+    """
+    columnas = list(irf_df.columns)
+    num_vars = int(round(np.sqrt(len(columnas))))
+    valores = irf_df.values.reshape(len(irf_df), num_vars, num_vars)
+    fig = nueva_figura(figsize or (24, num_vars * 2.5), figura)
+    axes = _cuadricula(fig, num_vars, irf_df.index)
+    for n, col in enumerate(columnas):
+        ax = axes[n // num_vars, n % num_vars]
+        ax.plot(irf_df.index, valores[:, n // num_vars, n % num_vars])
+        ax.axhline(0, color='gray', linestyle='--', linewidth=0.5)
+        ax.set_title(col.replace('_resp_to_', ' resp to '), fontsize=8)
+        ax.tick_params(axis='x', rotation=45)
+    fig.suptitle(f"Impulse Response Functions (IRFs) - Horizonte {len(irf_df) - 1}", fontsize=16, y=1.02)
+    fig.tight_layout()
+    return fig
+
+
+def figura_fevd(fevd_df, nombres_personalizados=None, figura=None):
+    """
+    Barras apiladas de la FEVD por variable afectada, como en graficar_FEVD_desde_df().
+    """
+    from matplotlib import cm
+
+    if nombres_personalizados is None:
+        nombres_personalizados = {}
+
+    variables = sorted(set(col.split('_caused_by_')[0] for col in fevd_df.columns))
+    causas = sorted(set(col.split('_caused_by_')[1] for col in fevd_df.columns))
+    colores = cm.tab10(np.linspace(0, 1, len(causas)))
+
+    fig = nueva_figura((14, 3 * len(variables)), figura)
+    axs = fig.subplots(len(variables), 1, sharex=True, squeeze=False)[:, 0]
+
+    for i, var in enumerate(variables):
+        ax = axs[i]
+        bottom = np.zeros(fevd_df.shape[0])
+        for j, causa in enumerate(causas):
+            col = f"{var}_caused_by_{causa}"
+            label = nombres_personalizados.get(causa, causa)
+            contribucion = fevd_df[col].values
+            ax.bar(fevd_df.index, contribucion, bottom=bottom, label=label, color=colores[j])
+            bottom += contribucion
+
+        ax.set_title(nombres_personalizados.get(var, var))
+        ax.set_ylabel("Contribución acumulada")
+        ax.set_ylim(0, 1.05)
+
+    axs[-1].set_xlabel("Step")
+    handles, labels = axs[0].get_legend_handles_labels()
+    fig.legend(handles, labels, loc='upper center', bbox_to_anchor=(0.5, 1.02), ncol=min(4, len(causas)))
+    fig.suptitle("FEVD: Participación acumulada por variable causante", fontsize=14)
+    fig.tight_layout(rect=[0, 0, 1, 0.95])
+    return fig
+
+
+def _construir_figura(trabajo):
+    tipo, parametros = trabajo['tipo'], trabajo.get('parametros', {})
+    if tipo == 'girf':
+        df = pd.read_csv(trabajo['csv'])
+        nombres = nombres_desde_columnas_girf(list(df.columns))
+        girf = df.values.reshape(len(df), len(nombres), len(nombres))
+        return figura_girf(girf, nombres, len(df) - 1, **parametros)
+    if tipo == 'irf':
+        return figura_irf(pd.read_csv(trabajo['csv'], index_col='Step'), **parametros)
+    if tipo == 'fevd':
+        return figura_fevd(pd.read_csv(trabajo['csv'], index_col='Step'), **parametros)
+    raise ValueError(f"Tipo de figura '{tipo}' no válido. Usa 'girf', 'irf' o 'fevd'.")
+
+
+def _renderizar(trabajo):
+    """
+    Construye y guarda una figura (se ejecuta en el worker, siempre con lienzo Agg).
+    """
+    fig = _construir_figura(trabajo)
+    escala = trabajo.get('escala', 1.0)
+    if escala != 1.0:
+        fig.set_size_inches(fig.get_size_inches() * escala)
+    fig.savefig(trabajo['salida'], dpi=trabajo.get('dpi', 300), bbox_inches='tight')
+    return trabajo['salida']
+
+
+def _inicializar_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _huella(trabajo):
+    """
+    SHA-256 del CSV de origen y de los parámetros de la figura.
+    """
+    h = hashlib.sha256()
+    with open(trabajo['csv'], 'rb') as f:
+        h.update(f.read())
+    configuracion = {k: v for k, v in trabajo.items() if k not in ('csv', 'salida')}
+    h.update(json.dumps({'version': VERSION_RENDER, **configuracion}, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def trabajos_desde_carpeta(carpeta='figures', formato='png', dpi=300, escala=1.0):
+    """
+    Arma la lista de trabajos para todos los CSV de IRF, GIRF y FEVD/GFEVD de una carpeta.
+
+    El tiempo de renderizado crece con el número de píxeles: las cuadrículas GIRF/IRF miden
+    24 pulgadas de ancho, así que `dpi` y `escala` (factor sobre el tamaño de la figura, sin
+    cambiar el tamaño de letra) son las perillas para figuras de revisión rápidas.
+
+    Retorna:
+        list of dict: {'tipo', 'csv', 'salida', 'dpi', 'escala'} por figura.
+    """
+    trabajos = []
+    for csv in sorted(glob.glob(os.path.join(carpeta, '*.csv'))):
+        base = os.path.splitext(os.path.basename(csv))[0]
+        if re.match(r'GIRF_h\d+$', base):
+            tipo = 'girf'
+        elif base.startswith('IRF_'):
+            tipo = 'irf'
+        elif base.startswith(('FEVD_', 'GFEVD_')):
+            tipo = 'fevd'
+        else:
+            continue
+        trabajos.append({'tipo': tipo, 'csv': csv, 'salida': os.path.join(carpeta, f'{base}.{formato}'),
+                         'dpi': dpi, 'escala': escala})
+    return trabajos
+
+
+def renderizar_figuras(trabajos, n_jobs=None, forzar=False, registro=None, verbose=True):
+    """
+    Renderiza figuras desde sus CSV en un pool de procesos con backend Agg, omitiendo las que
+    no cambiaron desde la última ejecución.
+
+    Cada trabajo se identifica por el hash del CSV y de sus parámetros; los hashes se guardan
+    en un registro JSON (por defecto '.render_cache.json' en la carpeta de salida). Una figura
+    se vuelve a generar solo si su hash cambió o si el archivo de salida ya no existe.
+
+    Parámetros:
+        trabajos (list of dict): Cada uno con 'tipo' ('girf', 'irf' o 'fevd'), 'csv' y 'salida';
+                                 opcionalmente 'dpi', 'escala' y 'parametros' (kwargs de figura_*).
+        n_jobs (int or None): Número de procesos (nunca más que os.cpu_count()). Si None usa
+                              os.cpu_count(); si 1, en serie.
+        forzar (bool): Si True, renderiza todo aunque no haya cambios.
+        registro (str or None): Ruta del registro de hashes.
+        verbose (bool): Si True, imprime un resumen.
+
+    Retorna:
+        pd.DataFrame: Por salida, el estado ('renderizada' o 'sin cambios').
+    """
+    if not trabajos:
+        return pd.DataFrame(columns=['salida', 'estado'])
+    if registro is None:
+        registro = os.path.join(os.path.dirname(trabajos[0]['salida']) or '.', REGISTRO)
+
+    hashes = {}
+    if os.path.exists(registro):
+        with open(registro, 'r') as f:
+            hashes = json.load(f)
+
+    pendientes, estados = [], {}
+    for trabajo in trabajos:
+        huella = _huella(trabajo)
+        if not forzar and hashes.get(trabajo['salida']) == huella and os.path.exists(trabajo['salida']):
+            estados[trabajo['salida']] = 'sin cambios'
+        else:
+            pendientes.append((trabajo, huella))
+
+    if pendientes:
+        for trabajo, _ in pendientes:
+            os.makedirs(os.path.dirname(trabajo['salida']) or '.', exist_ok=True)
+        # Renderizar es CPU puro: más procesos que núcleos solo agrega arranque y memoria
+        nucleos = os.cpu_count() or 1
+        n_jobs = max(1, min(n_jobs or nucleos, nucleos, len(pendientes)))
+        if n_jobs == 1:
+            for trabajo, _ in pendientes:
+                _renderizar(trabajo)
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_inicializar_worker) as pool:
+                list(pool.map(_renderizar, [t for t, _ in pendientes]))
+
+        for trabajo, huella in pendientes:
+            hashes[trabajo['salida']] = huella
+            estados[trabajo['salida']] = 'renderizada'
+        ruta_tmp = f"{registro}.tmp"
+        with open(ruta_tmp, 'w') as f:
+            json.dump(hashes, f, indent=2, sort_keys=True)
+        os.replace(ruta_tmp, registro)
+
+    salidas = [t['salida'] for t in trabajos]
+    resumen = pd.DataFrame({'salida': salidas, 'estado': [estados[s] for s in salidas]})
+    if verbose:
+        n = (resumen['estado'] == 'renderizada').sum()
+        print(f"✅ Figuras renderizadas: {n}; sin cambios: {len(resumen) - n}")
+    return resumen
@@ -0,0 +1,265 @@
+# Simulación estocástica de trayectorias VAR (forma companion) y gráficos de abanico por cuantiles
+import numpy as np
+import pandas as pd
+
+from girf import matriz_companion
+from render import nueva_figura
+
+CUANTILES = (0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95)
+# Con exacto=None, arreglos de trayectorias mayores que esto se resumen por histograma
+LIMITE_EXACTO_BYTES = 256 * 2**20
+# Memoria de trabajo por bloque (float64) cuando el modo por histograma elige el tamaño de bloque
+BYTES_POR_BLOQUE = 32 * 2**20
+
+
+def _simular_bloque(rng, companion, intercept, P, estado_inicial, steps, n):
+    """
+    Propaga n trayectorias a la vez: s_t = c̃ + F s_{t-1} + ũ_t, con ũ_t = (P z_t, 0, ..., 0).
+
+    Retorna:
+        np.ndarray: Forma (n, steps, nvars) en la escala transformada del VAR.
+    """
+    num_vars = P.shape[0]
+    F_sup = companion[:num_vars]  # solo las primeras nvars filas tienen dinámica
+    estado = np.broadcast_to(estado_inicial, (n, estado_inicial.shape[-1])).copy()
+    innovaciones = rng.standard_normal((n, steps, num_vars)) @ P.T
+
+    trayectorias = np.empty((n, steps, num_vars))
+    for h in range(steps):
+        nuevo = intercept + estado @ F_sup.T + innovaciones[:, h]
+        trayectorias[:, h] = nuevo
+        estado[:, num_vars:] = estado[:, :-num_vars]
+        estado[:, :num_vars] = nuevo
+    return trayectorias
+
+
+class _Histograma:
+    """
+    Histograma de ancho fijo por (horizonte, variable) acumulado bloque a bloque.
+
+    El rango inicial de cada celda sale del primer bloque, ampliado un 10 % por lado. Cuando un
+    bloque posterior cae fuera de él, la celda se re-agrupa: el ancho de clase se multiplica por
+    2^k y el nuevo borde inferior coincide con un borde anterior, de modo que cada clase vieja
+    cae entera en una nueva y los conteos se suman sin error. Así ninguna observación queda en
+    una clase abierta, aun con colas pesadas.
+    """
+
+    def __init__(self, bloque, bins):
+        self.forma = bloque.shape[1:]
+        datos = bloque.reshape(len(bloque), -1)
+        self.bins = bins
+        self.minimo, self.maximo = datos.min(axis=0), datos.max(axis=0)
+        margen = np.maximum(0.1 * (self.maximo - self.minimo), 1e-12 * (1 + np.abs(self.maximo)))
+        self.lo = self.minimo - margen
+        self.ancho = (self.maximo + margen - self.lo) / bins
+        self.conteos = np.zeros((datos.shape[1], bins), dtype=np.int64)
+        self.agregar(bloque)
+
+    def _ampliar(self, c):
+        """
+        Re-agrupa la celda c para que su rango cubra [minimo[c], maximo[c]].
+        """
+        lo, ancho = self.lo[c], self.ancho[c]
+        # El nuevo borde inferior es lo - m·ancho; debe cubrir el mínimo y, arriba, el rango viejo y el máximo
+        m_min = max(0, int(np.ceil((lo - self.minimo[c]) / ancho)))
+        arriba = max(self.bins, int(np.ceil((self.maximo[c] - lo) / ancho)))
+        factor = 2
+        while self.bins * factor < m_min + arriba:
+            factor *= 2
+        # Entre los bordes válidos, centrar el rango en [minimo, maximo] para no acumular holgura en un lado
+        m_max = self.bins * factor - arriba
+        centro = (self.minimo[c] + self.maximo[c]) / 2
+        m_centrado = int(np.round((lo - centro) / ancho + self.bins * factor / 2))
+        m = min(max(m_centrado, m_min), m_max)
+        destino = (np.arange(self.bins) + m) // factor
+        self.conteos[c] = np.bincount(destino, weights=self.conteos[c], minlength=self.bins).astype(np.int64)
+        self.lo[c] = lo - m * ancho
+        self.ancho[c] = ancho * factor
+
+    def agregar(self, bloque):
+        datos = bloque.reshape(len(bloque), -1)
+        self.minimo = np.minimum(self.minimo, datos.min(axis=0))
+        self.maximo = np.maximum(self.maximo, datos.max(axis=0))
+        for c in np.flatnonzero((self.minimo < self.lo) | (self.maximo > self.lo + self.bins * self.ancho)):
+            self._ampliar(c)
+
+        clases = np.floor((datos - self.lo) / self.ancho).astype(np.int64)
+        np.clip(clases, 0, self.bins - 1, out=clases)  # redondeo en los bordes
+        clases += np.arange(self.lo.size) * self.bins
+        self.conteos += np.bincount(clases.ravel(), minlength=self.conteos.size).reshape(self.conteos.shape)
+
+    def cuantiles(self, cuantiles):
+        """
+        Cuantiles por interpolación lineal dentro de la clase, forma (len(cuantiles), steps, nvars).
+
+        Los bordes se recortan al mínimo y máximo observados, que acotan la masa de las clases extremas.
+        """
+        bordes = self.lo[:, None] + self.ancho[:, None] * np.arange(self.bins + 1)
+        bordes = np.clip(bordes, self.minimo[:, None], self.maximo[:, None])
+        acumulado = np.concatenate([np.zeros((self.lo.size, 1)), np.cumsum(self.conteos, axis=-1)], axis=-1)
+        objetivo = np.asarray(cuantiles, dtype=float)[:, None] * acumulado[:, -1]
+
+        superior = np.clip((acumulado[None] < objetivo[..., None]).sum(axis=-1), 1, self.bins)[..., None]
+        acumulado = np.broadcast_to(acumulado, objetivo.shape + acumulado.shape[-1:])
+        bordes = np.broadcast_to(bordes, acumulado.shape)
+        a0, a1 = (np.take_along_axis(acumulado, i, axis=-1)[..., 0] for i in (superior - 1, superior))
+        b0, b1 = (np.take_along_axis(bordes, i, axis=-1)[..., 0] for i in (superior - 1, superior))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fraccion = np.where(a1 > a0, (objetivo - a0) / (a1 - a0), 0.0)
+        return (b0 + fraccion * (b1 - b0)).reshape((len(objetivo),) + self.forma)
+
+
+def simular_trayectorias(modelo_fitted, historia, steps, n_trayectorias=10000, semilla=None,
+                         tamano_bloque=None, pipeline=None, ultimo_nivel=None, niveles_previos=None,
+                         cuantiles=CUANTILES, guardar_trayectorias=False, dtype=np.float32,
+                         exacto=None, bins=2000):
+    """
+    Simula N trayectorias futuras del VAR con innovaciones N(0, Σ_u) propagadas por la matriz
+    companion para todas las trayectorias a la vez, revierte las transformaciones y resume el
+    abanico de cuantiles por horizonte y variable.
+
+    En modo por bloques (`tamano_bloque`), las innovaciones, el estado companion y la reversión
+    a niveles se calculan por grupos de trayectorias, con memoria de trabajo proporcional al
+    bloque. Cada bloque usa una semilla derivada de np.random.SeedSequence(semilla).
+
+    Con exacto=True los cuantiles son exactos, pero requieren conservar el arreglo completo
+    (N × steps × nvars, en `dtype`); si no se guardan las trayectorias, np.quantile lo
+    particiona en el lugar sin copiarlo. Con exacto=False cada bloque se acumula en un
+    histograma de `bins` clases por (horizonte, variable) que se amplía cuando aparecen valores
+    fuera de su rango; la memoria es O(steps × nvars × bins), independiente de N, y el error de
+    los cuantiles es a lo sumo el ancho de una clase (unas pocas veces rango observado / bins). Por
+    defecto (exacto=None) se usa el modo exacto solo si el arreglo completo ocupa hasta
+    LIMITE_EXACTO_BYTES o si se piden las trayectorias; si no, el histograma con bloques de
+    unos BYTES_POR_BLOQUE.
+
+    Parámetros:
+        modelo_fitted (VARResults o VARLigero): Modelo VAR ajustado.
+        historia (pd.DataFrame or np.ndarray): Observaciones transformadas hasta el origen (se usan las últimas p).
+        steps (int): Horizonte de simulación.
+        n_trayectorias (int): Número de trayectorias.
+        semilla (int or None): Semilla para reproducibilidad (para un mismo tamano_bloque).
+        tamano_bloque (int or None): Trayectorias por bloque. Si None, todas en un solo bloque en modo
+                                     exacto, o bloques de unos BYTES_POR_BLOQUE con histograma.
+        pipeline (PipelineTransformacion or None): Si se indica, las trayectorias se llevan a niveles.
+        ultimo_nivel (np.ndarray or None): Último nivel observado en el origen (requerido con pipeline).
+        niveles_previos (np.ndarray or None): Últimos niveles si hay diferencias de orden > 1.
+        cuantiles (tuple): Cuantiles del abanico.
+        guardar_trayectorias (bool): Si True, incluye las trayectorias completas en el resultado.
+        dtype: Tipo del arreglo de trayectorias conservado (float32 reduce la memoria a la mitad).
+        exacto (bool or None): Si False, cuantiles aproximados por histograma sin conservar las trayectorias.
+                               None elige según el tamaño de N × steps × nvars.
+        bins (int): Clases del histograma por (horizonte, variable) cuando exacto=False.
+
+    Retorna:
+        dict: 'cuantiles' (len(cuantiles), steps, nvars), 'media' (steps, nvars), 'niveles_cuantiles'
+              (tupla de cuantiles), 'nombres' y, si se pide, 'trayectorias' (N, steps, nvars).
+    """
+    coefs = np.asarray(modelo_fitted.coefs, dtype=float)
+    p, num_vars = coefs.shape[0], coefs.shape[-1]
+    intercept = np.asarray(modelo_fitted.intercept, dtype=float)
+    P = np.linalg.cholesky(np.asarray(modelo_fitted.sigma_u, dtype=float))
+    companion = matriz_companion(coefs)
+
+    historia = np.asarray(historia, dtype=float)
+    estado_inicial = historia[len(historia) - p:][::-1].ravel()  # [y_T, y_{T-1}, ..., y_{T-p+1}]
+    if pipeline is not None and ultimo_nivel is None:
+        raise ValueError("Se requiere `ultimo_nivel` para revertir las transformaciones con pipeline.")
+    if exacto is None:
+        tamano_completo = n_trayectorias * steps * num_vars * np.dtype(dtype).itemsize
+        exacto = guardar_trayectorias or tamano_completo <= LIMITE_EXACTO_BYTES
+    if guardar_trayectorias and not exacto:
+        raise ValueError("guardar_trayectorias requiere exacto=True.")
+
+    if tamano_bloque is None:
+        tamano_bloque = n_trayectorias if exacto else max(1, BYTES_POR_BLOQUE // (8 * steps * num_vars))
+    tamanos = [min(tamano_bloque, n_trayectorias - i) for i in range(0, n_trayectorias, tamano_bloque)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+
+    trayectorias = np.empty((n_trayectorias, steps, num_vars), dtype=dtype) if exacto else None
+    histograma = None
+    suma = np.zeros((steps, num_vars))
+    inicio = 0
+    for semilla_bloque, n in zip(semillas, tamanos):
+        bloque = _simular_bloque(np.random.default_rng(semilla_bloque), companion, intercept, P,
+                                 estado_inicial, steps, n)
+        if pipeline is not None:
+            bloque = pipeline.invertir(bloque, ultimo_nivel, niveles_previos)
+        suma += bloque.sum(axis=0)
+        if exacto:
+            trayectorias[inicio:inicio + n] = bloque
+        elif histograma is None:
+            histograma = _Histograma(bloque, bins)
+        else:
+            histograma.agregar(bloque)
+        inicio += n
+
+    if exacto:
+        niveles = np.quantile(trayectorias, cuantiles, axis=0, overwrite_input=not guardar_trayectorias)
+    else:
+        niveles = histograma.cuantiles(cuantiles)
+    resultado = {
+        'cuantiles': niveles,
+        'media': suma / n_trayectorias,
+        'niveles_cuantiles': tuple(cuantiles),
+        'nombres': list(modelo_fitted.names),
+    }
+    if guardar_trayectorias:
+        resultado['trayectorias'] = trayectorias
+    return resultado
+
+
+def abanico_a_dataframe(resultado, indice=None):
+    """
+    Convierte el abanico de simular_trayectorias() en un DataFrame con columnas (variable, estadístico).
+
+    Parámetros:
+        resultado (dict): Salida de simular_trayectorias().
+        indice (pd.Index or None): Fechas de pronóstico. Si None, usa 'Step' = 1..steps.
+    """
+    nombres = resultado['nombres']
+    partes = {f"q{q:g}": resultado['cuantiles'][n] for n, q in enumerate(resultado['niveles_cuantiles'])}
+    partes['media'] = resultado['media']
+
+    marcos = {nombre: pd.DataFrame(valores, columns=nombres) for nombre, valores in partes.items()}
+    df = pd.concat(marcos, axis=1).swaplevel(axis=1)[nombres]
+    if indice is None:
+        df.index = pd.RangeIndex(1, len(df) + 1, name='Step')
+    else:
+        df.index = indice
+    return df
+
+
+def figura_abanico(resultado, variable, historia=None, indice=None, figsize=(10, 4), figura=None):
+    """
+    Gráfico de abanico de una variable: bandas entre cuantiles simétricos y mediana.
+
+    Parámetros:
+        resultado (dict): Salida de simular_trayectorias() (idealmente con cuantiles simétricos).
+        variable (str): Nombre de la variable a graficar.
+        historia (pd.Series or None): Observaciones previas para dar contexto.
+        indice (pd.Index or None): Fechas de pronóstico (deben seguir a las de `historia`).
+        figsize (tuple): Tamaño de la figura.
+        figura (callable or None): Constructor de figura (plt.figure para mostrar en el notebook).
+    """
+    j = resultado['nombres'].index(variable)
+    niveles = np.asarray(resultado['niveles_cuantiles'])
+    valores = resultado['cuantiles'][:, :, j]
+    x = np.arange(1, valores.shape[1] + 1) if indice is None else indice
+
+    fig = nueva_figura(figsize, figura)
+    ax = fig.subplots()
+    if historia is not None:
+        ax.plot(historia.index if indice is not None else np.arange(1 - len(historia), 1), historia.values,
+                color='black', linewidth=1, label='Observado')
+
+    pares = [(n, len(niveles) - 1 - n) for n in range(len(niveles) // 2)]
+    for alfa, (inf, sup) in zip(np.linspace(0.15, 0.45, len(pares)), pares):
+        ax.fill_between(x, valores[inf], valores[sup], color='tab:blue', alpha=alfa, linewidth=0,
+                        label=f"{niveles[inf]:.0%}–{niveles[sup]:.0%}")
+    centro = np.argmin(np.abs(niveles - 0.5))
+    ax.plot(x, valores[centro], color='tab:blue', linewidth=1.5, label='Mediana')
+
+    ax.set_title(f"Abanico de pronóstico - {variable}")
+    ax.legend(loc='upper left', fontsize=8)
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,174 @@
+# Pipeline de transformaciones (log → diferencia → estandarización) con inversa vectorizada
+import numpy as np
+import pandas as pd
+
+
+class PipelineTransformacion:
+    """
+    Registra, por columna, las transformaciones aplicadas a las series antes del VAR y las
+    aplica hacia adelante o en reversa sobre arreglos NumPy completos.
+
+    El orden hacia adelante es: log (columnas en `log_cols`) → primera diferencia (columnas en
+    `diff_cols`) → estandarización (media/escala de un StandardScaler). La inversa acepta
+    pronósticos de forma (..., steps, nvars), por lo que sirve tanto para un pronóstico puntual
+    (steps, nvars) como para simulaciones (n_paths, steps, nvars).
+
+    Se llena con candidatos_para_log(..., pipeline=), preprocesar_series_para_VAR(..., pipeline=)
+    y estandarizar_train_test(..., pipeline=).
+    """
+
+    def __init__(self, columnas=None):
+        self.columnas = list(columnas) if columnas is not None else None
+        self.log_cols = []
+        self.diff_cols = []
+        self.ordenes_diff = {}
+        self.media = None
+        self.escala = None
+
+    def __repr__(self):
+        return (f"PipelineTransformacion(nvars={len(self.columnas or [])}, log={len(self.log_cols)}, "
+                f"diff={len(self.diff_cols)}, escala={'sí' if self.media is not None else 'no'})")
+
+    # === Registro de pasos ===
+    def registrar_columnas(self, columnas):
+        if self.columnas is None:
+            self.columnas = list(columnas)
+        elif list(columnas) != self.columnas:
+            raise ValueError("Las columnas no coinciden con las registradas en el pipeline.")
+
+    def registrar_log(self, columnas):
+        self.log_cols = list(columnas)
+
+    def registrar_diferencias(self, columnas, ordenes=None):
+        ordenes = ordenes or {}
+        self.diff_cols = list(columnas)
+        self.ordenes_diff = {c: ordenes.get(c, 1) for c in self.diff_cols}
+
+    def registrar_escala(self, scaler, columnas):
+        self.registrar_columnas(columnas)
+        self.media = np.asarray(scaler.mean_, dtype=float)
+        self.escala = np.asarray(scaler.scale_, dtype=float)
+
+    # === Máscaras por columna ===
+    def _mascara(self, nombres):
+        return np.array([c in nombres for c in self.columnas])
+
+    @property
+    def mascara_log(self):
+        return self._mascara(self.log_cols)
+
+    @property
+    def mascara_diff(self):
+        return self._mascara(self.diff_cols)
+
+    @property
+    def orden_maximo(self):
+        return max(self.ordenes_diff.values(), default=0)
+
+    # === Transformación hacia adelante ===
+    def aplicar_log(self, series):
+        """
+        Aplica log a las columnas registradas de un DataFrame (sin diferenciar ni escalar).
+        """
+        series = series.copy()
+        cols = [c for c in self.log_cols if c in series.columns]
+        if cols:
+            if (series[cols] <= 0).any().any():
+                raise ValueError("Hay columnas con ceros o negativos marcadas para log-transform.")
+            series[cols] = np.log(series[cols])
+        return series
+
+    def transformar(self, series):
+        """
+        Aplica log → diferencia → estandarización a un DataFrame en niveles.
+
+        Retorna un DataFrame con la primera fila eliminada si alguna columna se diferencia.
+        """
+        self.registrar_columnas(series.columns)
+        valores = self.aplicar_log(series)[self.columnas].values.astype(float)
+        d_max = self.orden_maximo
+        for orden in set(self.ordenes_diff.values()):
+            cols = self._mascara([c for c, d in self.ordenes_diff.items() if d == orden])
+            valores[orden:, cols] = np.diff(valores[:, cols], n=orden, axis=0)
+        valores, indice = valores[d_max:], series.index[d_max:]
+        if self.media is not None:
+            valores = (valores - self.media) / self.escala
+        return pd.DataFrame(valores, index=indice, columns=self.columnas)
+
+    # === Transformación inversa ===
+    def invertir_escala(self, valores):
+        valores = np.asarray(valores, dtype=float)
+        if self.media is None:
+            return valores.copy()
+        return valores * self.escala + self.media
+
+    def a_log(self, niveles):
+        """
+        Aplica log a las columnas registradas de un arreglo en niveles (..., nvars).
+        """
+        log = self.mascara_log
+        return np.where(log, np.log(np.where(log, niveles, 1.0)), niveles)
+
+    def niveles_a_restricciones(self, niveles, ultimo_nivel):
+        """
+        Lleva trayectorias en niveles a la escala del VAR para fijarlas en un pronóstico.
+
+        En las columnas diferenciadas el nivel en h depende de la suma de los valores
+        transformados hasta h, así que se devuelve esa suma, (log y_h - log y_origen - h·media) / escala;
+        en las demás, el valor transformado en h.
+
+        Parámetros:
+            niveles (np.ndarray): Trayectorias en escala original, forma (..., steps, nvars); NaN = libre.
+            ultimo_nivel (np.ndarray): Último nivel observado en el origen, forma (nvars,).
+
+        Retorna:
+            np.ndarray: Misma forma que `niveles`, con NaN donde no hay restricción.
+        """
+        if self.orden_maximo > 1:
+            raise ValueError("Las restricciones en niveles solo admiten diferencias de orden 1.")
+        niveles = np.asarray(niveles, dtype=float)
+        diff = self.mascara_diff
+        media = 0.0 if self.media is None else self.media
+        escala = 1.0 if self.escala is None else self.escala
+        base = self.a_log(np.asarray(ultimo_nivel, dtype=float))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            transformados = self.a_log(niveles)
+        conteo = np.where(diff, np.arange(1, niveles.shape[-2] + 1)[:, None], 1.0)
+        return (transformados - np.where(diff, base, 0.0) - conteo * media) / escala
+
+    def invertir(self, pronostico, ultimo_nivel, niveles_previos=None):
+        """
+        Revierte estandarización, diferenciación y log de un pronóstico para todas las variables.
+
+        Parámetros:
+            pronostico (np.ndarray): Valores transformados, forma (..., steps, nvars).
+            ultimo_nivel (np.ndarray): Último nivel observado (escala original, antes del log) en el
+                                       origen del pronóstico, forma (nvars,) o (..., nvars).
+            niveles_previos (np.ndarray or None): Últimos `orden_maximo` niveles observados en orden
+                                                  cronológico (terminando en el origen), forma (d, nvars).
+                                                  Solo se requiere si alguna columna tiene orden de diferencia > 1.
+
+        Retorna:
+            np.ndarray: Pronóstico en niveles, misma forma que `pronostico`.
+        """
+        niveles = self.invertir_escala(pronostico)
+        base = self.a_log(np.asarray(ultimo_nivel, dtype=float))
+        log, diff = self.mascara_log, self.mascara_diff
+
+        if self.orden_maximo <= 1:
+            niveles[..., diff] = np.cumsum(niveles[..., diff], axis=-2) + base[..., None, diff]
+        else:
+            if niveles_previos is None:
+                raise ValueError("Se requieren `niveles_previos` para revertir diferencias de orden > 1.")
+            historia = self.a_log(np.asarray(niveles_previos, dtype=float))
+            for orden in set(self.ordenes_diff.values()):
+                cols = self._mascara([c for c, d in self.ordenes_diff.items() if d == orden])
+                x = niveles[..., cols]
+                # Integrar orden veces: Δ^{j} y_t = Δ^{j} y_{origen} + Σ Δ^{j+1} y
+                for j in range(orden - 1, -1, -1):
+                    ultimo_j = np.diff(historia[-(j + 1):, cols], n=j, axis=0)[-1]
+                    x = np.cumsum(x, axis=-2) + ultimo_j
+                niveles[..., cols] = x
+
+        niveles[..., log] = np.exp(niveles[..., log])
+        return niveles
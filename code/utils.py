@@ -1,3 +1,6 @@
+from estacionariedad import diferenciar_hasta_estacionariedad
+
+
 def analizar_multicolinealidad_para_VAR(series, umbral_corr=0.95, verbose=True):
     """
     Evalúa la presencia de multicolinealidad en un conjunto de series temporales multivariadas
@@ -17,18 +20,7 @@ def analizar_multicolinealidad_para_VAR(series, umbral_corr=0.95, verbose=True):
                                              cuya correlación absoluta supera el umbral especificado.
           """
     correlaciones = series.corr().abs()
-    correlaciones_altas = []
-
-    for i in range(len(correlaciones.columns)):
-        for j in range(i):
-            coef = correlaciones.iloc[i, j]
-            if coef > umbral_corr:
-                var1 = correlaciones.columns[i]
-                var2 = correlaciones.columns[j]
-                correlaciones_altas.append((var1, var2, coef))
-
-    # Ordenar de mayor a menor
-    correlaciones_altas.sort(key=lambda x: x[2], reverse=True)
+    correlaciones_altas = _pares_correlacion_alta(correlaciones, umbral_corr)
 
     # Imprimir después de ordenar
     if verbose:
@@ -39,17 +31,105 @@ def analizar_multicolinealidad_para_VAR(series, umbral_corr=0.95, verbose=True):
 
     return correlaciones_altas
 
+def _pares_correlacion_alta(correlaciones, umbral_corr):
+    """
+    Extrae los pares (var1, var2, coef) del triángulo inferior de una matriz de correlaciones
+    absolutas cuyo coeficiente supera el umbral, ordenados de mayor a menor.
+    """
+    valores = correlaciones.values
+    filas, columnas = np.tril_indices_from(valores, k=-1)
+    coefs = valores[filas, columnas]
+    seleccion = np.flatnonzero(coefs > umbral_corr)
+    seleccion = seleccion[np.argsort(-coefs[seleccion], kind='stable')]
+
+    nombres = correlaciones.columns
+    return [(nombres[filas[n]], nombres[columnas[n]], coefs[n]) for n in seleccion]
+
+def diagnostico_multicolinealidad(series, umbral_corr=0.95, umbral_vif=10.0, sugerir_eliminacion=True, verbose=True):
+    """
+    Diagnóstico de multicolinealidad para muchos indicadores candidatos en una sola pasada.
+
+    Además de los pares con alta correlación, calcula:
+        - VIF de todas las columnas a la vez: VIF_j = [R⁻¹]_jj, con R la matriz de correlaciones.
+        - Número de condición del diseño estandarizado: sqrt(λ_max / λ_min) de R.
+        - (Opcional) Un conjunto de eliminación voraz: se retira la variable de mayor VIF hasta que
+          todas queden bajo `umbral_vif`. Tras cada retiro, R⁻¹ se actualiza por complemento de
+          Schur en lugar de volver a invertir.
+
+    Parámetros:
+        series (pd.DataFrame): Series candidatas.
+        umbral_corr (float): Umbral de correlación absoluta para reportar pares.
+        umbral_vif (float): Umbral de VIF para la eliminación voraz.
+        sugerir_eliminacion (bool): Si True, calcula el conjunto de variables sugeridas para eliminar.
+        verbose (bool): Si True, imprime el resumen.
+
+    Retorna:
+        dict con:
+            'pares' (list of tuple): Pares (var1, var2, coef) con alta correlación.
+            'vif' (pd.Series): VIF por variable, de mayor a menor.
+            'numero_condicion' (float): Número de condición del diseño estandarizado.
+            'eliminar' (list): Variables sugeridas para eliminar (vacía si sugerir_eliminacion=False).
+    """
+    corr = series.corr()
+    nombres = list(corr.columns)
+    R = corr.values
+    num_vars = len(nombres)
+
+    pares = _pares_correlacion_alta(corr.abs(), umbral_corr)
+
+    # Autovalores de R: número de condición e inversa estable aun con columnas casi colineales
+    autovalores, autovectores = np.linalg.eigh(R)
+    piso = np.finfo(float).eps * num_vars * max(autovalores[-1], 1.0)
+    autovalores_seguros = np.maximum(autovalores, piso)
+    numero_condicion = float(np.sqrt(autovalores[-1] / autovalores_seguros[0]))
+    R_inv = (autovectores / autovalores_seguros) @ autovectores.T
+    vif = pd.Series(np.diag(R_inv), index=nombres).sort_values(ascending=False)
+
+    eliminar = []
+    if sugerir_eliminacion:
+        activos = np.arange(num_vars)
+        inversa = R_inv.copy()
+        while len(activos) > 1:
+            vif_activos = np.diag(inversa)
+            j = int(np.argmax(vif_activos))
+            if vif_activos[j] <= umbral_vif:
+                break
+            eliminar.append(nombres[activos[j]])
+            resto = np.delete(np.arange(len(activos)), j)
+            b = inversa[resto, j]
+            inversa = inversa[np.ix_(resto, resto)] - np.outer(b, b) / inversa[j, j]
+            activos = activos[resto]
+
+    if verbose:
+        for var1, var2, coef in pares:
+            print(f"⚠️ Alta correlación: {var1} y {var2} -> {coef:.3f}")
+        print(f"📐 Número de condición del diseño estandarizado: {numero_condicion:.1f}")
+        altos = vif[vif > umbral_vif]
+        for var, valor in altos.items():
+            print(f"⚠️ VIF alto: {var} -> {valor:.1f}")
+        if eliminar:
+            print(f"🗑️ Eliminación sugerida ({len(eliminar)}): {eliminar}")
+
+    return {'pares': pares, 'vif': vif, 'numero_condicion': numero_condicion, 'eliminar': eliminar}
+
 # Función de procesamiento (diferenciación - estandarización) de las series para el modelo VAR
-def preprocesar_series_para_VAR(series, alpha=0.05, umbral_corr=0.90, verbose=True):
+def preprocesar_series_para_VAR(series, alpha=0.05, umbral_corr=0.90, verbose=True, pipeline=None,
+                                pruebas=('adf',), max_orden_diferencia=1, n_jobs=1, cache_dir=None):
     """
     Verifica estacionariedad, aplica diferenciación si es necesario,
     detecta multicolinealidad y estandariza todas las series.
 
     Parámetros:
         series (pd.DataFrame): Serie multivariada con índice temporal.
-        alpha (float): Nivel de significancia para ADF.
+        alpha (float): Nivel de significancia para ADF/KPSS.
         umbral_corr (float): Umbral para identificar multicolinealidad extrema.
         verbose (bool): Si True, imprime información diagnóstica.
+        pipeline (PipelineTransformacion or None): Si se indica, se aplica antes el log de sus columnas
+                                                   `log_cols` y se registran las columnas diferenciadas.
+        pruebas (tuple): Pruebas de estacionariedad: ('adf',), ('kpss',) o ('adf', 'kpss').
+        max_orden_diferencia (int): Diferenciar iterativamente hasta este orden mientras la serie no sea estacionaria.
+        n_jobs (int or None): Procesos para las pruebas (None = todos los núcleos).
+        cache_dir (str or None): Carpeta para la caché en disco de las pruebas (siempre hay caché en memoria).
 
     Retorna:
         series_scaled (pd.DataFrame): Series transformadas (diferenciadas si es necesario y estandarizadas).
@@ -58,35 +138,40 @@ def preprocesar_series_para_VAR(series, alpha=0.05, umbral_corr=0.90, verbose=Tr
         correlaciones_altas (list of tuple): Pares de variables con alta correlación.
         variables_diferenciadas (list): Lista de variables que fueron diferenciadas.
     """
-    series_var = series.copy()
+    series_var = series.copy() if pipeline is None else pipeline.aplicar_log(series)
     estacionariedad = {}
 
-    # 1. Verificar estacionariedad y diferenciar
-    for col in series_var.columns:
-        resultado = adfuller(series_var[col].dropna(), autolag='AIC')
-        p_valor = resultado[1]
-        es_estacionaria = p_valor < alpha
+    # 1. Verificar estacionariedad (en paralelo y con caché) y diferenciar
+    series_var, ordenes, rondas = diferenciar_hasta_estacionariedad(
+        series_var, max_orden=max_orden_diferencia, pruebas=pruebas, alpha=alpha,
+        n_jobs=n_jobs, cache_dir=cache_dir
+    )
+    for col, fila in rondas[0].iterrows():
+        es_estacionaria = fila['estacionaria']
         estacionariedad[col] = es_estacionaria
         if verbose:
-            print(f"{col}: {'Estacionaria' if es_estacionaria else 'NO estacionaria'} (p-valor = {p_valor:.4f})")
-        if not es_estacionaria:
-            series_var[col] = series_var[col].diff()
+            p_valores = ", ".join(f"{prueba.upper()} p-valor = {fila[f'{prueba}_p_valor']:.4f}" for prueba in pruebas)
+            orden = f", orden de diferencia = {ordenes[col]}" if max_orden_diferencia > 1 and ordenes[col] else ""
+            print(f"{col}: {'Estacionaria' if es_estacionaria else 'NO estacionaria'} ({p_valores}{orden})")
 
-    series_var = series_var.dropna()
     variables_diferenciadas = [col for col, est in estacionariedad.items() if not est]
+    if pipeline is not None:
+        pipeline.registrar_columnas(series_var.columns)
+        pipeline.registrar_diferencias(variables_diferenciadas, ordenes=ordenes)
 
     # 2. Verificar multicolinealidad
     correlaciones_altas = analizar_multicolinealidad_para_VAR(series_var, umbral_corr=umbral_corr, verbose=verbose)
 
     return series_var, estacionariedad, correlaciones_altas, variables_diferenciadas
 
-def estandarizar_train_test(train_df, test_df):
+def estandarizar_train_test(train_df, test_df, pipeline=None):
     """
     Estandariza las variables del conjunto de entrenamiento y aplica la transformación al conjunto de prueba.
 
     Parámetros:
         train_df (pd.DataFrame): Conjunto de entrenamiento (series diferenciadas o originales).
         test_df (pd.DataFrame): Conjunto de prueba (mismo orden y columnas que train_df).
+        pipeline (PipelineTransformacion or None): Si se indica, registra en él la media y escala del scaler.
 
     Retorna:
         train_scaled (pd.DataFrame): Entrenamiento estandarizado.
@@ -106,4 +191,7 @@ def estandarizar_train_test(train_df, test_df):
         index=test_df.index
     )
 
+    if pipeline is not None:
+        pipeline.registrar_escala(scaler, train_df.columns)
+
     return train_scaled, test_scaled, scaler
@@ -0,0 +1,236 @@
+# Estimación OLS incremental de VAR(1..p_max) sobre una matriz de diseño rezagada compartida
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from scipy.linalg import solve_triangular
+
+from girf import coeficientes_ma, matriz_companion
+
+
+def matriz_diseno_rezagada(y, p_max):
+    """
+    Construye la matriz de regresores [1, y_{t-1}, ..., y_{t-p_max}] una sola vez.
+
+    X es una copia materializada (T - p_max) × (1 + nvars·p_max): se llena en una sola
+    asignación desde `sliding_window_view`, sin un arreglo intermedio por rezago. Esa única
+    matriz de orden p_max se comparte entre todos los órdenes: los modelos p < p_max usan sus
+    primeras 1 + nvars·p columnas (X[:, :1 + nvars·p], una vista, sobre la misma muestra).
+
+    Parámetros:
+        y (np.ndarray): Serie multivariada, forma (T, nvars).
+        p_max (int): Orden máximo de rezagos.
+
+    Retorna:
+        Y (np.ndarray): Vista de la variable dependiente, forma (T - p_max, nvars).
+        X (np.ndarray): Regresores, forma (T - p_max, 1 + nvars·p_max).
+    """
+    y = np.asarray(y, dtype=float)
+    T, num_vars = y.shape
+    ventanas = np.lib.stride_tricks.sliding_window_view(y, p_max + 1, axis=0)  # (T-p_max, nvars, p_max+1)
+    rezagos = ventanas[:, :, p_max - 1::-1] if p_max > 0 else ventanas[:, :, :0]  # rezago 1..p_max
+
+    X = np.empty((T - p_max, 1 + num_vars * p_max))
+    X[:, 0] = 1.0
+    X[:, 1:].reshape(T - p_max, p_max, num_vars)[...] = rezagos.transpose(0, 2, 1)
+    return y[p_max:], X
+
+
+class VARLigero:
+    """
+    Resultado compacto de un VAR(p) con la misma interfaz básica que VARResults
+    (names, k_ar, coefs, intercept, params, sigma_u, aic/bic/hqic, forecast, ma_rep, irf, resid,
+    endog, endog_lagged), de modo que puede usarse en los diccionarios {p: modelo} del resto del
+    pipeline.
+
+    `endog` es la serie de la que sale la muestra del ajuste (con sus p valores iniciales): si se
+    da sin Y/X, la matriz de diseño se reconstruye a partir de ella.
+    """
+
+    def __init__(self, params, sigma_u, nobs, names, Y=None, X=None, index=None, endog=None):
+        self.params = params
+        self.names = list(names)
+        self.neqs = len(self.names)
+        self.k_ar = (params.shape[0] - 1) // self.neqs
+        self.intercept = params[0]
+        self.coefs = params[1:].reshape(self.k_ar, self.neqs, self.neqs).transpose(0, 2, 1)
+        self.sigma_u = sigma_u
+        self.nobs = nobs
+        self.df_model = params.shape[0]
+        self.df_resid = nobs - self.df_model
+        if endog is not None:
+            endog = np.asarray(endog, dtype=float)
+            if Y is None:
+                Y, X = matriz_diseno_rezagada(endog, self.k_ar)
+        self.endog = endog
+        self._Y, self._X, self._index = Y, X, index
+
+    @property
+    def sigma_u_mle(self):
+        return self.sigma_u * self.df_resid / self.nobs
+
+    @property
+    def info_criteria(self):
+        # Mismas fórmulas que statsmodels (Lütkepohl pp. 146-150)
+        nobs, neqs = self.nobs, self.neqs
+        free_params = self.k_ar * neqs ** 2 + neqs
+        ld = np.linalg.slogdet(self.sigma_u_mle)[1] if self.df_resid > 0 else -np.inf
+        return {
+            'aic': ld + (2.0 / nobs) * free_params,
+            'bic': ld + (np.log(nobs) / nobs) * free_params,
+            'hqic': ld + (2.0 * np.log(np.log(nobs)) / nobs) * free_params,
+            'fpe': ((nobs + self.df_model) / self.df_resid) ** neqs * np.exp(ld) if self.df_resid > 0 else np.inf,
+        }
+
+    @property
+    def aic(self):
+        return self.info_criteria['aic']
+
+    @property
+    def bic(self):
+        return self.info_criteria['bic']
+
+    @property
+    def hqic(self):
+        return self.info_criteria['hqic']
+
+    @property
+    def fpe(self):
+        return self.info_criteria['fpe']
+
+    @property
+    def endog_lagged(self):
+        """
+        Regresores del ajuste [1, rezago 1, ..., rezago p] (nobs × df_model), como en VARResults.
+        """
+        if self._X is None:
+            raise ValueError("El modelo no conserva la matriz de diseño.")
+        return self._X[:, :self.df_model]
+
+    @property
+    def resid(self):
+        if self._Y is None:
+            raise ValueError("El modelo no conserva la matriz de diseño; no es posible calcular residuos.")
+        residuos = self._Y - self.endog_lagged @ self.params
+        return pd.DataFrame(residuos, columns=self.names, index=self._index)
+
+    def is_stable(self):
+        if self.k_ar == 0:
+            return True
+        return bool(np.all(np.abs(np.linalg.eigvals(matriz_companion(self.coefs))) < 1))
+
+    def forecast(self, y, steps):
+        y = np.asarray(y, dtype=float)
+        historia = list(y[-self.k_ar:]) if self.k_ar else []
+        pronostico = np.empty((steps, self.neqs))
+        for h in range(steps):
+            valor = self.intercept.copy()
+            for i in range(self.k_ar):
+                valor += self.coefs[i] @ historia[-i - 1]
+            pronostico[h] = valor
+            historia.append(valor)
+        return pronostico
+
+    def ma_rep(self, maxn=10):
+        return coeficientes_ma(self.coefs, maxn)
+
+    def irf(self, periods=10):
+        irfs = self.ma_rep(periods)
+        return SimpleNamespace(irfs=irfs, orth_irfs=irfs @ np.linalg.cholesky(self.sigma_u))
+
+
+class VARIncremental:
+    """
+    Ajusta VAR(1..p_max) a partir de una sola factorización de la matriz de diseño máxima.
+
+    Con los regresores ordenados como [1, rezago 1, ..., rezago p_max], el factor triangular R
+    (X = QR, o R = chol(X'X)') del modelo de orden p es el bloque principal R[:m, :m] con
+    m = 1 + nvars·p, y Q'Y de ese modelo son las primeras m filas de Q'Y. Así, cada orden
+    requiere solo una sustitución hacia atrás y RSS_p = Y'Y - (Q'Y)[:m]'(Q'Y)[:m].
+
+    Todos los órdenes se estiman sobre la misma muestra efectiva (T - p_max observaciones),
+    como en la selección de rezagos de statsmodels, por lo que AIC/BIC/HQC son comparables.
+    """
+
+    def __init__(self, series_var, p_max, metodo='qr'):
+        if isinstance(series_var, pd.DataFrame):
+            self.names = list(series_var.columns)
+            self.index = series_var.index[p_max:]
+            y = np.asarray(series_var.values, dtype=float)
+        else:
+            y = np.asarray(series_var, dtype=float)
+            self.names = [f'y{i + 1}' for i in range(y.shape[1])]
+            self.index = None
+
+        self.p_max = p_max
+        self.y = y
+        self.neqs = y.shape[1]
+        self.Y, self.X = matriz_diseno_rezagada(y, p_max)
+        self.nobs = self.Y.shape[0]
+        m_max = self.X.shape[1]
+
+        if metodo == 'qr':
+            # Una sola QR de [X | Y]: el bloque superior derecho es Q'Y
+            R_aug = np.linalg.qr(np.hstack([self.X, self.Y]), mode='r')
+            self.R = R_aug[:m_max, :m_max]
+            self.QtY = R_aug[:m_max, m_max:]
+        elif metodo == 'cholesky':
+            XtX = self.X.T @ self.X
+            self.R = np.linalg.cholesky(XtX).T
+            self.QtY = solve_triangular(self.R, self.X.T @ self.Y, trans='T', lower=False)
+        else:
+            raise ValueError("metodo debe ser 'qr' o 'cholesky'")
+        self.YtY = self.Y.T @ self.Y
+
+    def ajustar(self, p):
+        """
+        Devuelve el VAR(p) (p <= p_max) como VARLigero sin volver a factorizar.
+        """
+        if not 0 <= p <= self.p_max:
+            raise ValueError(f"p debe estar entre 0 y {self.p_max}")
+        m = 1 + self.neqs * p
+        z = self.QtY[:m]
+        params = solve_triangular(self.R[:m, :m], z, lower=False)
+        rss = self.YtY - z.T @ z
+        sigma_u = rss / (self.nobs - m)
+        return VARLigero(params, sigma_u, self.nobs, self.names, Y=self.Y, X=self.X, index=self.index,
+                         endog=self.y[self.p_max - p:])
+
+    def ajustar_todos(self, rezagos=None):
+        """
+        Devuelve {p: VARLigero} para todos los órdenes solicitados (por defecto 1..p_max).
+        """
+        if rezagos is None:
+            rezagos = range(1, self.p_max + 1)
+        return {p: self.ajustar(p) for p in rezagos}
+
+
+def ajustar_VAR_rango(series_var, p_max, metodo='qr', verbose=True):
+    """
+    Ajusta VAR(1..p_max) con una sola factorización y resume criterios y estabilidad.
+
+    Parámetros:
+        series_var (pd.DataFrame): Serie temporal multivariada (preprocesada).
+        p_max (int): Orden máximo de rezagos.
+        metodo (str): 'qr' (por defecto, numéricamente más estable) o 'cholesky' (ecuaciones normales).
+        verbose (bool): Si True, imprime el orden óptimo según cada criterio.
+
+    Retorna:
+        modelos (dict): {p: VARLigero}.
+        tabla (pd.DataFrame): AIC, BIC, HQC, FPE y estabilidad por p.
+    """
+    estimador = VARIncremental(series_var, p_max, metodo=metodo)
+    modelos = estimador.ajustar_todos()
+
+    tabla = pd.DataFrame.from_dict({
+        p: {'AIC': m.aic, 'BIC': m.bic, 'HQC': m.hqic, 'FPE': m.fpe, 'estable': m.is_stable()}
+        for p, m in modelos.items()
+    }, orient='index')
+    tabla.index.name = 'p'
+
+    if verbose:
+        print(f"🔧 Modelos VAR(p=1..{p_max}) ajustados sobre {estimador.nobs} observaciones comunes.")
+        for criterio in ['AIC', 'BIC', 'HQC']:
+            print(f"✅ Mínimo {criterio}: p={tabla[criterio].idxmin()}")
+
+    return modelos, tabla
@@ -0,0 +1,332 @@
+# Cointegración de Johansen y VECM a partir de un solo juego de matrices de momentos compartidas
+import numpy as np
+import pandas as pd
+from scipy.linalg import cho_factor, cho_solve, eigh
+from statsmodels.tsa.coint_tables import c_sja, c_sjt
+
+from var_ols import VARLigero
+
+# Casos de Johansen con la notación de términos deterministas de statsmodels.VECM:
+# 'co'/'lo' fuera de la relación de cointegración, 'ci'/'li' dentro de ella.
+CASOS = ('n', 'ci', 'co', 'coli', 'colo')
+# Orden determinista de las tablas de statsmodels (MacKinnon-Haug-Michelis) por caso. Los
+# casos con términos restringidos no tienen tabla, y la de det_order=1 corresponde a
+# coint_johansen, que elimina la tendencia de los datos antes de la regresión auxiliar (no
+# reproduce los autovalores de 'colo'): en esos casos los valores críticos quedan en NaN.
+_ORDEN_TABLAS = {'n': -1, 'co': 0}
+_NIVELES = (0.10, 0.05, 0.01)  # mismo orden que las tablas (90 %, 95 %, 99 %)
+
+
+def _sufijo(signif):
+    return f'cv{round((1 - signif) * 100)}'
+
+
+def _valores_criticos(tabla, num_vars, caso):
+    if caso not in _ORDEN_TABLAS:
+        return np.full(3, np.nan)
+    return np.asarray(tabla(num_vars, _ORDEN_TABLAS[caso]), dtype=float)
+
+
+class Johansen:
+    """
+    Pruebas de rango de Johansen (traza y máximo autovalor) para todos los casos deterministas
+    y todos los rangos, y estimación del VECM, desde una sola matriz de momentos.
+
+    Con p rezagos en niveles (p - 1 diferencias rezagadas), se arma una sola vez
+    M = [Δy_t, y_{t-1}, 1, t, t-1, Δy_{t-1}, ..., Δy_{t-p+1}] y su matriz de momentos G = M'M.
+    Para cada caso, los residuos de la regresión auxiliar sobre las variables de corto plazo
+    (y los deterministas no restringidos) salen de complementos de Schur de bloques de G:
+        S_ab = (G_ab - G_aW G_WW⁻¹ G_Wb) / T,
+    sin volver a recorrer los datos. Luego un único problema de autovalores generalizado
+    S10 S00⁻¹ S01 v = λ S11 v (scipy.linalg.eigh) da los estadísticos para todos los rangos y
+    los vectores de cointegración; la solución queda en caché y ajustar() la reutiliza.
+    """
+
+    def __init__(self, series, p=2):
+        if p < 1:
+            raise ValueError("p debe ser al menos 1 (p - 1 diferencias rezagadas en el VECM).")
+        if isinstance(series, pd.DataFrame):
+            self.names = list(series.columns)
+            self.index = series.index[p:]
+        else:
+            self.names = [f'y{i + 1}' for i in range(np.shape(series)[1])]
+            self.index = None
+        y = np.asarray(series, dtype=float)
+        self.y = y
+        self.p = p
+        self.num_vars = k = y.shape[1]
+        self.nobs = T = len(y) - p
+
+        dy = np.diff(y, axis=0)
+        tiempo = np.arange(p, p + T, dtype=float)
+        columnas = [dy[p - 1:], y[p - 1:-1], np.ones((T, 1)), (tiempo + 1)[:, None], tiempo[:, None]]
+        columnas += [dy[p - 1 - i:len(dy) - i] for i in range(1, p)]
+        M = np.hstack(columnas)
+        self.G = M.T @ M
+
+        self._bloques = {
+            'dy': np.arange(k), 'y1': np.arange(k, 2 * k),
+            'co': np.array([2 * k]), 'lo': np.array([2 * k + 1]),
+            'ci': np.array([2 * k]), 'li': np.array([2 * k + 2]),
+            'z': np.arange(2 * k + 3, M.shape[1]),
+        }
+        self._tiempo = tiempo + 1  # tendencia fuera de la relación (t) en la muestra efectiva
+        self._soluciones = {}
+
+    def __repr__(self):
+        return f"Johansen(nvars={self.num_vars}, p={self.p}, nobs={self.nobs}, casos_resueltos={list(self._soluciones)})"
+
+    def _indices(self, caso):
+        if caso not in CASOS:
+            raise ValueError(f"caso debe ser uno de: {CASOS}")
+        b = self._bloques
+        fuera = [b['z']] + [b[t] for t in ('co', 'lo') if t in caso]
+        dentro = [b['y1']] + [b[t] for t in ('ci', 'li') if t in caso]
+        return np.concatenate(fuera), np.concatenate(dentro)
+
+    def resolver(self, caso='co'):
+        """
+        Matrices S_ij y problema de autovalores de un caso (en caché).
+
+        Retorna:
+            dict: 'autovalores' (descendentes), 'autovectores' (V'S11V = I), 'S00', 'S01', 'S11',
+                  índices 'fuera' (W) y 'dentro' (y_{t-1} y deterministas restringidos).
+        """
+        if caso in self._soluciones:
+            return self._soluciones[caso]
+        fuera, dentro = self._indices(caso)
+        dy = self._bloques['dy']
+        G, T = self.G, self.nobs
+
+        A = np.concatenate([dy, dentro])
+        G_AA = G[np.ix_(A, A)]
+        if len(fuera):
+            G_AW = G[np.ix_(A, fuera)]
+            G_AA = G_AA - G_AW @ cho_solve(cho_factor(G[np.ix_(fuera, fuera)]), G_AW.T)
+        S = G_AA / T
+        k = self.num_vars
+        S00, S01, S11 = S[:k, :k], S[:k, k:], S[k:, k:]
+
+        autovalores, autovectores = eigh(S01.T @ np.linalg.solve(S00, S01), S11)
+        orden = np.argsort(autovalores)[::-1]
+        solucion = {
+            'autovalores': np.clip(autovalores[orden], 0.0, 1.0 - 1e-15),
+            'autovectores': autovectores[:, orden],
+            'S00': S00, 'S01': S01, 'S11': S11, 'fuera': fuera, 'dentro': dentro,
+        }
+        self._soluciones[caso] = solucion
+        return solucion
+
+    def pruebas(self, casos=CASOS):
+        """
+        Estadísticos de traza y de máximo autovalor para H0: rango ≤ r, r = 0..nvars-1.
+
+        Los valores críticos son los de statsmodels (hasta 12 variables) para los casos 'n' y 'co';
+        para 'ci', 'coli' y 'colo' no hay tablas aplicables y quedan en NaN.
+
+        Retorna:
+            pd.DataFrame: Columnas caso, rango, autovalor, traza, traza_cv90/95/99,
+                          max_autovalor y max_cv90/95/99.
+        """
+        k, T = self.num_vars, self.nobs
+        filas = []
+        for caso in casos:
+            autovalores = self.resolver(caso)['autovalores'][:k]
+            log_uno_menos = np.log1p(-autovalores)
+            traza = -T * np.cumsum(log_uno_menos[::-1])[::-1]
+            for r in range(k):
+                cv_traza = _valores_criticos(c_sjt, k - r, caso)
+                cv_max = _valores_criticos(c_sja, k - r, caso)
+                filas.append({
+                    'caso': caso, 'rango': r, 'autovalor': autovalores[r],
+                    'traza': traza[r], **{f'traza_{_sufijo(n)}': v for n, v in zip(_NIVELES, cv_traza)},
+                    'max_autovalor': -T * log_uno_menos[r],
+                    **{f'max_{_sufijo(n)}': v for n, v in zip(_NIVELES, cv_max)},
+                })
+        return pd.DataFrame(filas)
+
+    def seleccionar_rango(self, caso='co', prueba='traza', signif=0.05):
+        """
+        Rango por prueba secuencial: el primer r cuya H0 (rango ≤ r) no se rechaza.
+        """
+        if signif not in _NIVELES:
+            raise ValueError(f"signif debe ser uno de: {_NIVELES}")
+        if prueba not in ('traza', 'max_autovalor'):
+            raise ValueError("prueba debe ser 'traza' o 'max_autovalor'")
+        tabla = self.pruebas((caso,))
+        cv = tabla[f"{'traza' if prueba == 'traza' else 'max'}_{_sufijo(signif)}"]
+        if cv.isna().any():
+            raise ValueError(f"No hay valores críticos para el caso '{caso}' con {self.num_vars} variables; "
+                             "indica el rango directamente.")
+        no_rechaza = tabla.loc[tabla[prueba] < cv, 'rango']
+        return int(no_rechaza.iloc[0]) if len(no_rechaza) else self.num_vars
+
+    def ajustar(self, rango, caso='co'):
+        """
+        Estima el VECM por máxima verosimilitud (regresión de rango reducido) con la solución
+        en caché del caso: β son los primeros `rango` autovectores (normalizados para que su
+        bloque superior sea la identidad), α = S01 β (β'S11β)⁻¹ y Γ y los deterministas no
+        restringidos salen de la regresión de Δy_t sobre [β'y_{t-1}, W] armada desde G.
+
+        Retorna:
+            ModeloVECM: Modelo en su representación VAR en niveles.
+        """
+        k, T, G = self.num_vars, self.nobs, self.G
+        if not 0 <= rango <= k:
+            raise ValueError(f"rango debe estar entre 0 y {k}")
+        sol = self.resolver(caso)
+        fuera, dentro, dy = sol['fuera'], sol['dentro'], self._bloques['dy']
+
+        beta = sol['autovectores'][:, :rango]
+        if rango:
+            beta = beta @ np.linalg.inv(beta[:rango])
+        alpha = sol['S01'] @ beta @ np.linalg.inv(beta.T @ sol['S11'] @ beta) if rango else np.zeros((k, 0))
+
+        # Corto plazo: Δy - α β' y⁺_{t-1} sobre W, con momentos de G
+        P = np.zeros((len(G), k))
+        P[dy] = np.eye(k)
+        P[dentro] -= (alpha @ beta.T).T
+        G_WW, G_WP = G[np.ix_(fuera, fuera)], G[fuera] @ P
+        coef_fuera = np.linalg.solve(G_WW, G_WP) if len(fuera) else np.zeros((0, k))
+        sigma_u = (P.T @ G @ P - G_WP.T @ coef_fuera) / T
+
+        return ModeloVECM(self, caso, rango, alpha, beta, coef_fuera, sigma_u)
+
+
+class ModeloVECM(VARLigero):
+    """
+    VECM estimado, expuesto como VAR(p) en niveles con la interfaz de VARLigero para que
+    graficar_IRF(), calcular_FEVD_cholesky(), GIRF() y las bandas funcionen sin cambios:
+        A_1 = I + Π + Γ_1,  A_i = Γ_i - Γ_{i-1},  A_p = -Γ_{p-1},  Π = α β'.
+    Con rango < nvars la representación tiene raíces unitarias (is_stable() es False) y las
+    IRF no vuelven a cero: los choques tienen efectos permanentes sobre los niveles.
+
+    df_model, sigma_u_mle y los criterios de información (aic, bic, hqic, fpe) cuentan los
+    parámetros libres del VECM restringido, no los del VAR(p) sin restricciones: por ecuación,
+    Γ_1..Γ_{p-1}, la carga α y los deterministas no restringidos; en el sistema, además, los
+    (nvars + deterministas restringidos - rango) × rango elementos libres de β normalizado.
+    sigma_u ya es la estimación de máxima verosimilitud (dividida entre nobs).
+
+    Atributos adicionales: alpha, beta (con las filas de los deterministas restringidos),
+    Pi, gamma (lista de Γ_i), rango, caso, det_fuera, tendencia (None si no hay tendencia).
+    """
+
+    def __init__(self, johansen, caso, rango, alpha, beta, coef_fuera, sigma_u):
+        k, p = johansen.num_vars, johansen.p
+        b = johansen._bloques
+        _, dentro = johansen._indices(caso)
+        fila = {int(c): i for i, c in enumerate(dentro)}
+
+        self.alpha, self.beta, self.rango, self.caso = alpha, beta, rango, caso
+        self.Pi = alpha @ beta[:k].T
+        fuera = list(johansen._indices(caso)[0])
+        coef = dict(zip(fuera, coef_fuera))
+        self.gamma = [np.array([coef[c] for c in b['z'][(i - 1) * k:i * k]]).T for i in range(1, p)]
+        self.det_fuera = {t: coef[int(b[t][0])] for t in ('co', 'lo') if t in caso}
+
+        coefs = np.zeros((p, k, k))
+        coefs[0] = np.eye(k) + self.Pi
+        for i, gamma in enumerate(self.gamma, start=1):
+            coefs[i - 1] += gamma
+            coefs[i] -= gamma
+
+        # Deterministas: constante y tendencia (en t = 1, 2, ...) del VAR en niveles
+        intercept = self.det_fuera.get('co', np.zeros(k)).copy()
+        tendencia = self.det_fuera.get('lo', np.zeros(k)).copy()
+        if 'ci' in caso:
+            intercept += alpha @ beta[fila[int(b['ci'][0])]]
+        if 'li' in caso:
+            pendiente = alpha @ beta[fila[int(b['li'][0])]]
+            tendencia += pendiente
+            intercept -= pendiente  # la tendencia restringida entra rezagada (t - 1)
+        self.tendencia = tendencia if ('lo' in caso or 'li' in caso) else None
+
+        params = np.vstack([intercept, coefs.transpose(0, 2, 1).reshape(k * p, k)])
+        y = johansen.y
+        X = np.hstack([np.ones((johansen.nobs, 1))] + [y[p - i:len(y) - i] for i in range(1, p + 1)])
+        super().__init__(params, sigma_u, johansen.nobs, johansen.names, Y=y[p:], X=X, index=johansen.index,
+                         endog=y)
+        self._t = johansen._tiempo
+        self._t_final = float(len(y))
+
+        restringidos = len(beta) - k
+        self.df_model = k * (p - 1) + rango + len(self.det_fuera)
+        self.df_resid = self.nobs - self.df_model
+        self._parametros_libres = k * self.df_model + (k + restringidos - rango) * rango
+
+    @property
+    def sigma_u_mle(self):
+        return self.sigma_u
+
+    @property
+    def info_criteria(self):
+        nobs, neqs = self.nobs, self.neqs
+        ld = np.linalg.slogdet(self.sigma_u)[1]
+        return {
+            'aic': ld + (2.0 / nobs) * self._parametros_libres,
+            'bic': ld + (np.log(nobs) / nobs) * self._parametros_libres,
+            'hqic': ld + (2.0 * np.log(np.log(nobs)) / nobs) * self._parametros_libres,
+            'fpe': ((nobs + self.df_model) / self.df_resid) ** neqs * np.exp(ld) if self.df_resid > 0 else np.inf,
+        }
+
+    @property
+    def endog_lagged(self):
+        # Regresores de la representación VAR en niveles [1, y_{t-1}, ..., y_{t-p}]
+        return self._X
+
+    @property
+    def resid(self):
+        residuos = super().resid
+        if self.tendencia is not None:
+            residuos -= np.outer(self._t, self.tendencia)
+        return residuos
+
+    def forecast(self, y, steps):
+        """
+        Pronóstico recursivo en niveles; la tendencia, si la hay, continúa desde el final de la muestra.
+        """
+        if self.tendencia is None:
+            return super().forecast(y, steps)
+        y = np.asarray(y, dtype=float)
+        historia = list(y[-self.k_ar:])
+        pronostico = np.empty((steps, self.neqs))
+        for h in range(steps):
+            valor = self.intercept + self.tendencia * (self._t_final + h + 1)
+            for i in range(self.k_ar):
+                valor = valor + self.coefs[i] @ historia[-i - 1]
+            pronostico[h] = valor
+            historia.append(valor)
+        return pronostico
+
+
+def ajustar_VECM(series_niveles, p=2, caso='co', rango=None, prueba='traza', signif=0.05, verbose=True):
+    """
+    Pruebas de Johansen para todos los casos deterministas y ajuste del VECM en el rango elegido.
+
+    A diferencia de preprocesar_series_para_VAR(), que diferencia las columnas no estacionarias
+    y descarta la información en niveles, aquí se usan las series en niveles (p. ej. en log);
+    el modelo resultante se usa como cualquier modelo de {p: modelo}.
+
+    Parámetros:
+        series_niveles (pd.DataFrame): Series en niveles (sin diferenciar).
+        p (int): Rezagos del VAR en niveles (p - 1 diferencias rezagadas en el VECM).
+        caso (str): Términos deterministas, uno de CASOS.
+        rango (int or None): Rango de cointegración. Si None, se elige con `prueba` y `signif`.
+        prueba (str): 'traza' o 'max_autovalor'.
+        signif (float): 0.10, 0.05 o 0.01.
+        verbose (bool): Si True, imprime el rango y la tabla de pruebas del caso.
+
+    Retorna:
+        modelo (ModeloVECM): VECM en su representación VAR en niveles.
+        tabla (pd.DataFrame): Pruebas de Johansen para todos los casos y rangos.
+    """
+    johansen = Johansen(series_niveles, p)
+    tabla = johansen.pruebas()
+    if rango is None:
+        rango = johansen.seleccionar_rango(caso, prueba, signif)
+    modelo = johansen.ajustar(rango, caso)
+
+    if verbose:
+        print(tabla[tabla['caso'] == caso].to_string(index=False, float_format='{:.4f}'.format))
+        print(f"🔧 VECM(p={p}, caso='{caso}') ajustado con rango de cointegración {rango}.")
+    return modelo, tabla
@@ -0,0 +1,57 @@
+import os
+import sys
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import pytest
+
+matplotlib.use('Agg')
+
+DIRECTORIO_CODIGO = os.path.join(os.path.dirname(__file__), '..', 'code')
+sys.path.insert(0, os.path.abspath(DIRECTORIO_CODIGO))
+
+SCRIPTS = ('utils.py', '01_preprocessing.py', '02_train_var.py', '03_evaluate_residuals.py',
+           '04_metrics_summary.py', '05_irf_fevd_analysis.py')
+
+
+def simular_var(num_vars=3, T=300, p=2, semilla=0):
+    """
+    Serie diaria de un VAR(p) estable con innovaciones correlacionadas.
+    """
+    rng = np.random.default_rng(semilla)
+    coefs = rng.normal(scale=0.3 / (num_vars * p) ** 0.5, size=(p, num_vars, num_vars))
+    A = rng.normal(size=(num_vars, num_vars))
+    L = np.linalg.cholesky(A @ A.T / num_vars + np.eye(num_vars))
+    y = np.zeros((T + 50, num_vars))
+    for t in range(p, len(y)):
+        y[t] = 0.1 + np.einsum('lij,lj->i', coefs, y[t - p:t][::-1]) + L @ rng.standard_normal(num_vars)
+    indice = pd.date_range('2000-01-01', periods=T, freq='D')
+    return pd.DataFrame(y[50:], index=indice, columns=[f'x{i}' for i in range(num_vars)])
+
+
+@pytest.fixture(scope='session')
+def ns():
+    """
+    Espacio de nombres con los scripts numerados cargados como en el notebook.
+    """
+    from pipeline import cargar_script
+
+    for script in SCRIPTS:
+        espacio = cargar_script(script)
+    return espacio
+
+
+@pytest.fixture(scope='session')
+def serie():
+    return simular_var()
+
+
+@pytest.fixture(scope='session')
+def modelo_sm(serie):
+    """
+    VAR(2) de statsmodels sobre `serie`, referencia para los motores propios.
+    """
+    from statsmodels.tsa.api import VAR
+
+    return VAR(serie).fit(2)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.api import VAR
+
+from backtest import METRICAS, backtest_VAR
+
+REZAGOS = [1, 2]
+HORIZONTE = 4
+
+
+@pytest.fixture(scope='module')
+def niveles(serie):
+    return 100 + serie.cumsum()
+
+
+def _reajuste_directo(series_var, niveles, p, origen, inicio):
+    """
+    Reestima desde cero con statsmodels y evalúa MAE/RMSE/R² de la trayectoria en niveles.
+    """
+    p_max = max(REZAGOS)
+    modelo = VAR(series_var.iloc[p_max + inicio - p:origen]).fit(p)
+    pred = modelo.forecast(series_var.values[origen - p:origen], HORIZONTE)
+    y_pred = niveles.loc[series_var.index].values[origen - 1] + np.cumsum(pred, axis=0)
+    y_real = niveles.loc[series_var.index].values[origen:origen + HORIZONTE]
+    salida = np.empty((HORIZONTE, y_real.shape[1], 3))
+    for h in range(1, HORIZONTE + 1):
+        error = y_pred[:h] - y_real[:h]
+        salida[h - 1, :, 0] = np.abs(error).mean(axis=0)
+        salida[h - 1, :, 1] = np.sqrt((error ** 2).mean(axis=0))
+        ss_tot = ((y_real[:h] - y_real[:h].mean(axis=0)) ** 2).sum(axis=0)
+        salida[h - 1, :, 2] = 1 - (error ** 2).sum(axis=0) / ss_tot if h > 1 else np.nan
+    return salida
+
+
+@pytest.mark.parametrize('ventana', ['expanding', 'rolling'])
+@pytest.mark.parametrize('n_jobs', [1, 3])
+def test_coincide_con_reestimacion_directa(serie, niveles, ventana, n_jobs):
+    series_var = niveles.diff().dropna()
+    origen_inicial, paso = 200, 9
+    metricas, tabla = backtest_VAR(series_var, REZAGOS, niveles, horizonte=HORIZONTE, origen_inicial=origen_inicial,
+                                   paso=paso, ventana=ventana, n_jobs=n_jobs)
+    origenes = np.arange(origen_inicial, len(series_var) - HORIZONTE + 1, paso)
+    assert metricas.shape == (len(REZAGOS), len(origenes), HORIZONTE, 3, len(METRICAS))
+    assert len(tabla) == metricas.size // len(METRICAS)
+
+    # Las actualizaciones recursivas acumulan error numérico; R² con varianza real pequeña lo amplifica
+    tamano = origen_inicial - max(REZAGOS)
+    for i, p in enumerate(REZAGOS):
+        for n, origen in enumerate(origenes):
+            inicio = 0 if ventana == 'expanding' else origen - max(REZAGOS) - tamano
+            np.testing.assert_allclose(metricas[i, n], _reajuste_directo(series_var, niveles, p, origen, inicio),
+                                       rtol=1e-5, atol=1e-8)
+
+
+def test_validaciones(serie, niveles):
+    series_var = niveles.diff().dropna()
+    with pytest.raises(ValueError):
+        backtest_VAR(series_var, REZAGOS, niveles, ventana='otra', n_jobs=1)
+    with pytest.raises(ValueError):
+        backtest_VAR(series_var, REZAGOS, niveles, horizonte=HORIZONTE, origen_inicial=len(series_var), n_jobs=1)
+    with pytest.raises(ValueError):
+        backtest_VAR(series_var, [5], niveles, origen_inicial=10, n_jobs=1)
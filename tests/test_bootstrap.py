@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.api import VAR
+
+from bootstrap import _estimar_lote, _residuos_muestra, bandas_a_dataframe, bootstrap_VAR
+from var_ols import ajustar_VAR_rango
+
+STEPS = 5
+
+
+def test_residuos_coinciden_con_statsmodels(serie, modelo_sm):
+    residuos = _residuos_muestra(serie.values, modelo_sm.coefs, modelo_sm.intercept)
+    np.testing.assert_allclose(residuos, modelo_sm.resid.values, atol=1e-10)
+
+
+def test_estimacion_en_lote(serie, modelo_sm):
+    coefs, sigma_u = _estimar_lote(np.stack([serie.values, serie.values[::-1]]), 2)
+    np.testing.assert_allclose(coefs[0], modelo_sm.coefs, atol=1e-10)
+    np.testing.assert_allclose(sigma_u[0], modelo_sm.sigma_u.values, atol=1e-10)
+    invertido = VAR(serie.iloc[::-1].reset_index(drop=True)).fit(2)
+    np.testing.assert_allclose(coefs[1], invertido.coefs, atol=1e-10)
+
+
+@pytest.mark.parametrize('metodo', ['residual', 'wild'])
+def test_formas_y_puntuales(modelo_sm, metodo):
+    bandas = bootstrap_VAR(modelo_sm, B=40, steps=STEPS, metodo=metodo, n_jobs=1, semilla=0)
+    k = modelo_sm.neqs
+    for nombre in ('irf', 'orth_irf', 'girf'):
+        assert bandas[nombre]['inferior'].shape == (STEPS + 1, k, k)
+        assert np.all(bandas[nombre]['inferior'] <= bandas[nombre]['superior'] + 1e-12)
+    assert bandas['fevd']['mediana'].shape == (STEPS, k, k)
+    np.testing.assert_allclose(bandas['irf']['puntual'], modelo_sm.irf(STEPS).irfs, atol=1e-10)
+    # En h = 0 la FEVD del repositorio es la identidad por convención
+    np.testing.assert_allclose(bandas['fevd']['puntual'][1:], modelo_sm.fevd(STEPS).decomp.transpose(1, 2, 0)[1:],
+                               atol=1e-10)
+    assert 0 <= bandas['proporcion_estable'] <= 1
+
+
+def test_no_depende_de_n_jobs(modelo_sm):
+    kwargs = dict(B=30, steps=STEPS, calcular=('irf',), tamano_lote=10, semilla=3)
+    serie_ = bootstrap_VAR(modelo_sm, n_jobs=1, **kwargs)
+    paralelo = bootstrap_VAR(modelo_sm, n_jobs=2, **kwargs)
+    np.testing.assert_array_equal(serie_['irf']['mediana'], paralelo['irf']['mediana'])
+
+
+@pytest.mark.parametrize('con_serie', [False, True])
+def test_modelo_con_p_menor_que_p_max(serie, con_serie):
+    # Regresión: los VARLigero de ajustar_VAR_rango guardan la muestra de p_max
+    modelo = ajustar_VAR_rango(serie, 3, verbose=False)[0][1]
+    bandas = bootstrap_VAR(modelo, serie if con_serie else None, B=20, steps=STEPS, n_jobs=1, semilla=0)
+    assert bandas['irf']['mediana'].shape == (STEPS + 1, 3, 3)
+    assert np.isfinite(bandas['girf']['superior']).all()
+
+
+def test_horizonte_cero(modelo_sm):
+    bandas = bootstrap_VAR(modelo_sm, B=10, steps=0, n_jobs=1, semilla=0)
+    np.testing.assert_allclose(bandas['irf']['inferior'], np.eye(3)[None])
+    assert bandas['fevd']['mediana'].shape == bandas['fevd']['puntual'].shape == (0, 3, 3)
+
+
+def test_argumentos_invalidos(modelo_sm):
+    with pytest.raises(ValueError):
+        bootstrap_VAR(modelo_sm, B=2, metodo='parametrico')
+    with pytest.raises(ValueError):
+        bootstrap_VAR(modelo_sm, B=2, calcular=('gfevd',))
+
+
+def test_bandas_a_dataframe(modelo_sm):
+    bandas = bootstrap_VAR(modelo_sm, B=10, steps=STEPS, calcular=('irf',), n_jobs=1, semilla=0)
+    df = bandas_a_dataframe(bandas['irf'], modelo_sm.names, {'x0': 'A'})
+    assert df.shape == (STEPS + 1, 9 * 4)
+    assert df[('A_resp_to_x1', 'puntual')].iloc[1] == pytest.approx(modelo_sm.irf(STEPS).irfs[1, 0, 1])
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from scipy.special import multigammaln
+
+from bvar import PriorMinnesota, VARBayesiano, ajustar_BVAR, bandas_posteriores
+from var_ols import matriz_diseno_rezagada
+
+
+@pytest.fixture(scope='module')
+def diseno(serie):
+    return matriz_diseno_rezagada(serie.values, 2)
+
+
+def _posterior_directa(prior, Y, X, lam):
+    """
+    Posterior NIW con las fórmulas de libro de texto (inversas explícitas de Ω0 y Ω̄).
+    """
+    omega0_inv = np.diag(1.0 / (lam ** 2 * prior.D))
+    omega = np.linalg.inv(X.T @ X + omega0_inv)
+    B = omega @ (omega0_inv @ prior.B0 + X.T @ Y)
+    S = prior.S0 + Y.T @ Y + prior.B0.T @ omega0_inv @ prior.B0 - B.T @ np.linalg.inv(omega) @ B
+    nu = prior.nu0 + len(Y)
+    T, k = Y.shape
+    log_ml = (-0.5 * T * k * np.log(np.pi) + multigammaln(nu / 2, k) - multigammaln(prior.nu0 / 2, k)
+              - 0.5 * k * np.linalg.slogdet(np.linalg.inv(omega0_inv))[1] + 0.5 * k * np.linalg.slogdet(omega)[1]
+              + 0.5 * prior.nu0 * np.linalg.slogdet(prior.S0)[1] - 0.5 * nu * np.linalg.slogdet(S)[1])
+    return B, S, nu, omega, log_ml
+
+
+@pytest.mark.parametrize('lam', [0.05, 0.3, 2.0])
+@pytest.mark.parametrize('media_propia', [0.0, 1.0])
+def test_posterior_contra_formulas_directas(diseno, lam, media_propia):
+    Y, X = diseno
+    prior = PriorMinnesota(Y, X, media_propia=media_propia)
+    B, S, nu, raiz_omega = prior.posterior(lam)
+    B_d, S_d, nu_d, omega_d, log_ml_d = _posterior_directa(prior, Y, X, lam)
+    np.testing.assert_allclose(B, B_d, rtol=1e-7, atol=1e-10)
+    np.testing.assert_allclose(S, S_d, rtol=1e-7)
+    assert nu == nu_d
+    np.testing.assert_allclose(raiz_omega @ raiz_omega.T, omega_d, rtol=1e-6, atol=1e-14)
+    assert prior.log_verosimilitud_marginal(lam)[0] == pytest.approx(log_ml_d, rel=1e-9)
+
+
+def test_limite_difuso_es_ols(serie, modelo_sm):
+    modelo, _ = ajustar_BVAR(serie, 2, lambdas=1e4, verbose=False)
+    np.testing.assert_allclose(modelo.params, modelo_sm.params.values, rtol=1e-5, atol=1e-8)
+    np.testing.assert_allclose(modelo.resid, modelo_sm.resid.values, atol=1e-6)
+
+
+def test_prior_rigido_encoge_hacia_la_media(serie):
+    modelo, _ = ajustar_BVAR(serie, 2, lambdas=1e-4, media_propia=1.0, verbose=False)
+    B0 = np.vstack([np.eye(3), np.zeros((3, 3))])
+    np.testing.assert_allclose(modelo.params[1:], B0, atol=1e-5)
+
+
+def test_malla_elige_el_maximo(serie):
+    lambdas = np.logspace(-2, 1, 7)
+    modelo, _ = ajustar_BVAR(serie, 2, lambdas=lambdas, verbose=False)
+    assert modelo.lam == modelo.tabla_lambda['log_ml'].idxmax()
+    assert modelo.log_ml == pytest.approx(modelo.tabla_lambda['log_ml'].max())
+
+
+def test_muestras_con_momentos_posteriores(serie):
+    modelo, _ = ajustar_BVAR(serie, 1, lambdas=0.3, verbose=False)
+    params, sigma_u = modelo.muestrear(20000, semilla=0)
+    assert params.shape == (20000, 4, 3) and sigma_u.shape == (20000, 3, 3)
+    np.testing.assert_allclose(sigma_u.mean(axis=0), modelo.sigma_u, rtol=0.03, atol=1e-3)
+    np.testing.assert_allclose(params.mean(axis=0), modelo.params, atol=0.01)
+    # Var(B_mi) = E[Σ_ii] Ω̄_mm
+    omega = modelo._raiz_omega @ modelo._raiz_omega.T
+    np.testing.assert_allclose(params.var(axis=0), np.outer(np.diag(omega), np.diag(modelo.sigma_u)), rtol=0.05)
+
+
+def test_bandas_posteriores_horizonte_cero(serie):
+    modelo, _ = ajustar_BVAR(serie, 2, lambdas=0.3, verbose=False)
+    bandas = bandas_posteriores(modelo, n=50, steps=0, semilla=0)
+    np.testing.assert_allclose(bandas['irf']['mediana'], np.eye(3)[None])
+    assert bandas['fevd']['mediana'].shape == (0, 3, 3)
+    assert 0 <= bandas['proporcion_estable'] <= 1
+
+
+def test_interfaz_de_VARLigero(serie):
+    modelo, _ = ajustar_BVAR(serie, 2, lambdas=0.3, verbose=False)
+    assert isinstance(modelo, VARBayesiano)
+    np.testing.assert_allclose(modelo.endog, serie.values)
+    Y, X = matriz_diseno_rezagada(serie.values, 2)
+    np.testing.assert_allclose(modelo.endog_lagged, X)
+    np.testing.assert_allclose(modelo.resid, Y - X @ modelo.params)
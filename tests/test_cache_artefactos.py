@@ -0,0 +1,93 @@
+import functools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cache_artefactos import CacheArtefactos, ajustar_VAR_cacheado, huella, irf_fevd_cacheado
+from var_ols import VARIncremental
+
+
+def _definir(cuerpo, defecto=1):
+    # Como pipeline.cargar_script: misma función (módulo y nombre) definida con exec
+    espacio = {}
+    exec(f"def etapa(x, a={defecto}):\n    return {cuerpo}\n", espacio)
+    return espacio['etapa']
+
+
+def test_huella_incluye_el_codigo_de_la_funcion():
+    original = _definir('x + a')
+    assert huella(original) == huella(_definir('x + a'))
+    assert huella(original) != huella(_definir('x - a'))
+    assert huella(original) != huella(_definir('x + a', defecto=2))
+    assert huella(functools.partial(original, a=1)) != huella(functools.partial(original, a=2))
+
+
+def test_huella_de_datos(serie):
+    assert huella(serie, 2) == huella(serie.copy(), 2)
+    assert huella(serie, 2) != huella(serie, 3)
+    modificada = serie.copy()
+    modificada.iloc[5, 1] += 1e-9
+    assert huella(serie) != huella(modificada)
+
+
+def test_ida_y_vuelta(tmp_path, serie):
+    artefacto = {'tabla': serie, 'serie': serie['x0'], 'arreglo': np.arange(6.0).reshape(2, 3),
+                 'nombres': ['a', 'b'], 'tupla': (1, 2.5, None), 'texto': np.array(['x', 'y'], dtype=object)}
+    cache = CacheArtefactos(str(tmp_path), verbose=False)
+    cache.guardar('clave', 'prueba', artefacto)
+    recuperado = CacheArtefactos(str(tmp_path), verbose=False).cargar('clave')
+    pd.testing.assert_frame_equal(recuperado['tabla'], serie)
+    pd.testing.assert_series_equal(recuperado['serie'], serie['x0'])
+    np.testing.assert_array_equal(recuperado['arreglo'], artefacto['arreglo'])
+    assert recuperado['tupla'] == (1, 2.5, None)
+    assert recuperado['texto'].tolist() == ['x', 'y']
+    with pytest.raises(TypeError):
+        cache.guardar('otra', 'prueba', {'conjunto': {1, 2}})
+
+
+def test_funcion_editada_no_reutiliza_artefacto(tmp_path):
+    cache = CacheArtefactos(str(tmp_path), verbose=False)
+    assert cache.ejecutar('etapa', _definir('x + a'), np.ones(3))[0] == 2
+    assert cache.ejecutar('etapa', _definir('x - a'), np.ones(3))[0] == 0
+    assert len(cache.indice) == 2
+
+
+def test_cargar_no_reescribe_el_indice(tmp_path, monkeypatch):
+    cache = CacheArtefactos(str(tmp_path), verbose=False)
+    cache.guardar('clave', 'prueba', np.zeros(3))
+    escrituras = []
+    original = cache._guardar_indice
+    monkeypatch.setattr(cache, '_guardar_indice', lambda: (escrituras.append(1), original()))
+    for _ in range(5):
+        cache.cargar('clave')
+    assert escrituras == []
+    acceso = cache.indice['clave']['acceso']
+    cache.cerrar()
+    assert escrituras == [1]
+    assert CacheArtefactos(str(tmp_path)).indice['clave']['acceso'] == acceso
+
+
+def test_desalojo_lru(tmp_path):
+    rng = np.random.default_rng(0)
+    with CacheArtefactos(str(tmp_path), verbose=False) as cache:
+        cache.guardar('a', 'prueba', rng.normal(size=2000))
+        tamano = cache.indice['a']['tamano']
+        cache.tamano_maximo = int(2.5 * tamano)
+        cache.guardar('b', 'prueba', rng.normal(size=2000))
+        cache.cargar('a')  # 'b' pasa a ser el menos reciente
+        cache.guardar('c', 'prueba', rng.normal(size=2000))
+    assert sorted(CacheArtefactos(str(tmp_path)).indice) == ['a', 'c']
+
+
+def test_adaptadores(tmp_path, serie, modelo_sm):
+    cache = CacheArtefactos(str(tmp_path), verbose=False)
+    modelo, _ = ajustar_VAR_cacheado(cache, serie, 2, verbose=False)
+    recuperado, _ = ajustar_VAR_cacheado(cache, serie, 2, verbose=False)
+    np.testing.assert_allclose(recuperado.params, modelo_sm.params.values, atol=1e-10)
+    np.testing.assert_allclose(recuperado.resid.values, VARIncremental(serie, 2).ajustar(2).resid.values)
+
+    resultado = irf_fevd_cacheado(cache, modelo_sm, steps=6)
+    np.testing.assert_allclose(resultado['irf'], modelo_sm.irf(6).irfs, atol=1e-10)
+    np.testing.assert_allclose(resultado['orth_irf'], modelo_sm.irf(6).orth_irfs, atol=1e-10)
+    assert resultado['gfevd'].shape == (7, 3, 3)
@@ -0,0 +1,98 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import datos
+from datos import cargar_excel_cacheado
+
+RUTA_DATOS = os.path.join(os.path.dirname(__file__), '..', 'data', 'Preprocessed multi energetic-economic dataset.xlsx')
+
+
+@pytest.fixture
+def libro(tmp_path):
+    df = pd.DataFrame({
+        'fecha': pd.date_range('2020-01-01', periods=4, freq='D'),
+        'a': [1.0, np.nan, 3.0, 4.0],
+        'b': [1.5, 2.5, 3.5, 4.5],
+        'n': [1, 2, 3, 4],
+        'texto': ['x', 5, None, 2.5],
+        2021: [0.1, 0.2, 0.3, 0.4],
+        pd.Timestamp('2022-01-01'): ['u', 'v', pd.Timestamp('2023-05-01'), 'w'],
+    })
+    ruta = tmp_path / 'libro.xlsx'
+    df.to_excel(ruta, index=False)
+    return str(ruta)
+
+
+def test_lectura_en_cache_igual_a_read_excel(libro, tmp_path):
+    referencia = pd.read_excel(libro)
+    creado = cargar_excel_cacheado(libro, cache_dir=str(tmp_path / 'cache'), verbose=False)
+    for mmap in (True, False):
+        leido = cargar_excel_cacheado(libro, cache_dir=str(tmp_path / 'cache'), mmap=mmap, verbose=False)
+        pd.testing.assert_frame_equal(leido, referencia)
+    pd.testing.assert_frame_equal(creado, referencia)
+    # Etiquetas y celdas conservan su tipo
+    assert leido.columns.tolist() == referencia.columns.tolist()
+    assert [type(c) for c in leido.columns] == [type(c) for c in referencia.columns]
+    assert [type(v) for v in leido['texto']] == [type(v) for v in referencia['texto']]
+
+
+def test_columnas_sin_copia(libro, tmp_path):
+    cache = str(tmp_path / 'cache')
+    cargar_excel_cacheado(libro, cache_dir=cache, verbose=False)
+    leido = cargar_excel_cacheado(libro, cache_dir=cache, verbose=False)
+    mapas = [[base for base in _bases(leido[c].values) if isinstance(base, np.memmap)] for c in ('a', 'b')]
+    assert mapas[0] and mapas[0][0] is mapas[1][0]  # ambas columnas son vistas del mismo .npy float64
+    # Copia al escribir: modificar el DataFrame no altera la caché
+    leido.loc[0, 'b'] = -1.0
+    assert cargar_excel_cacheado(libro, cache_dir=cache, verbose=False).loc[0, 'b'] == 1.5
+
+
+def _bases(arreglo):
+    while arreglo is not None:
+        yield arreglo
+        arreglo = getattr(arreglo, 'base', None)
+
+
+def test_invalidacion_por_contenido(libro, tmp_path):
+    cache = str(tmp_path / 'cache')
+    cargar_excel_cacheado(libro, cache_dir=cache, verbose=False)
+    pd.DataFrame({'z': [7.0, 8.0]}).to_excel(libro, index=False)
+    assert cargar_excel_cacheado(libro, cache_dir=cache, verbose=False).columns.tolist() == ['z']
+    # Mismo contenido con otro mtime: se reutiliza la caché
+    os.utime(libro, ns=(0, 0))
+    assert cargar_excel_cacheado(libro, cache_dir=cache, verbose=False)['z'].tolist() == [7.0, 8.0]
+    # La firma se actualiza por reemplazo atómico, sin dejar el temporal
+    carpeta = datos._carpeta_cache(libro, cache, {})
+    with open(os.path.join(carpeta, 'meta.json'), encoding='utf-8') as f:
+        assert json.load(f)['mtime_ns'] == 0
+    assert 'meta.json.tmp' not in os.listdir(carpeta)
+
+
+def test_tipos_no_soportados_no_se_guardan(tmp_path):
+    carpeta = str(tmp_path / 'cache')
+    df = pd.DataFrame({'d': pd.Series([1, None], dtype='Int64')})
+    with pytest.raises(TypeError):
+        datos._escribir_cache(df, carpeta, {})
+    with pytest.raises(TypeError):
+        datos._escribir_cache(pd.DataFrame({'t': [pd.Timedelta('1D')]}, dtype=object), carpeta, {})
+    assert not os.path.exists(carpeta)
+
+
+def test_indice_y_nombres(tmp_path):
+    carpeta = str(tmp_path / 'cache')
+    df = pd.DataFrame({1: [1.0, 2.0], 'x': [3, 4]}, index=pd.Index(['a', 7], name=0))
+    datos._escribir_cache(df, carpeta, {})
+    with open(os.path.join(carpeta, 'meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    pd.testing.assert_frame_equal(datos._leer_cache(carpeta, meta, mmap=True), df)
+
+
+@pytest.mark.skipif(not os.path.exists(RUTA_DATOS), reason="sin libro de datos")
+def test_libro_del_repositorio(tmp_path):
+    cache = str(tmp_path / 'cache')
+    referencia = cargar_excel_cacheado(RUTA_DATOS, cache_dir=cache, verbose=False)
+    pd.testing.assert_frame_equal(cargar_excel_cacheado(RUTA_DATOS, cache_dir=cache, verbose=False), referencia)
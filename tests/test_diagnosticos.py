@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from scipy.stats import jarque_bera as jarque_bera_scipy
+from statsmodels.stats.diagnostic import acorr_ljungbox
+
+from diagnosticos import (autocovarianzas_cruzadas, diagnosticar_modelos, jarque_bera, ljung_box,
+                          normalidad_multivariada, portmanteau_multivariado)
+
+
+def test_autocovarianzas_contra_bucle(modelo_sm):
+    e = modelo_sm.resid.values - modelo_sm.resid.values.mean(axis=0)
+    T = len(e)
+    esperado = np.stack([e[h:].T @ e[:T - h] / T for h in range(6)])
+    np.testing.assert_allclose(autocovarianzas_cruzadas(modelo_sm.resid, 5), esperado, atol=1e-12)
+
+
+def test_ljung_box_contra_statsmodels(modelo_sm):
+    residuos = modelo_sm.resid
+    lags = [1, 5, 10]
+    estadistico, p_valor = ljung_box(autocovarianzas_cruzadas(residuos, 10), len(residuos), lags)
+    for j, col in enumerate(residuos.columns):
+        esperado = acorr_ljungbox(residuos[col], lags=lags)
+        np.testing.assert_allclose(estadistico[:, j], esperado['lb_stat'].values, rtol=1e-8)
+        np.testing.assert_allclose(p_valor[:, j], esperado['lb_pvalue'].values, rtol=1e-8)
+
+
+@pytest.mark.parametrize('ajustado', [False, True])
+def test_portmanteau_contra_test_whiteness(modelo_sm, ajustado):
+    resultado = portmanteau_multivariado(autocovarianzas_cruzadas(modelo_sm.resid, 10), modelo_sm.nobs,
+                                         modelo_sm.k_ar, ajustado=ajustado)
+    esperado = modelo_sm.test_whiteness(nlags=10, adjusted=ajustado)
+    assert resultado['estadistico'] == pytest.approx(esperado.test_statistic, rel=1e-8)
+    assert resultado['gl'] == esperado.df
+    assert resultado['p_valor'] == pytest.approx(esperado.pvalue, rel=1e-6)
+
+
+def test_portmanteau_requiere_rezago_mayor_al_orden(modelo_sm):
+    with pytest.raises(ValueError):
+        portmanteau_multivariado(autocovarianzas_cruzadas(modelo_sm.resid, 2), modelo_sm.nobs, modelo_sm.k_ar)
+
+
+def test_jarque_bera_contra_scipy(modelo_sm):
+    resultado = jarque_bera(modelo_sm.resid)
+    for j, col in enumerate(modelo_sm.names):
+        esperado = jarque_bera_scipy(modelo_sm.resid[col])
+        assert resultado['JB'][j] == pytest.approx(esperado.statistic, rel=1e-10)
+        assert resultado['p-valor'][j] == pytest.approx(esperado.pvalue, rel=1e-8)
+
+
+def test_normalidad_contra_test_normality(modelo_sm):
+    resultado = normalidad_multivariada(modelo_sm.resid)
+    esperado = modelo_sm.test_normality()
+    assert resultado['estadistico'] == pytest.approx(esperado.test_statistic, rel=1e-8)
+    assert resultado['gl'] == esperado.df
+    assert resultado['p_valor'] == pytest.approx(esperado.pvalue, rel=1e-6)
+
+
+def test_diagnosticar_modelos(modelo_sm):
+    tablas = diagnosticar_modelos({2: modelo_sm}, lags_ljung=(5, 10), lag_portmanteau=2)
+    assert len(tablas['ljung_box']) == 2 * len(modelo_sm.names)
+    # Con lag_portmanteau <= p la prueba se omite en lugar de fallar
+    assert tablas['portmanteau'].empty
+    assert tablas['normalidad']['estadistico'].iloc[0] == pytest.approx(modelo_sm.test_normality().test_statistic)
+
+
+def test_evaluar_residuos_varios_modelos(ns, modelo_sm, capsys):
+    tabla = ns['evaluar_residuos_varios_modelos']({2: modelo_sm}, lags_ljung=10, mostrar_graficas=False)
+    for _, fila in tabla.iterrows():
+        esperado = acorr_ljungbox(modelo_sm.resid[fila['Variable']], lags=[10])['lb_pvalue'].iloc[0]
+        assert fila['p-valor'] == pytest.approx(esperado, rel=1e-8)
+
+
+def test_residuos_singulares(modelo_sm):
+    residuos = modelo_sm.resid.assign(x2=modelo_sm.resid['x0'])
+    with pytest.raises(np.linalg.LinAlgError):
+        normalidad_multivariada(residuos)
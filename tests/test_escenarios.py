@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from escenarios import matriz_respuesta_apilada, pronostico_condicional
+from transformaciones import PipelineTransformacion
+
+STEPS = 6
+
+
+def _media_condicional(modelo, historia, objetivos):
+    """
+    E[y | y_fijas = r] para y = f + G ε, ε ~ N(0, I), por la fórmula de la normal condicional.
+    """
+    psi = modelo.ma_rep(STEPS)
+    G = matriz_respuesta_apilada(psi, np.linalg.cholesky(modelo.sigma_u), STEPS)
+    f = modelo.forecast(historia[-modelo.k_ar:], STEPS).ravel()
+    fijas = ~np.isnan(objetivos.ravel())
+    cov = G @ G.T
+    ganancia = cov[:, fijas] @ np.linalg.inv(cov[np.ix_(fijas, fijas)])
+    return (f + ganancia @ (objetivos.ravel()[fijas] - f[fijas])).reshape(STEPS, -1)
+
+
+def test_media_condicional_gaussiana(serie, modelo_sm):
+    objetivos = np.full((2, STEPS, 3), np.nan)
+    objetivos[0, :, 0] = 0.5
+    objetivos[1, :3, 1] = [-1.0, 0.0, 1.0]
+    z = pronostico_condicional(modelo_sm, serie.values, objetivos)
+    for s in range(2):
+        np.testing.assert_allclose(z[s], _media_condicional(modelo_sm, serie.values, objetivos[s]), atol=1e-10)
+        fijas = ~np.isnan(objetivos[s])
+        np.testing.assert_allclose(z[s][fijas], objetivos[s][fijas], atol=1e-10)
+
+
+def test_sin_restricciones_es_el_pronostico(serie, modelo_sm):
+    escenarios = {'base': pd.DataFrame({'x0': [np.nan] * STEPS})}
+    z, choques = pronostico_condicional(modelo_sm, serie, escenarios, devolver_choques=True)
+    np.testing.assert_allclose(z['base'].values, modelo_sm.forecast(serie.values[-2:], STEPS), atol=1e-12)
+    assert np.all(choques['base'].values == 0)
+
+
+def test_trayectorias_en_niveles(serie, modelo_sm):
+    # Niveles positivos con log y primera diferencia en x0, escala en todas
+    niveles = pd.DataFrame(np.exp(np.cumsum(0.01 * serie.values, axis=0)), index=serie.index, columns=serie.columns)
+    pipeline = PipelineTransformacion(serie.columns)
+    pipeline.registrar_log(['x0'])
+    pipeline.registrar_diferencias(['x0'])
+    pipeline.media, pipeline.escala = np.array([0.1, 0.0, 0.2]), np.array([2.0, 1.0, 0.5])
+
+    objetivo = niveles['x0'].iloc[-1] * np.exp(0.02 * np.arange(1, STEPS + 1))
+    escenarios = {'alza': pd.DataFrame({'x0': objetivo})}
+    z = pronostico_condicional(modelo_sm, serie, escenarios, pipeline=pipeline, ultimo_nivel=niveles.values[-1])
+    np.testing.assert_allclose(z['alza']['x0'].values, objetivo, rtol=1e-10)
+
+    restricciones = pipeline.niveles_a_restricciones(objetivo[:, None] * np.array([1, np.nan, np.nan]),
+                                                     niveles.values[-1])
+    transformados = (np.log(objetivo) - np.log(niveles['x0'].iloc[-1])) / 2.0
+    np.testing.assert_allclose(restricciones[:, 0], transformados - 0.1 * np.arange(1, STEPS + 1) / 2.0)
+    assert np.isnan(restricciones[:, 1:]).all()
+
+
+def test_requiere_ultimo_nivel_y_orden_uno(serie, modelo_sm):
+    pipeline = PipelineTransformacion(serie.columns)
+    with pytest.raises(ValueError):
+        pronostico_condicional(modelo_sm, serie, np.full((STEPS, 3), np.nan), pipeline=pipeline)
+    pipeline.registrar_diferencias(['x1'], {'x1': 2})
+    with pytest.raises(ValueError):
+        pipeline.niveles_a_restricciones(np.ones((STEPS, 3)), np.ones(3))
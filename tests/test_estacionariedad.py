@@ -0,0 +1,67 @@
+import warnings
+
+import numpy as np
+import pytest
+from statsmodels.tsa.stattools import adfuller, kpss
+
+import estacionariedad
+from estacionariedad import diferenciar_hasta_estacionariedad, pruebas_estacionariedad
+
+
+@pytest.fixture(autouse=True)
+def cache_vacia(monkeypatch):
+    monkeypatch.setattr(estacionariedad, '_CACHE_MEMORIA', {})
+
+
+@pytest.fixture
+def mezcla(serie):
+    datos = serie.copy()
+    datos['x1'] = datos['x1'].cumsum()
+    return datos
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_coincide_con_statsmodels(mezcla, n_jobs):
+    resultado = pruebas_estacionariedad(mezcla, pruebas=('adf', 'kpss'), n_jobs=n_jobs)
+    for col in mezcla.columns:
+        adf = adfuller(mezcla[col].values, autolag='AIC', regression='c')
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            estadistico_kpss, p_kpss = kpss(mezcla[col].values, regression='c', nlags='auto')[:2]
+        assert resultado.loc[col, 'adf_estadistico'] == pytest.approx(adf[0])
+        assert resultado.loc[col, 'adf_p_valor'] == pytest.approx(adf[1])
+        assert resultado.loc[col, 'kpss_estadistico'] == pytest.approx(estadistico_kpss)
+        assert resultado.loc[col, 'kpss_p_valor'] == pytest.approx(p_kpss)
+        assert resultado.loc[col, 'estacionaria'] == (adf[1] < 0.05 and p_kpss >= 0.05)
+
+
+def test_cache_en_disco_evita_reejecutar(mezcla, tmp_path, monkeypatch):
+    primera = pruebas_estacionariedad(mezcla, n_jobs=1, cache_dir=str(tmp_path))
+    assert len(list(tmp_path.glob('*.json'))) == mezcla.shape[1]
+
+    monkeypatch.setattr(estacionariedad, '_CACHE_MEMORIA', {})
+    monkeypatch.setattr(estacionariedad, '_ejecutar_prueba', lambda *a: pytest.fail("no debía reejecutarse"))
+    segunda = pruebas_estacionariedad(mezcla, n_jobs=1, cache_dir=str(tmp_path))
+    assert segunda.equals(primera)
+
+
+def test_cache_distingue_parametros(mezcla):
+    c = pruebas_estacionariedad(mezcla[['x1']], n_jobs=1, regresion_adf='c')
+    ct = pruebas_estacionariedad(mezcla[['x1']], n_jobs=1, regresion_adf='ct')
+    assert ct.loc['x1', 'adf_estadistico'] == pytest.approx(adfuller(mezcla['x1'].values, regression='ct')[0])
+    assert c.loc['x1', 'adf_estadistico'] != ct.loc['x1', 'adf_estadistico']
+
+
+def test_diferenciacion_iterada(mezcla):
+    datos = mezcla.copy()
+    datos['x2'] = datos['x2'].cumsum().cumsum()
+    series_var, ordenes, rondas = diferenciar_hasta_estacionariedad(datos, max_orden=2, n_jobs=1)
+    assert ordenes == {'x0': 0, 'x1': 1, 'x2': 2}
+    assert len(rondas) == 2 and list(rondas[1].index) == ['x1', 'x2']
+    np.testing.assert_allclose(series_var['x2'].values, datos['x2'].diff().diff().dropna().values)
+    assert len(series_var) == len(datos) - 2
+
+
+def test_prueba_invalida(mezcla):
+    with pytest.raises(ValueError):
+        pruebas_estacionariedad(mezcla, pruebas=('pp',))
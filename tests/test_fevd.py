@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from fevd import fevd_a_dataframe, fevd_cholesky_vectorizado
+from girf import coeficientes_ma
+
+STEPS = 8
+
+
+def _fevd_bucles(psi, sigma_u, steps):
+    """
+    FEVD de Cholesky con los ciclos explícitos de la implementación original.
+    """
+    P = np.linalg.cholesky(sigma_u)
+    num_vars = sigma_u.shape[0]
+    fevd = np.zeros((steps, num_vars, num_vars))
+    for h in range(steps):
+        for i in range(num_vars):
+            total = sum((psi[s] @ P)[i, k] ** 2 for s in range(h + 1) for k in range(num_vars))
+            for j in range(num_vars):
+                fevd[h, j, i] = sum((psi[s] @ P)[i, j] ** 2 for s in range(h + 1)) / total
+    fevd[0] = np.eye(num_vars)
+    return fevd
+
+
+def test_coincide_con_statsmodels(modelo_sm):
+    psi = coeficientes_ma(modelo_sm.coefs, STEPS)
+    fevd = fevd_cholesky_vectorizado(psi, modelo_sm.sigma_u.values, steps=STEPS)
+    assert fevd.shape == (STEPS, 3, 3)
+    # decomp es (afectada, h, causa); en h = 0 el repositorio usa la identidad por convención
+    np.testing.assert_allclose(fevd[1:], modelo_sm.fevd(STEPS).decomp.transpose(1, 2, 0)[1:], atol=1e-12)
+    np.testing.assert_allclose(fevd, _fevd_bucles(psi, modelo_sm.sigma_u.values, STEPS), atol=1e-12)
+    np.testing.assert_allclose(fevd.sum(axis=1), 1.0)
+
+
+def test_dimensiones_de_lote(modelo_sm):
+    psi = coeficientes_ma(modelo_sm.coefs, STEPS)
+    sigma = modelo_sm.sigma_u.values
+    lote = fevd_cholesky_vectorizado(np.stack([psi, 2 * psi]), np.stack([sigma, sigma]), steps=STEPS)
+    np.testing.assert_allclose(lote[0], lote[1])
+    np.testing.assert_allclose(lote[0], fevd_cholesky_vectorizado(psi, sigma, steps=STEPS))
+
+
+def test_sigma_singular():
+    psi = np.stack([np.eye(2)] * 3)
+    with pytest.raises(np.linalg.LinAlgError):
+        fevd_cholesky_vectorizado(psi, np.array([[1.0, 1.0], [1.0, 1.0]]))
+
+
+def test_sin_horizontes(modelo_sm):
+    psi = coeficientes_ma(modelo_sm.coefs, 0)
+    assert fevd_cholesky_vectorizado(psi, modelo_sm.sigma_u.values, steps=0).shape == (0, 3, 3)
+    assert fevd_cholesky_vectorizado(np.stack([psi, psi]), modelo_sm.sigma_u.values, steps=0).shape == (2, 0, 3, 3)
+
+
+def test_calcular_fevd_cholesky(ns, modelo_sm, tmp_path):
+    fevd_df = ns['calcular_FEVD_cholesky'](modelo_sm, steps=STEPS, nombre_modelo='p2', carpeta_salida=str(tmp_path))
+    assert fevd_df.shape == (STEPS, 9)
+    assert fevd_df.index.name == 'Step'
+    decomp = modelo_sm.fevd(STEPS).decomp
+    assert fevd_df['x1_caused_by_x0'].iloc[3] == pytest.approx(decomp[1, 3, 0])
+    assert (tmp_path / 'FEVD_p2.csv').exists()
+
+    # IRF precalculada y horizonte mínimo (solo h = 0)
+    irfs = modelo_sm.irf(STEPS).irfs
+    np.testing.assert_allclose(ns['calcular_FEVD_cholesky'](modelo_sm, steps=STEPS, irfs=irfs).values, fevd_df.values)
+    np.testing.assert_allclose(ns['calcular_FEVD_cholesky'](modelo_sm, steps=1).values.reshape(3, 3), np.eye(3))
+
+
+def test_a_dataframe():
+    fevd = np.random.default_rng(0).random((4, 2, 2))
+    df = fevd_a_dataframe(fevd, ['a', 'b'])
+    assert df.columns.tolist() == ['a_caused_by_a', 'a_caused_by_b', 'b_caused_by_a', 'b_caused_by_b']
+    assert df['a_caused_by_b'].iloc[2] == fevd[2, 1, 0]
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from girf import coeficientes_ma, gfevd_pesaran_shin, girf_por_horizonte, girf_pesaran_shin, matriz_companion
+
+STEPS = 10
+
+
+def test_coeficientes_ma_y_companion(modelo_sm):
+    np.testing.assert_allclose(coeficientes_ma(modelo_sm.coefs, STEPS), modelo_sm.ma_rep(STEPS), atol=1e-12)
+    raices = np.sort(np.abs(np.linalg.eigvals(matriz_companion(modelo_sm.coefs))))
+    np.testing.assert_allclose(raices, np.sort(1 / np.abs(modelo_sm.roots)), rtol=1e-10)
+    # Dimensiones de lote
+    lote = coeficientes_ma(np.stack([modelo_sm.coefs, modelo_sm.coefs]), STEPS)
+    np.testing.assert_allclose(lote[1], modelo_sm.ma_rep(STEPS), atol=1e-12)
+
+
+def test_girf_contra_definicion(modelo_sm):
+    psi, sigma = modelo_sm.ma_rep(STEPS), modelo_sm.sigma_u.values
+    girf = girf_pesaran_shin(psi, sigma)
+    for j in range(3):
+        esperado = psi @ sigma[:, j] / np.sqrt(sigma[j, j])
+        np.testing.assert_allclose(girf[:, :, j], esperado, atol=1e-12)
+    # Para la primera variable, GIRF = IRF ortogonalizada de Cholesky
+    np.testing.assert_allclose(girf[:, :, 0], modelo_sm.irf(STEPS).orth_irfs[:, :, 0], atol=1e-12)
+
+
+def test_gfevd_contra_definicion(modelo_sm):
+    psi, sigma = modelo_sm.ma_rep(STEPS), modelo_sm.sigma_u.values
+    gfevd = gfevd_pesaran_shin(psi, sigma)
+    h, i, j = 4, 1, 2
+    numerador = sum((psi[s] @ sigma)[i, j] ** 2 for s in range(h + 1)) / sigma[j, j]
+    denominador = sum((psi[s] @ sigma @ psi[s].T)[i, i] for s in range(h + 1))
+    sin_normalizar = np.array([sum((psi[s] @ sigma)[i, k] ** 2 for s in range(h + 1)) / sigma[k, k]
+                               for k in range(3)]) / denominador
+    assert gfevd[h, j, i] == pytest.approx(numerador / denominador / sin_normalizar.sum())
+    np.testing.assert_allclose(gfevd.sum(axis=-2), 1.0)
+
+
+def test_horizonte_cero_y_sigma_singular():
+    coefs = np.array([[[0.5, 0.1], [0.0, 0.3]]])
+    sigma = np.array([[1.0, 1.0], [1.0, 1.0]])  # semidefinida: choques perfectamente correlacionados
+    recortes = girf_por_horizonte(coefs, sigma, [0, 3])
+    np.testing.assert_allclose(recortes[0][0], sigma)
+    assert recortes[3].shape == (4, 2, 2)
+    gfevd = gfevd_pesaran_shin(coeficientes_ma(coefs, 3), sigma)
+    assert np.isfinite(gfevd).all()
+    np.testing.assert_allclose(gfevd[0], 0.5)
+
+
+def test_GIRF_del_notebook(ns, modelo_sm, tmp_path):
+    resultados = ns['GIRF'](modelo_sm, [2, 5], ruta=str(tmp_path), guardar_figuras=False, calcular_gfevd=True,
+                            mostrar=False)
+    assert sorted(resultados) == [2, 5]
+    df = resultados[5]
+    assert df.shape == (6, 9)
+    girf = girf_pesaran_shin(modelo_sm.ma_rep(5), modelo_sm.sigma_u.values)
+    # El CSV conserva el orden de columnas histórico: girf (h+1, respuesta, impulso) aplanado por filas
+    np.testing.assert_allclose(df.values, girf.reshape(6, -1), atol=1e-12)
+    assert (tmp_path / 'GIRF_h5.csv').exists() and (tmp_path / 'GFEVD_h2.csv').exists()
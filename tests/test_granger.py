@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.api import VAR
+
+from granger import TODAS, causalidad_granger, matriz_granger
+from var_ols import ajustar_VAR_rango
+
+
+@pytest.mark.parametrize('tipo', ['f', 'wald'])
+def test_coincide_con_test_causality(modelo_sm, tipo):
+    tabla = causalidad_granger({2: modelo_sm}, tipo=tipo).set_index(['causa', 'efecto'])
+    for efecto in modelo_sm.names:
+        for causa in modelo_sm.names:
+            if causa == efecto:
+                continue
+            referencia = modelo_sm.test_causality(efecto, causa, kind=tipo)
+            fila = tabla.loc[(causa, efecto)]
+            assert fila['estadistico'] == pytest.approx(referencia.test_statistic, rel=1e-8)
+            assert fila['p_valor'] == pytest.approx(referencia.pvalue, rel=1e-6, abs=1e-12)
+        otras = [n for n in modelo_sm.names if n != efecto]
+        referencia = modelo_sm.test_causality(efecto, otras, kind=tipo)
+        assert tabla.loc[(TODAS, efecto), 'estadistico'] == pytest.approx(referencia.test_statistic, rel=1e-8)
+
+
+def test_modelos_ligeros_con_p_menor_que_p_max(serie):
+    modelos = ajustar_VAR_rango(serie, 3, verbose=False)[0]
+    tabla = causalidad_granger(modelos, n_jobs=2)
+    assert sorted(tabla['p'].unique()) == [1, 2, 3]
+    # Misma muestra efectiva que los VARLigero: las primeras p_max - p observaciones se descartan
+    referencia = VAR(serie.iloc[2:]).fit(1).test_causality('x0', 'x1')
+    fila = tabla[(tabla['p'] == 1) & (tabla['causa'] == 'x1') & (tabla['efecto'] == 'x0')].iloc[0]
+    assert fila['estadistico'] == pytest.approx(referencia.test_statistic, rel=1e-8)
+
+
+def test_matriz(modelo_sm, tmp_path):
+    tabla = causalidad_granger({2: modelo_sm})
+    matriz = matriz_granger(tabla, 2, ruta=str(tmp_path / 'granger.csv'))
+    assert matriz.shape == (3, 3)
+    np.testing.assert_array_equal(np.diag(matriz.values), 0.0)
+    assert (tmp_path / 'granger.csv').exists()
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from horizonte import seleccionar_horizonte
+
+
+def _horizonte_directo(modelo, tol, max_steps, paciencia):
+    """
+    Recorre la FEVD completa de statsmodels hasta max_steps y aplica el mismo criterio.
+    """
+    participaciones = modelo.fevd(max_steps + 1).decomp.transpose(1, 0, 2)
+    racha = 0
+    for h in range(2, max_steps + 1):
+        if np.max(np.abs(participaciones[h] - participaciones[h - 1])) < tol:
+            racha += 1
+            if racha >= paciencia:
+                return h
+        else:
+            racha = 0
+    return max_steps
+
+
+@pytest.mark.parametrize('tol, paciencia', [(0.05, 1), (0.01, 1), (1e-3, 3), (1e-12, 1)])
+def test_coincide_con_fevd_completa(modelo_sm, tol, paciencia):
+    max_steps = 30
+    steps, psi = seleccionar_horizonte(modelo_sm.coefs, modelo_sm.sigma_u, tol, max_steps, paciencia)
+    assert steps == _horizonte_directo(modelo_sm, tol, max_steps, paciencia)
+    np.testing.assert_allclose(psi, modelo_sm.ma_rep(steps), atol=1e-12)
+
+
+def test_horizonte_cero(modelo_sm):
+    steps, psi = seleccionar_horizonte(modelo_sm.coefs, modelo_sm.sigma_u, max_steps=0)
+    assert steps == 0
+    np.testing.assert_array_equal(psi, np.eye(3)[None])
+
+
+def test_sigma_singular(modelo_sm):
+    sigma = np.ones((3, 3))
+    with pytest.raises(np.linalg.LinAlgError):
+        seleccionar_horizonte(modelo_sm.coefs, sigma)
+
+
+def test_girf_y_fevd_usan_el_horizonte_seleccionado(ns, modelo_sm, capsys):
+    steps, _ = seleccionar_horizonte(modelo_sm.coefs, modelo_sm.sigma_u, 0.01, 40)
+    girf = ns['GIRF'](modelo_sm, None, guardar_figuras=False, guardar_datos=False, mostrar=False)
+    assert list(girf) == [steps]
+    fevd = ns['calcular_FEVD_cholesky'](modelo_sm, steps=None)
+    pd.testing.assert_frame_equal(fevd, ns['calcular_FEVD_cholesky'](modelo_sm, steps=steps))
@@ -0,0 +1,66 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def anual():
+    rng = np.random.default_rng(0)
+    indice = pd.date_range('2000-12-31', periods=12, freq='YE')
+    datos = pd.DataFrame({'a': 100 + np.cumsum(rng.normal(size=12)),
+                          'b': np.exp(np.cumsum(rng.normal(scale=0.2, size=12))),
+                          'c': rng.normal(size=12)}, index=indice)
+    datos.iloc[:2, 2] = np.nan
+    datos.iloc[6, 0] = np.nan
+    return datos
+
+
+def _por_columna(ns, anual, log_cols=(), **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return pd.DataFrame({col: ns['interpolar_escalonado'](anual[col], log_transform=col in log_cols, **kwargs)
+                             for col in anual.columns})
+
+
+def _panel(ns, anual, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return ns['interpolar_panel'](anual, **kwargs)
+
+
+@pytest.mark.parametrize('frecuencia_final', ['Q', 'M', 'D'])
+@pytest.mark.parametrize('escalonado', [True, False])
+def test_lineal_equivale_a_interpolar_escalonado(ns, anual, frecuencia_final, escalonado, capsys):
+    esperado = _por_columna(ns, anual, log_cols=('b',), frecuencia_final=frecuencia_final, escalonado=escalonado)
+    obtenido = _panel(ns, anual, frecuencia_final=frecuencia_final, escalonado=escalonado, log_cols=['b'])
+    pd.testing.assert_frame_equal(obtenido, esperado, rtol=1e-10, check_freq=False)
+
+
+@pytest.mark.parametrize('metodo', ['spline', 'polynomial'])
+@pytest.mark.parametrize('escalonado', [True, False])
+def test_spline_y_polinomio(ns, anual, metodo, escalonado, capsys):
+    datos = anual.interpolate(limit_direction='both')
+    esperado = _por_columna(ns, datos, frecuencia_final='M', metodo=metodo, escalonado=escalonado)
+    obtenido = _panel(ns, datos, frecuencia_final='M', metodo=metodo, escalonado=escalonado)
+    pd.testing.assert_frame_equal(obtenido, esperado, rtol=1e-8, check_freq=False)
+
+
+def test_ffill(ns, anual, capsys):
+    esperado = _por_columna(ns, anual, frecuencia_final='D', metodo='ffill')
+    pd.testing.assert_frame_equal(_panel(ns, anual, frecuencia_final='D', metodo='ffill'), esperado, check_freq=False)
+
+
+def test_log_sin_revertir(ns, anual):
+    obtenido = _panel(ns, anual, frecuencia_final='Q', log_cols=['b'], revert_log=False)
+    np.testing.assert_allclose(obtenido['b'].iloc[::4].values, np.log(anual['b'].values))
+
+
+def test_validaciones(ns, anual):
+    with pytest.raises(ValueError):
+        _panel(ns, anual, frecuencia_final='W')
+    with pytest.raises(ValueError):
+        _panel(ns, anual.assign(a=-1.0), log_cols=['a'])
+    with pytest.raises(ValueError):
+        _panel(ns, anual['a'])
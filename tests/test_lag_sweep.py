@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.api import VAR
+
+from lag_sweep import barrido_rezagos
+
+REZAGOS = [1, 2, 3]
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_coincide_con_ajustes_individuales(serie, n_jobs):
+    modelos, tabla = barrido_rezagos(serie, REZAGOS, n_jobs=n_jobs, estimador='statsmodels', verbose=False)
+    assert sorted(modelos) == REZAGOS
+    for p in REZAGOS:
+        referencia = VAR(serie).fit(p)
+        np.testing.assert_allclose(modelos[p].params, referencia.params, atol=1e-12)
+        assert tabla.loc[('base', p), 'AIC'] == pytest.approx(referencia.aic)
+        assert tabla.loc[('base', p), 'nobs'] == len(serie) - p
+
+
+def test_muestra_comun_e_incremental(serie):
+    _, comun = barrido_rezagos(serie, REZAGOS, n_jobs=1, muestra_comun=True, estimador='statsmodels', verbose=False)
+    modelos, incremental = barrido_rezagos(serie, REZAGOS, n_jobs=1, verbose=False)
+    assert (comun['nobs'] == len(serie) - max(REZAGOS)).all()
+    assert (incremental['nobs'] == len(serie) - max(REZAGOS)).all()
+    np.testing.assert_allclose(incremental[['AIC', 'BIC', 'HQC']], comun[['AIC', 'BIC', 'HQC']], rtol=1e-8)
+    for p in REZAGOS:
+        referencia = VAR(serie.iloc[max(REZAGOS) - p:]).fit(p)
+        np.testing.assert_allclose(modelos[p].params, referencia.params, atol=1e-10)
+    with pytest.raises(ValueError):
+        barrido_rezagos(serie, REZAGOS, muestra_comun=False, verbose=False)
+
+
+def test_variantes(serie):
+    variantes = {'recortada': serie.iloc[50:]}
+    modelos, tabla = barrido_rezagos(serie, [1, 2], variantes=variantes, n_jobs=2, estimador='statsmodels',
+                                     verbose=False)
+    assert sorted(modelos) == [('base', 1), ('base', 2), ('recortada', 1), ('recortada', 2)]
+    assert tabla.loc[('recortada', 2), 'nobs'] == len(serie) - 52
+    with pytest.raises(ValueError):
+        barrido_rezagos(serie, [1], estimador='otro', verbose=False)
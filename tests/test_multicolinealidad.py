@@ -0,0 +1,68 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+import statsmodels.api as sm
+from statsmodels.stats.outliers_influence import variance_inflation_factor
+
+
+@pytest.fixture
+def candidatas(serie):
+    rng = np.random.default_rng(1)
+    datos = serie.copy()
+    datos['x3'] = datos['x0'] + 0.1 * rng.standard_normal(len(datos))
+    datos['x4'] = datos['x0'] - datos['x1'] + 0.05 * rng.standard_normal(len(datos))
+    datos['x5'] = rng.standard_normal(len(datos))
+    return datos
+
+
+def _vif_directo(datos):
+    diseno = sm.add_constant(datos).values
+    return pd.Series([variance_inflation_factor(diseno, j + 1) for j in range(datos.shape[1])], index=datos.columns)
+
+
+def test_pares_contra_bucle(ns, candidatas, capsys):
+    corr = candidatas.corr().abs()
+    esperado = sorted(((b, a, corr.loc[a, b]) for a, b in itertools.combinations(candidatas.columns, 2)
+                       if corr.loc[a, b] > 0.5), key=lambda par: -par[2])
+    obtenido = ns['analizar_multicolinealidad_para_VAR'](candidatas, umbral_corr=0.5, verbose=False)
+    assert [(a, b) for a, b, _ in obtenido] == [(a, b) for a, b, _ in esperado]
+    np.testing.assert_allclose([c for *_, c in obtenido], [c for *_, c in esperado])
+    # Mismos mensajes que la versión original
+    assert capsys.readouterr().out == "No hay alta correlación.\n"
+    ns['analizar_multicolinealidad_para_VAR'](candidatas, umbral_corr=0.5)
+    assert capsys.readouterr().out.count("⚠️ Alta correlación") == len(esperado)
+
+
+def test_vif_y_condicion(ns, candidatas):
+    resultado = ns['diagnostico_multicolinealidad'](candidatas, sugerir_eliminacion=False, verbose=False)
+    vif = resultado['vif']
+    assert list(vif.values) == sorted(vif.values, reverse=True)
+    pd.testing.assert_series_equal(vif.sort_index(), _vif_directo(candidatas).sort_index(), rtol=1e-8)
+
+    estandarizado = (candidatas - candidatas.mean()) / candidatas.std()
+    assert resultado['numero_condicion'] == pytest.approx(np.linalg.cond(estandarizado.values))
+    assert resultado['eliminar'] == []
+
+
+def test_eliminacion_voraz_contra_reinversion(ns, candidatas):
+    umbral = 5.0
+    esperado, activas = [], list(candidatas.columns)
+    while len(activas) > 1:
+        vif = _vif_directo(candidatas[activas])
+        if vif.max() <= umbral:
+            break
+        esperado.append(vif.idxmax())
+        activas.remove(vif.idxmax())
+
+    resultado = ns['diagnostico_multicolinealidad'](candidatas, umbral_vif=umbral, verbose=False)
+    assert esperado and resultado['eliminar'] == esperado
+
+
+def test_columnas_exactamente_colineales(ns, candidatas):
+    datos = candidatas.assign(x6=candidatas['x0'] + candidatas['x1'])
+    resultado = ns['diagnostico_multicolinealidad'](datos, verbose=False)
+    assert np.isfinite(resultado['numero_condicion']) and resultado['numero_condicion'] > 1e6
+    assert np.isfinite(resultado['vif']).all()
+    assert {'x0', 'x1', 'x6'} & set(resultado['eliminar'])
@@ -0,0 +1,80 @@
+import json
+import threading
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from perfilado import Perfilador, desinstrumentar, instrumentar
+
+
+def _asignar(megas, esperar=None):
+    bloque = np.ones(megas * 2 ** 17)  # megas MB de float64
+    if esperar is not None:
+        esperar.wait()
+    return bloque.sum()
+
+
+def test_pico_anidado():
+    with Perfilador() as perfilador:
+        with perfilador.medir('externo'):
+            _asignar(8)
+            with perfilador.medir('interno'):
+                _asignar(4)
+    registros = {r['nombre']: r for r in perfilador.registros}
+    assert registros['interno']['nivel'] == 1
+    assert registros['interno']['memoria_pico_mb'] == pytest.approx(4, rel=0.1)
+    assert registros['externo']['memoria_pico_mb'] >= 8
+    assert not tracemalloc.is_tracing()
+
+
+def test_hilos_concurrentes_sin_picos_negativos():
+    perfilador = Perfilador()
+    barrera = threading.Barrier(4)
+
+    def trabajo(i):
+        with perfilador.medir('hilo', i=i):
+            _asignar(2 + i, barrera)
+
+    hilos = [threading.Thread(target=trabajo, args=(i,)) for i in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    with perfilador.medir('solo'):
+        _asignar(4)
+    perfilador.cerrar()
+
+    memoria = {r.get('i', r['nombre']): r['memoria_pico_mb'] for r in perfilador.registros}
+    # Los bloques superpuestos no se atribuyen memoria; el posterior vuelve a medirse
+    assert all(memoria[i] is None for i in range(4))
+    assert memoria['solo'] == pytest.approx(4, rel=0.1)
+    assert not tracemalloc.is_tracing()
+
+
+def test_no_detiene_tracemalloc_ajeno():
+    tracemalloc.start()
+    try:
+        with Perfilador() as perfilador:
+            with perfilador.medir('bloque'):
+                _asignar(1)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_instrumentar_y_guardar(tmp_path):
+    espacio = {'ajustar_VAR': lambda x: x + 1}
+    perfilador = instrumentar(espacio, memoria=False)
+    assert espacio['ajustar_VAR'](1) == 2
+    with pytest.raises(TypeError):
+        espacio['ajustar_VAR']()
+    desinstrumentar(espacio)
+    assert not hasattr(espacio['ajustar_VAR'], '__perfilador__')
+
+    ruta = perfilador.guardar(str(tmp_path / 'perfil.json'))
+    with open(ruta, encoding='utf-8') as f:
+        registros = json.load(f)['registros']
+    assert [r.get('error') for r in registros] == [None, 'TypeError']
+    assert 'memoria_pico_mb' not in registros[0]
+    assert perfilador.resumen().loc['ajustar_VAR', 'llamadas'] == 2
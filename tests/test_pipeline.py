@@ -0,0 +1,142 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.api import VAR
+
+import pipeline
+
+
+@pytest.fixture(scope='module')
+def niveles(serie):
+    datos = serie.copy()
+    datos['x0'] = 100 + datos['x0'].cumsum()
+    datos.index.name = 'fecha'
+    return datos
+
+
+@pytest.fixture
+def ctx(niveles, tmp_path):
+    ruta = tmp_path / 'datos.xlsx'
+    niveles.reset_index().to_excel(ruta, index=False)
+    return {
+        'datos': str(ruta), 'columna_fecha': 'fecha', 'salida': str(tmp_path / 'salida'),
+        'cache_dir': str(tmp_path / 'cache'), 'rezagos': [1, 2], 'steps': 10, 'horizontes_girf': [10],
+        'lags_ljung': [10], 'alpha': 0.05, 'umbral_corr': 0.9, 'proporcion_train': 0.8, 'n_jobs': 2,
+        'dpi': 20, 'escala_figuras': 0.5,
+    }
+
+
+OBJETIVOS = ['criterios', 'fevd_p2', 'diagnosticos_p1']
+
+
+def test_dag_y_objetivos(ctx):
+    etapas = pipeline.construir_etapas(ctx)
+    assert etapas['figuras'].dependencias == ['irf_p1', 'fevd_p1', 'girf_p1', 'irf_p2', 'fevd_p2', 'girf_p2']
+    assert pipeline._cierre(etapas, ['fevd_p2']) == {'datos', 'preprocesamiento', 'ajuste_p2', 'fevd_p2'}
+    with pytest.raises(ValueError):
+        pipeline.ejecutar_pipeline(ctx, objetivos=['no_existe'], verbose=False)
+
+
+def test_resultados_coinciden_con_el_notebook(ctx, niveles, ns, capsys):
+    resumen = pipeline.ejecutar_pipeline(ctx, objetivos=OBJETIVOS, verbose=False)
+    assert set(resumen.index) == {'datos', 'preprocesamiento', 'ajuste_p1', 'ajuste_p2', *OBJETIVOS}
+    assert (resumen['estado'] == 'ejecutada').all()
+
+    series_var, *_ = ns['preprocesar_series_para_VAR'](niveles, verbose=False)
+    n_train = int(len(series_var) * ctx['proporcion_train'])
+    train, _, _ = ns['estandarizar_train_test'](series_var.iloc[:n_train], series_var.iloc[n_train:])
+    criterios = pd.read_csv(os.path.join(ctx['salida'], 'criterios.csv'), index_col='p')
+    for p in ctx['rezagos']:
+        modelo = VAR(train).fit(p)
+        assert criterios.loc[p, 'AIC'] == pytest.approx(modelo.aic)
+        assert criterios.loc[p, 'nobs'] == modelo.nobs
+
+    fevd = pd.read_csv(os.path.join(ctx['salida'], 'p2', 'FEVD_p2.csv'), index_col='Step')
+    esperado = ns['calcular_FEVD_cholesky'](VAR(train).fit(2), steps=ctx['steps'])
+    np.testing.assert_allclose(fevd.values, esperado.values, atol=1e-10)
+
+
+def test_segunda_ejecucion_al_dia_y_salidas_faltantes(ctx, capsys):
+    pipeline.ejecutar_pipeline(ctx, objetivos=OBJETIVOS, verbose=False)
+    assert (pipeline.ejecutar_pipeline(ctx, objetivos=OBJETIVOS, verbose=False)['estado'] == 'al día').all()
+
+    os.remove(os.path.join(ctx['salida'], 'p2', 'params.csv'))
+    estados = pipeline.ejecutar_pipeline(ctx, objetivos=OBJETIVOS, verbose=False)['estado']
+    assert set(estados[estados == 'ejecutada'].index) == {'ajuste_p2', 'fevd_p2', 'criterios'}
+
+    ctx['alpha'] = 0.1
+    estados = pipeline.ejecutar_pipeline(ctx, objetivos=OBJETIVOS, verbose=False)['estado']
+    assert (estados.drop('datos') == 'ejecutada').all() and estados['datos'] == 'al día'
+
+
+def test_huella_cubre_modulos_importados(ctx, tmp_path, monkeypatch, capsys):
+    codigo = tmp_path / 'code'
+    shutil.copytree(pipeline.DIRECTORIO_CODIGO, codigo, ignore=shutil.ignore_patterns('__pycache__'))
+    monkeypatch.setattr(pipeline, 'DIRECTORIO_CODIGO', str(codigo))
+    assert 'girf.py' in pipeline.cierre_codigo(['05_irf_fevd_analysis.py'])
+
+    objetivos = ['irf_p1', 'fevd_p2', 'diagnosticos_p1']
+    pipeline.ejecutar_pipeline(ctx, objetivos=objetivos, verbose=False)
+    with open(codigo / 'girf.py', 'a', encoding='utf-8') as f:
+        f.write('\n# cambio\n')
+    estados = pipeline.ejecutar_pipeline(ctx, objetivos=objetivos, verbose=False)['estado']
+    assert (estados[['irf_p1', 'fevd_p2']] == 'ejecutada').all()
+    assert (estados[['datos', 'preprocesamiento', 'ajuste_p1', 'ajuste_p2']] == 'al día').all()
+
+
+def test_steps_automatico_comparte_horizonte(ctx, capsys):
+    ctx['steps'] = None
+    pipeline.ejecutar_pipeline(ctx, objetivos=['irf_p2', 'fevd_p2', 'girf_p2'], verbose=False)
+    carpeta = os.path.join(ctx['salida'], 'p2')
+    h = len(pd.read_csv(os.path.join(carpeta, 'IRF_p2.csv'))) - 1
+    assert len(pd.read_csv(os.path.join(carpeta, 'FEVD_p2.csv'))) == h
+    assert sorted(f for f in os.listdir(carpeta) if f.startswith('GIRF_h')) == [f'GIRF_h{h}.csv']
+
+
+def test_error_bloquea_dependientes(ctx, monkeypatch, capsys):
+    def falla(ctx, preprocesamiento, p):
+        raise RuntimeError('falla')
+
+    monkeypatch.setattr(pipeline, 'etapa_ajuste', falla)
+    estados = pipeline.ejecutar_pipeline(ctx, objetivos=OBJETIVOS, verbose=False)['estado']
+    assert estados[['ajuste_p1', 'ajuste_p2', 'diagnosticos_p1', 'fevd_p2', 'criterios']].eq('error').all()
+    assert estados['preprocesamiento'] == 'ejecutada'
+
+
+def test_importar_pipeline_no_carga_scipy_stats():
+    codigo = "import sys, pipeline; print('scipy.stats' in sys.modules)"
+    salida = subprocess.run([sys.executable, '-c', codigo], cwd=pipeline.DIRECTORIO_CODIGO, capture_output=True,
+                            text=True, check=True).stdout
+    assert salida.strip() == 'False'
+
+
+def test_listar(ctx, capsys):
+    assert pipeline.main(['--datos', ctx['datos'], '--rezagos', '1', '--listar']) == 0
+    assert 'figuras: irf_p1, fevd_p1, girf_p1' in capsys.readouterr().out
+
+
+def test_perfil_tiempos_y_memoria_opcional(ctx, tmp_path, capsys):
+    import json
+    import tracemalloc
+
+    base = ['--datos', ctx['datos'], '--salida', ctx['salida'], '--cache-dir', ctx['cache_dir'],
+            '--rezagos', '1', '--etapas', 'ajuste_p1', '--n-jobs', '2', '--forzar']
+
+    def registros(ruta, *extra):
+        assert pipeline.main(base + ['--perfil', ruta, *extra]) == 0
+        with open(ruta, encoding='utf-8') as f:
+            return [r for r in json.load(f)['registros'] if r['nombre'] == 'etapa']
+
+    solo_tiempo = registros(str(tmp_path / 'tiempo.json'))
+    assert solo_tiempo and all('memoria_pico_mb' not in r and r['segundos'] > 0 for r in solo_tiempo)
+    con_memoria = registros(str(tmp_path / 'memoria.json'), '--perfil-memoria')
+    assert all(r['memoria_pico_mb'] is not None for r in con_memoria)
+    assert '--n-jobs 1' in capsys.readouterr().out
+    assert not tracemalloc.is_tracing()
+    with pytest.raises(SystemExit):
+        pipeline.main(base + ['--perfil-memoria'])
@@ -0,0 +1,99 @@
+import matplotlib.image
+import numpy as np
+import pandas as pd
+import pytest
+
+import render
+
+from render import (figura_fevd, figura_girf, figura_irf, nombres_desde_columnas_girf, renderizar_figuras,
+                    trabajos_desde_carpeta)
+
+NOMBRES = ['pib', 'gas_natural', 'x_2']
+
+
+@pytest.fixture
+def carpeta(tmp_path):
+    rng = np.random.default_rng(0)
+    pasos = pd.Index(range(6), name='Step')
+    girf = [f'{a}_to_{b}' for b in NOMBRES for a in NOMBRES]
+    pd.DataFrame(rng.normal(size=(6, 9)), columns=girf).to_csv(tmp_path / 'GIRF_h5.csv', index=False)
+    irf = [f'{a}_resp_to_{b}' for a in NOMBRES for b in NOMBRES]
+    pd.DataFrame(rng.normal(size=(6, 9)), index=pasos, columns=irf).to_csv(tmp_path / 'IRF_p2.csv')
+    fevd = rng.dirichlet(np.ones(3), size=(6, 3)).reshape(6, 9)
+    columnas = [f'{a}_caused_by_{b}' for a in NOMBRES for b in NOMBRES]
+    pd.DataFrame(fevd, index=pasos, columns=columnas).to_csv(tmp_path / 'FEVD_p2.csv')
+    (tmp_path / 'otros.csv').write_text('a\n1\n')
+    return tmp_path
+
+
+def test_nombres_desde_columnas_girf():
+    assert nombres_desde_columnas_girf([f'{a}_to_{b}' for b in NOMBRES for a in NOMBRES]) == NOMBRES
+
+
+def test_figuras_contienen_los_datos(carpeta):
+    girf = np.arange(6 * 9, dtype=float).reshape(6, 3, 3)
+    fig = figura_girf(girf, NOMBRES, 5)
+    for n, ax in enumerate(fig.axes[:9]):
+        np.testing.assert_array_equal(ax.lines[0].get_ydata(), girf[:, n // 3, n % 3])
+        assert ax.get_xlim() == (0, 5)
+        assert ax.xaxis.get_tick_params()['labelbottom'] == (n >= 6)
+
+    irf = pd.read_csv(carpeta / 'IRF_p2.csv', index_col='Step')
+    fig = figura_irf(irf)
+    for n, col in enumerate(irf.columns):
+        np.testing.assert_array_equal(fig.axes[n].lines[0].get_ydata(), irf[col].values)
+
+    fevd = pd.read_csv(carpeta / 'FEVD_p2.csv', index_col='Step')
+    fig = figura_fevd(fevd)
+    for ax, var in zip(fig.axes, sorted(NOMBRES)):
+        alturas = np.array([barra.get_height() for barra in ax.patches]).reshape(3, -1)
+        np.testing.assert_allclose(alturas.sum(axis=0), fevd.filter(like=f'{var}_caused_by_').sum(axis=1))
+
+
+def test_trabajos_desde_carpeta(carpeta):
+    trabajos = trabajos_desde_carpeta(str(carpeta), formato='svg')
+    assert {(t['tipo'], t['salida'].rsplit('/', 1)[-1]) for t in trabajos} == {
+        ('girf', 'GIRF_h5.svg'), ('irf', 'IRF_p2.svg'), ('fevd', 'FEVD_p2.svg')}
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_renderiza_solo_cambios(carpeta, n_jobs):
+    trabajos = trabajos_desde_carpeta(str(carpeta), dpi=20)
+    primera = renderizar_figuras(trabajos, n_jobs=n_jobs, verbose=False)
+    assert (primera['estado'] == 'renderizada').all()
+    assert all((carpeta / t['salida'].rsplit('/', 1)[-1]).stat().st_size > 0 for t in trabajos)
+
+    assert (renderizar_figuras(trabajos, n_jobs=n_jobs, verbose=False)['estado'] == 'sin cambios').all()
+
+    irf = pd.read_csv(carpeta / 'IRF_p2.csv', index_col='Step')
+    (irf * 2).to_csv(carpeta / 'IRF_p2.csv')
+    (carpeta / 'GIRF_h5.png').unlink()
+    estados = renderizar_figuras(trabajos, n_jobs=n_jobs, verbose=False).set_index('salida')['estado']
+    assert estados.to_dict() == {str(carpeta / 'FEVD_p2.png'): 'sin cambios',
+                                 str(carpeta / 'GIRF_h5.png'): 'renderizada',
+                                 str(carpeta / 'IRF_p2.png'): 'renderizada'}
+    assert (renderizar_figuras(trabajos, forzar=True, n_jobs=n_jobs, verbose=False)['estado'] == 'renderizada').all()
+
+
+def test_dpi_y_escala(carpeta):
+    trabajos = [t for t in trabajos_desde_carpeta(str(carpeta), dpi=10) if t['tipo'] == 'fevd']
+    renderizar_figuras(trabajos, n_jobs=1, verbose=False)
+    alto, ancho = matplotlib.image.imread(trabajos[0]['salida']).shape[:2]
+
+    trabajos[0]['escala'] = 0.5
+    assert renderizar_figuras(trabajos, n_jobs=1, verbose=False)['estado'].iloc[0] == 'renderizada'
+    alto_medio, ancho_medio = matplotlib.image.imread(trabajos[0]['salida']).shape[:2]
+    assert ancho_medio == pytest.approx(ancho / 2, rel=0.1) and alto_medio == pytest.approx(alto / 2, rel=0.1)
+
+
+def test_sin_pool_con_un_nucleo(carpeta, monkeypatch):
+    monkeypatch.setattr(render.os, 'cpu_count', lambda: 1)
+    monkeypatch.setattr(render, 'ProcessPoolExecutor', lambda *a, **k: pytest.fail("no debía crear procesos"))
+    resumen = renderizar_figuras(trabajos_desde_carpeta(str(carpeta), dpi=10), n_jobs=4, verbose=False)
+    assert (resumen['estado'] == 'renderizada').all()
+
+
+def test_tipo_invalido(carpeta):
+    with pytest.raises(ValueError):
+        renderizar_figuras([{'tipo': 'otro', 'csv': str(carpeta / 'otros.csv'), 'salida': str(carpeta / 'o.png')}],
+                           n_jobs=1, verbose=False)
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from render import nueva_figura
+from simulacion import CUANTILES, abanico_a_dataframe, figura_abanico, simular_trayectorias
+
+STEPS = 8
+
+
+def test_media_converge_al_pronostico(serie, modelo_sm):
+    resultado = simular_trayectorias(modelo_sm, serie, STEPS, n_trayectorias=20000, semilla=0, dtype=np.float64)
+    pronostico = modelo_sm.forecast(serie.values[-2:], STEPS)
+    error_estandar = np.sqrt(np.diagonal(modelo_sm.forecast_cov(STEPS), axis1=1, axis2=2) / 20000)
+    assert np.all(np.abs(resultado['media'] - pronostico) < 5 * error_estandar)
+    assert resultado['cuantiles'].shape == (len(CUANTILES), STEPS, 3)
+
+
+def test_bloques_no_cambian_cuantiles_exactos(serie, modelo_sm):
+    kwargs = dict(n_trayectorias=1000, semilla=1, tamano_bloque=250, dtype=np.float64)
+    completo = simular_trayectorias(modelo_sm, serie, STEPS, guardar_trayectorias=True, **kwargs)
+    np.testing.assert_allclose(completo['cuantiles'], np.quantile(completo['trayectorias'], CUANTILES, axis=0))
+    sin_guardar = simular_trayectorias(modelo_sm, serie, STEPS, **kwargs)
+    np.testing.assert_array_equal(sin_guardar['cuantiles'], completo['cuantiles'])
+
+
+def test_cuantiles_aproximados_por_histograma(serie, modelo_sm):
+    kwargs = dict(n_trayectorias=20000, semilla=2, tamano_bloque=2000, dtype=np.float64)
+    exacto = simular_trayectorias(modelo_sm, serie, STEPS, guardar_trayectorias=True, **kwargs)
+    aproximado = simular_trayectorias(modelo_sm, serie, STEPS, exacto=False, bins=1000, **kwargs)
+    rango = exacto['trayectorias'].max(axis=0) - exacto['trayectorias'].min(axis=0)
+    assert np.all(np.abs(aproximado['cuantiles'] - exacto['cuantiles']) <= 2 * rango / 1000)
+    np.testing.assert_allclose(aproximado['media'], exacto['media'])
+    with pytest.raises(ValueError):
+        simular_trayectorias(modelo_sm, serie, STEPS, exacto=False, guardar_trayectorias=True)
+
+
+def test_abanico(serie, modelo_sm):
+    resultado = simular_trayectorias(modelo_sm, serie, STEPS, n_trayectorias=200, semilla=0)
+    df = abanico_a_dataframe(resultado)
+    assert df.shape == (STEPS, 3 * (len(CUANTILES) + 1))
+    fig = figura_abanico(resultado, 'x1', historia=serie['x1'].iloc[-20:])
+    assert len(fig.axes) == 1
+    assert nueva_figura((4, 3)).get_size_inches().tolist() == [4, 3]
+
+
+def test_histograma_se_amplia_con_colas_pesadas(serie, modelo_sm, monkeypatch):
+    import simulacion
+
+    # Choques t de Student (2 g.l.): el primer bloque no anticipa los extremos de los siguientes
+    def bloque_t(rng, companion, intercept, P, estado_inicial, steps, n):
+        return rng.standard_t(2, size=(n, steps, P.shape[0]))
+
+    monkeypatch.setattr(simulacion, '_simular_bloque', bloque_t)
+    colas = (0.01, 0.05, 0.5, 0.95, 0.99)
+    kwargs = dict(n_trayectorias=20000, semilla=3, tamano_bloque=20, dtype=np.float64, cuantiles=colas)
+    exacto = simular_trayectorias(modelo_sm, serie, STEPS, guardar_trayectorias=True, **kwargs)
+    aproximado = simular_trayectorias(modelo_sm, serie, STEPS, exacto=False, bins=2000, **kwargs)
+    rango = exacto['trayectorias'].max(axis=0) - exacto['trayectorias'].min(axis=0)
+    assert np.all(np.abs(aproximado['cuantiles'] - exacto['cuantiles']) <= 2 * rango / 2000)
+
+
+def test_modo_por_defecto_segun_tamano(serie, modelo_sm, monkeypatch):
+    import simulacion
+
+    pequeno = simular_trayectorias(modelo_sm, serie, STEPS, n_trayectorias=500, semilla=4, dtype=np.float64)
+    exacto = simular_trayectorias(modelo_sm, serie, STEPS, n_trayectorias=500, semilla=4, dtype=np.float64,
+                                  exacto=True)
+    np.testing.assert_array_equal(pequeno['cuantiles'], exacto['cuantiles'])
+
+    monkeypatch.setattr(simulacion, 'LIMITE_EXACTO_BYTES', 1024)
+    monkeypatch.setattr(simulacion, 'BYTES_POR_BLOQUE', 8 * STEPS * 3 * 100)
+    grande = simular_trayectorias(modelo_sm, serie, STEPS, n_trayectorias=500, semilla=4, dtype=np.float64)
+    histograma = simular_trayectorias(modelo_sm, serie, STEPS, n_trayectorias=500, semilla=4, dtype=np.float64,
+                                      exacto=False, tamano_bloque=100)
+    np.testing.assert_array_equal(grande['cuantiles'], histograma['cuantiles'])
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from transformaciones import PipelineTransformacion
+
+
+@pytest.fixture
+def niveles(serie):
+    datos = serie.copy()
+    datos['x0'] = 100 + datos['x0'].cumsum()
+    datos['x1'] = np.exp(0.05 * datos['x1'].cumsum())
+    return datos
+
+
+def _pipeline(niveles, ordenes=None):
+    pipeline = PipelineTransformacion()
+    pipeline.registrar_log(['x1'])
+    pipeline.registrar_diferencias(['x0', 'x1'], ordenes)
+    transformadas = pipeline.transformar(niveles)
+    scaler = StandardScaler().fit(transformadas)
+    pipeline.registrar_escala(scaler, list(niveles.columns))
+    return pipeline, pipeline.transformar(niveles)
+
+
+def test_transformar_coincide_con_pandas(niveles):
+    pipeline, transformadas = _pipeline(niveles)
+    esperado = pd.concat([niveles['x0'].diff(), np.log(niveles['x1']).diff(), niveles['x2']], axis=1).iloc[1:]
+    esperado = (esperado - esperado.mean()) / esperado.std(ddof=0)
+    pd.testing.assert_frame_equal(transformadas, esperado, check_freq=False)
+
+
+@pytest.mark.parametrize('ordenes', [None, {'x0': 2}])
+def test_invertir_recupera_niveles(niveles, ordenes):
+    pipeline, transformadas = _pipeline(niveles, ordenes)
+    d = pipeline.orden_maximo
+    origen, steps = 150, 20
+    # Posición `origen` de `transformadas` corresponde a la fila origen + d de `niveles`
+    futuro = transformadas.values[origen:origen + steps]
+    previos = niveles.values[origen:origen + d]
+    recuperado = pipeline.invertir(futuro, niveles.values[origen + d - 1], niveles_previos=previos)
+    np.testing.assert_allclose(recuperado, niveles.values[origen + d:origen + d + steps], rtol=1e-10)
+
+
+def test_invertir_por_lotes(niveles):
+    pipeline, transformadas = _pipeline(niveles)
+    rng = np.random.default_rng(0)
+    trayectorias = rng.normal(size=(5, 10, 3))
+    ultimo = niveles.values[99]
+    lote = pipeline.invertir(trayectorias, ultimo)
+    assert lote.shape == trayectorias.shape
+    for n in range(len(trayectorias)):
+        np.testing.assert_allclose(lote[n], pipeline.invertir(trayectorias[n], ultimo))
+
+
+def test_orden_dos_requiere_niveles_previos(niveles):
+    pipeline, transformadas = _pipeline(niveles, {'x0': 2})
+    with pytest.raises(ValueError):
+        pipeline.invertir(transformadas.values[:5], niveles.values[1])
+
+
+def test_log_rechaza_no_positivos(niveles):
+    pipeline = PipelineTransformacion()
+    pipeline.registrar_log(['x2'])
+    with pytest.raises(ValueError):
+        pipeline.transformar(niveles)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.api import VAR
+
+from var_ols import VARIncremental, VARLigero, ajustar_VAR_rango, matriz_diseno_rezagada
+
+P_MAX = 4
+
+
+@pytest.fixture(scope='module')
+def modelos(serie):
+    return ajustar_VAR_rango(serie, P_MAX, verbose=False)[0]
+
+
+@pytest.mark.parametrize('metodo', ['qr', 'cholesky'])
+@pytest.mark.parametrize('p', [1, 2, P_MAX])
+def test_coincide_con_statsmodels_en_muestra_comun(serie, metodo, p):
+    modelo = VARIncremental(serie, P_MAX, metodo=metodo).ajustar(p)
+    referencia = VAR(serie.iloc[P_MAX - p:]).fit(p)
+
+    np.testing.assert_allclose(modelo.params, referencia.params.values, atol=1e-10)
+    np.testing.assert_allclose(modelo.sigma_u, referencia.sigma_u.values, atol=1e-10)
+    np.testing.assert_allclose(modelo.resid.values, referencia.resid.values, atol=1e-10)
+    np.testing.assert_allclose(modelo.endog_lagged, referencia.endog_lagged, atol=1e-12)
+    for criterio in ('aic', 'bic', 'hqic', 'fpe'):
+        assert getattr(modelo, criterio) == pytest.approx(getattr(referencia, criterio), rel=1e-8)
+    assert modelo.is_stable() == referencia.is_stable()
+
+
+def test_endog_es_la_muestra_propia_del_modelo(modelos):
+    # p < p_max: endog conserva solo los p valores iniciales que usa el modelo
+    modelo = modelos[1]
+    assert modelo.endog.shape[0] == modelo.nobs + modelo.k_ar
+    Y, X = matriz_diseno_rezagada(modelo.endog, modelo.k_ar)
+    np.testing.assert_allclose(X, modelo.endog_lagged)
+    np.testing.assert_allclose(Y - X @ modelo.params, modelo.resid.values)
+
+
+def test_diseno_desde_endog(modelos):
+    modelo = modelos[2]
+    reconstruido = VARLigero(modelo.params, modelo.sigma_u, modelo.nobs, modelo.names, endog=modelo.endog)
+    np.testing.assert_allclose(reconstruido.resid.values, modelo.resid.values)
+
+
+def test_irf_y_pronostico(serie, modelo_sm):
+    modelo = VARIncremental(serie, 2).ajustar(2)
+    irf, referencia = modelo.irf(10), modelo_sm.irf(10)
+    np.testing.assert_allclose(irf.irfs, referencia.irfs, atol=1e-10)
+    np.testing.assert_allclose(irf.orth_irfs, referencia.orth_irfs, atol=1e-10)
+    np.testing.assert_allclose(modelo.forecast(serie.values[-2:], 5),
+                               modelo_sm.forecast(serie.values[-2:], 5), atol=1e-10)
+
+
+def test_irf_horizonte_cero(modelos):
+    irf = modelos[2].irf(0)
+    assert irf.irfs.shape == (1, 3, 3)
+    np.testing.assert_allclose(irf.irfs[0], np.eye(3))
+
+
+def test_p_fuera_de_rango(serie):
+    with pytest.raises(ValueError):
+        VARIncremental(serie, 2).ajustar(3)
+
+
+def test_graficar_irf_sin_plot(ns, modelos, tmp_path):
+    irf_df, irf = ns['graficar_IRF'](modelos[2], {}, steps=5, nombre_modelo='ligero', carpeta_salida=str(tmp_path))
+    assert not hasattr(irf, 'plot')
+    assert irf_df.shape == (6, 9)
+    assert (tmp_path / 'IRF_ligero.png').exists()
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.api import VAR
+from statsmodels.tsa.vector_ar.vecm import VECM, coint_johansen, select_coint_rank
+
+from vecm import CASOS, Johansen, ajustar_VECM
+
+P = 3
+DET_ORDER = {'n': -1, 'co': 0}
+
+
+@pytest.fixture(scope='module')
+def niveles():
+    """
+    x0 y x1 comparten una tendencia estocástica (rango 1 con x2 independiente).
+    """
+    rng = np.random.default_rng(0)
+    T = 400
+    w = np.cumsum(rng.normal(size=T))
+    datos = np.column_stack([w + rng.normal(size=T), 2 * w + 0.5 * rng.normal(size=T),
+                             np.cumsum(rng.normal(size=T))]) + 0.01 * np.arange(T)[:, None]
+    return pd.DataFrame(datos, index=pd.date_range('2000-01-01', periods=T, freq='D'), columns=['a', 'b', 'c'])
+
+
+@pytest.fixture(scope='module')
+def johansen(niveles):
+    return Johansen(niveles, P)
+
+
+@pytest.mark.parametrize('caso', ['n', 'co'])
+def test_pruebas_contra_coint_johansen(johansen, niveles, caso):
+    esperado = coint_johansen(niveles.values, DET_ORDER[caso], P - 1)
+    tabla = johansen.pruebas((caso,))
+    np.testing.assert_allclose(tabla['autovalor'], esperado.eig, rtol=1e-8)
+    np.testing.assert_allclose(tabla['traza'], esperado.lr1, rtol=1e-8)
+    np.testing.assert_allclose(tabla['max_autovalor'], esperado.lr2, rtol=1e-8)
+    np.testing.assert_allclose(tabla[['traza_cv90', 'traza_cv95', 'traza_cv99']], esperado.cvt)
+    np.testing.assert_allclose(tabla[['max_cv90', 'max_cv95', 'max_cv99']], esperado.cvm)
+
+
+def test_colo_sin_valores_criticos(johansen, niveles):
+    # coint_johansen(y, 1, k) elimina la tendencia antes de la regresión auxiliar: no es el caso 'colo'
+    tabla = johansen.pruebas(('colo',))
+    assert not np.allclose(tabla['autovalor'], coint_johansen(niveles.values, 1, P - 1).eig, rtol=1e-6)
+    assert tabla.filter(like='cv').isna().all().all()
+    with pytest.raises(ValueError):
+        johansen.seleccionar_rango('colo')
+
+
+@pytest.mark.parametrize('prueba, metodo', [('traza', 'trace'), ('max_autovalor', 'maxeig')])
+@pytest.mark.parametrize('signif', [0.10, 0.05, 0.01])
+def test_rango_contra_select_coint_rank(johansen, niveles, prueba, metodo, signif):
+    esperado = select_coint_rank(niveles.values, 0, P - 1, method=metodo, signif=signif).rank
+    assert johansen.seleccionar_rango('co', prueba, signif) == esperado == 1
+
+
+@pytest.mark.parametrize('caso', CASOS)
+@pytest.mark.parametrize('rango', [1, 2])
+def test_ajuste_contra_statsmodels_VECM(johansen, niveles, caso, rango):
+    esperado = VECM(niveles.values, k_ar_diff=P - 1, coint_rank=rango, deterministic=caso).fit()
+    modelo = johansen.ajustar(rango, caso)
+    # statsmodels separa las filas de los deterministas restringidos en det_coef_coint
+    np.testing.assert_allclose(modelo.beta[:3], esperado.beta, rtol=1e-6, atol=1e-8)
+    np.testing.assert_allclose(modelo.beta[3:], esperado.det_coef_coint.reshape(-1, rango), rtol=1e-6, atol=1e-8)
+    np.testing.assert_allclose(modelo.alpha, esperado.alpha, rtol=1e-6, atol=1e-8)
+    np.testing.assert_allclose(np.hstack(modelo.gamma), esperado.gamma, rtol=1e-6, atol=1e-8)
+    np.testing.assert_allclose(modelo.sigma_u, esperado.sigma_u, rtol=1e-6)
+    np.testing.assert_allclose(modelo.coefs, esperado.var_rep, rtol=1e-6, atol=1e-8)
+    np.testing.assert_allclose(modelo.resid, esperado.resid, atol=1e-8)
+    np.testing.assert_allclose(modelo.forecast(niveles.values, 5), esperado.predict(steps=5), rtol=1e-6)
+
+
+def test_criterios_con_parametros_libres(johansen, niveles):
+    # Con rango completo y constante no restringida, el VECM es el VAR(p) en niveles sin restricciones
+    completo, referencia = johansen.ajustar(3, 'co'), VAR(niveles).fit(P)
+    np.testing.assert_allclose(completo.sigma_u_mle, referencia.sigma_u_mle, rtol=1e-8)
+    assert completo.aic == pytest.approx(referencia.aic) and completo.bic == pytest.approx(referencia.bic)
+    # Rango 1: por ecuación, Γ (3·2), α (1) y constante (1); β libre (3 - 1)·1
+    reducido = johansen.ajustar(1, 'co')
+    assert reducido.df_model == 8 and reducido.df_resid == reducido.nobs - 8
+    ld = np.linalg.slogdet(reducido.sigma_u)[1]
+    assert reducido.aic == pytest.approx(ld + 2 * (3 * 8 + 2) / reducido.nobs)
+    assert reducido.endog_lagged.shape == (reducido.nobs, 1 + 3 * P)
+
+
+def test_rango_cero_y_completo(johansen):
+    cero = johansen.ajustar(0, 'co')
+    np.testing.assert_array_equal(cero.Pi, np.zeros((3, 3)))
+    # Con rango 0 el VAR en niveles tiene raíces unitarias exactas
+    assert not cero.is_stable()
+    completo = johansen.ajustar(3, 'co')
+    assert completo.Pi.shape == (3, 3) and np.linalg.matrix_rank(completo.Pi) == 3
+
+
+def test_validaciones(johansen, niveles):
+    with pytest.raises(ValueError):
+        Johansen(niveles, 0)
+    with pytest.raises(ValueError):
+        johansen.ajustar(4)
+    with pytest.raises(ValueError):
+        johansen.resolver('xx')
+    with pytest.raises(ValueError):
+        johansen.seleccionar_rango('ci')
+    with pytest.raises(ValueError):
+        johansen.seleccionar_rango('co', signif=0.2)
+
+
+def test_solucion_en_cache(niveles):
+    johansen = Johansen(niveles, P)
+    assert johansen.resolver('co') is johansen.resolver('co')
+    johansen.ajustar(1, 'co')
+    assert list(johansen._soluciones) == ['co']
+
+
+def test_ajustar_VECM_como_modelo_del_pipeline(ns, niveles, capsys):
+    modelo, tabla = ajustar_VECM(niveles, P, verbose=False)
+    assert modelo.rango == 1 and set(tabla['caso']) == set(CASOS)
+    np.testing.assert_allclose(modelo.endog, niveles.values)
+    fevd = ns['calcular_FEVD_cholesky'](modelo, steps=6)
+    np.testing.assert_allclose(fevd.values.reshape(6, 3, 3).sum(axis=2), 1.0)